@@ -5,23 +5,65 @@ from typing import Dict, Optional, Union
 import networkx as nx
 
 import faiss
+from geniusrise_healthcare.knowledge_graphs.algorithms import pagerank
+from geniusrise_healthcare.knowledge_graphs.csr import EDGE_TYPE_KEYS
+from geniusrise_healthcare.knowledge_graphs.lazy import HOT_NODE_ATTRIBUTES, AttributeStore, attach_attribute_store
+from geniusrise_healthcare.knowledge_graphs.snapshot import GraphSnapshot, is_snapshot, open_snapshot, save_snapshot
 
 log = logging.getLogger(__name__)
 
 
-def load_networkx_graph(file_path: str) -> nx.DiGraph:
+def load_graph_snapshot(file_path: str) -> GraphSnapshot:
     """
-    Loads a NetworkX graph from a file.
+    Opens a graph snapshot with mmap, for serving without materializing a NetworkX graph.
+
+    Parameters:
+    - file_path (str): The snapshot file.
+
+    Returns:
+    GraphSnapshot: The snapshot, whose `graph` is a CSRGraph over the mapped file.
+    """
+    return open_snapshot(file_path)
+
+
+def save_graph_snapshot(G: nx.DiGraph, file_path: str) -> None:
+    """
+    Saves a NetworkX graph as a graph snapshot.
+
+    Parameters:
+    - G (nx.DiGraph): The NetworkX graph to save.
+    - file_path (str): The file path where the snapshot will be saved.
+
+    Returns:
+    None
+    """
+    log.info(f"Saving graph snapshot to {file_path}")
+    save_snapshot(G, file_path)
+
+
+def load_networkx_graph(file_path: str, attributes_path: Optional[str] = None) -> nx.DiGraph:
+    """
+    Loads a NetworkX graph from a pickle, or from a graph snapshot written with `save_graph_snapshot`.
 
     Parameters:
     - file_path (str): The file path from which to load the graph.
+    - attributes_path (Optional[str]): An attribute store written with `lazy.write_attribute_store`. Node and edge
+      attributes other than the hot ones are then read from it on demand instead of being held in memory, and only
+      the topology and hot attributes of a snapshot are materialized.
 
     Returns:
     nx.DiGraph: The loaded NetworkX graph.
     """
     logging.info(f"Loading NetworkX graph from {file_path}")
-    with open(file_path, "rb") as f:
-        G = pickle.load(f)
+    if is_snapshot(file_path) and attributes_path:
+        G = open_snapshot(file_path).to_networkx(node_keys=HOT_NODE_ATTRIBUTES, edge_keys=EDGE_TYPE_KEYS)
+    elif is_snapshot(file_path):
+        G = open_snapshot(file_path).to_networkx()
+    else:
+        with open(file_path, "rb") as f:
+            G = pickle.load(f)
+    if attributes_path:
+        attach_attribute_store(G, AttributeStore(attributes_path))
     logging.debug(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
 
@@ -43,7 +85,7 @@ def load_networkx_graph_with_pagerank(file_path: str) -> nx.DiGraph:
     logging.debug(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
 
     logging.info("Calculating PageRank for nodes in the graph.")
-    pagerank_dict = nx.pagerank(G)
+    pagerank_dict = pagerank(G)
 
     # Storing pagerank values as node attributes
     for node, rank in pagerank_dict.items():
@@ -91,7 +133,7 @@ def load_networkx_graph_with_pagerank_snomed(
 
     # Calculate PageRank
     logging.info("Calculating PageRank for the graph.")
-    pagerank = nx.pagerank(
+    ranks = pagerank(
         G,
         alpha=alpha,
         personalization=personalization,
@@ -103,7 +145,7 @@ def load_networkx_graph_with_pagerank_snomed(
     )
 
     # Store PageRank values as node attributes
-    nx.set_node_attributes(G, pagerank, "pagerank")
+    nx.set_node_attributes(G, ranks, "pagerank")
     logging.debug("PageRank calculation completed and values stored as node attributes.")
 
     # Update PageRank values based on relationship type weightings
@@ -162,7 +204,7 @@ def load_concept_dict(file_path: str) -> Dict[str, str]:
 
 def save_networkx_graph(G: nx.DiGraph, file_path: str) -> None:
     """
-    Saves a NetworkX graph to a file.
+    Saves a NetworkX graph to a pickle file.
 
     Parameters:
     - G (nx.DiGraph): The NetworkX graph to save.
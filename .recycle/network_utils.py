@@ -3,6 +3,8 @@ from typing import List
 
 import networkx as nx
 
+from geniusrise_healthcare.knowledge_graphs.algorithms import connected_components
+
 log = logging.getLogger(__name__)
 
 
@@ -16,7 +18,7 @@ def find_largest_strongly_connected_component(G: nx.DiGraph) -> nx.DiGraph:
     Returns:
     nx.DiGraph: The largest strongly connected component as a new directed graph.
     """
-    largest_scc = max(list(nx.strongly_connected_components(G)), key=len)
+    largest_scc = max(connected_components(G, strong=True), key=len)
     largest_scc = G.subgraph(largest_scc).copy()
     log.info(f"Result component has: {largest_scc.number_of_nodes()} nodes and {largest_scc.number_of_edges()} edges")
     return largest_scc
@@ -32,7 +34,7 @@ def find_largest_weakly_connected_component(G: nx.DiGraph) -> nx.DiGraph:
     Returns:
     nx.DiGraph: The largest weakly connected component as a new directed graph.
     """
-    largest_wcc = max(list(nx.weakly_connected_components(G)), key=len)
+    largest_wcc = max(connected_components(G), key=len)
     largest_wcc = G.subgraph(largest_wcc).copy()
     log.info(f"Result component has: {largest_wcc.number_of_nodes()} nodes and {largest_wcc.number_of_edges()} edges")
     return largest_wcc
@@ -64,7 +66,7 @@ def find_largest_connected_component(G: nx.DiGraph) -> nx.DiGraph:
     Returns:
     nx.DiGraph: The largest connected component as a new directed graph.
     """
-    largest_cc = max(list(nx.connected_components(G.to_undirected())), key=len)
+    largest_cc = max(connected_components(G), key=len)
     largest_cc = G.subgraph(largest_cc).copy()
     log.info(f"Result component has: {largest_cc.number_of_nodes()} nodes and {largest_cc.number_of_edges()} edges")
     return largest_cc
@@ -81,14 +83,11 @@ def find_largest_connected_component_with_nodes(G: nx.DiGraph, nodes: List[int])
     Returns:
     nx.DiGraph: The largest connected component containing the maximum number of given nodes as a new directed graph.
     """
-    # Convert the graph to undirected for connected component analysis
-    G_undirected = G.to_undirected()
-
-    # Find all connected components
-    connected_components = list(nx.connected_components(G_undirected))
+    # Find all connected components, ignoring edge direction
+    components = connected_components(G)
 
     # Filter components that contain any of the given nodes
-    relevant_components = [comp for comp in connected_components if any(node in comp for node in nodes)]
+    relevant_components = [comp for comp in components if any(node in comp for node in nodes)]
 
     if not relevant_components:
         log.info("No connected component contains any of the given nodes.")
@@ -1,5 +1,5 @@
 import logging
-from typing import List, Set, Tuple, Union
+from typing import Container, List, Set, Tuple, Union
 
 import networkx as nx
 import numpy as np
@@ -7,51 +7,54 @@ import numpy as np
 import faiss
 import torch
 from geniusrise_healthcare.constants import SEMANTIC_TAGS
+from geniusrise_healthcare.knowledge_graphs.algorithms import pagerank
+from geniusrise_healthcare.knowledge_graphs.hubs import hub_index
+from geniusrise_healthcare.knowledge_graphs.intersection import intersect_subgraphs as intersect
+from geniusrise_healthcare.knowledge_graphs.neighborhood import neighborhood_engine
+from geniusrise_healthcare.knowledge_graphs.traversal import search_paths
 from geniusrise_healthcare.model import generate_embeddings
 
 log = logging.getLogger(__name__)
 
 
 def find_adjacent_nodes(
-    source_nodes: List[int], G: nx.DiGraph, n: int = 1, top_n: int = 0, undirected: bool = False
+    source_nodes: List[int],
+    G: nx.DiGraph,
+    n: int = 1,
+    top_n: int = 0,
+    undirected: bool = False,
+    rank_by: str = "subgraph",
 ) -> List[nx.DiGraph]:
     """
     Finds the subset of nodes that are adjacent to the source nodes within n hops.
 
+    Neighborhoods are expanded over the cached CSR copy of the graph, so the cost depends on their size rather than
+    the graph's. Without `top_n`, the subgraphs are read-only views of the graph.
+
     Parameters:
     - source_nodes (List[int]): The source nodes in the NetworkX graph.
     - G (nx.DiGraph): The NetworkX graph.
     - n (int): The number of hops to consider for adjacency.
     - top_n (int): The number of top nodes to consider based on degree.
     - undirected (bool): Whether to consider the graph as undirected.
+    - rank_by (str): Rank nodes by their degree within the subgraph, or by their precomputed "global" degree.
 
     Returns:
     List[nx.DiGraph]: A list of subgraphs containing the source nodes, their adjacent nodes, and the edges between them.
+    For n > 1 the edges are reversed, as predecessors are followed.
     """
     subgraphs = []
+    engine = neighborhood_engine(G)
     for source_node in source_nodes:
         if not G.has_node(source_node):
             raise ValueError(f"Source node {source_node} not found in the graph.")
 
-        # Find all nodes adjacent to the source node within n hops
-        if n == 1:
-            subgraph = G.subgraph(set(list(G.predecessors(source_node)) + [source_node]))
-        else:
-            subgraph = nx.ego_graph(G.reverse(), source_node, radius=n, undirected=undirected, center=True)
-
-        if top_n > 0:
-            # Sort nodes by degree and keep only the top_n nodes along with the source node
-            sorted_nodes = sorted(subgraph.nodes(), key=lambda x: subgraph.degree(x), reverse=True)
-            top_nodes = sorted_nodes[:top_n] if top_n < len(sorted_nodes) else sorted_nodes
-
-            # Always include the source node
-            if source_node not in top_nodes:
-                top_nodes.append(source_node)
-            # Create a new subgraph with only the top_n nodes and the source node
-            filtered_subgraph = subgraph.subgraph(top_nodes).copy()
-            subgraphs.append(filtered_subgraph)
-        else:
-            subgraphs.append(subgraph)
+        # Find all nodes adjacent to the source node within n hops, following predecessors, keeping only the
+        # top_n nodes by degree along with the source node if asked
+        direction = "both" if undirected and n > 1 else "in"
+        nodes = engine.k_hop(source_node, n, direction, top_n=top_n, rank_by=rank_by)
+        subgraph = (G if n == 1 else nx.reverse_view(G)).subgraph(nodes)
+        subgraphs.append(subgraph.copy() if top_n > 0 else subgraph)
 
     return subgraphs
 
@@ -111,27 +114,15 @@ def intersect_subgraphs(subgraphs: List[nx.DiGraph]) -> nx.DiGraph:
     Intersects multiple directed graphs and returns a new directed graph containing only the edges
     that exist in all provided graphs.
 
+    Node and edge sets are intersected as sorted integer arrays, see `intersection.intersect_subgraphs`.
+
     Parameters:
     - subgraphs (List[nx.DiGraph]): List of directed graphs to intersect.
 
     Returns:
     nx.DiGraph: A new directed graph containing only the edges that exist in all provided graphs.
     """
-    common_nodes = set(subgraphs[0].nodes())
-    for graph in subgraphs[1:]:
-        common_nodes.intersection_update(graph.nodes())
-
-    intersection_graph = nx.DiGraph()
-    intersection_graph.add_nodes_from(common_nodes)
-
-    for node in common_nodes:
-        for graph in subgraphs:
-            # Assuming the graphs are directed
-            for successor in graph.successors(node):
-                if all(successor in g.successors(node) for g in subgraphs):
-                    intersection_graph.add_edge(node, successor)
-
-    return intersection_graph
+    return intersect(subgraphs)
 
 
 def find_local_important_nodes(G: nx.DiGraph, node: int, n: int = 1) -> List[int]:
@@ -161,15 +152,21 @@ def find_global_important_nodes(G: nx.DiGraph, top_n: int = 10) -> List[int]:
     Returns:
     List[int]: A list of globally important nodes.
     """
-    pagerank = nx.pagerank(G)
-    return sorted(pagerank, key=pagerank.get, reverse=True)[:top_n]
+    ranks = pagerank(G)
+    return sorted(ranks, key=ranks.get, reverse=True)[:top_n]
 
 
 def calculate_top_one_percent_nodes(G: nx.DiGraph) -> Set[int]:
-    degrees = [(node, degree) for node, degree in G.degree()]
-    degrees.sort(key=lambda x: x[1], reverse=True)
-    top_one_percent_count = int(len(degrees) * 0.01)
-    return set(node for node, _ in degrees[:top_one_percent_count])
+    """
+    Finds the 1% of nodes with the highest degree, computed once per graph version and cached.
+
+    Parameters:
+    - G (nx.DiGraph): The NetworkX graph.
+
+    Returns:
+    Set[int]: The highest degree nodes.
+    """
+    return set(hub_index(G).nodes)
 
 
 def recursive_search(
@@ -181,10 +178,12 @@ def recursive_search(
     depth: int,
     max_depth: int,
     current_path: List[int],
-    top_one_percent_nodes: Set[int],
+    top_one_percent_nodes: Container[int],
 ) -> List[List[int]]:
     """
-    Recursively search the graph starting from a node, collecting all paths leading to nodes of certain semantic types.
+    Search the graph starting from a node, collecting all paths leading to nodes of certain semantic types.
+
+    The search is iterative, see `search_paths`, which also offers breadth first order and visit budgets.
 
     Parameters:
     - G (nx.DiGraph): The NetworkX graph.
@@ -199,44 +198,17 @@ def recursive_search(
     Returns:
     List[List[int]]: A list of paths leading to nodes of the specified semantic types.
     """
-    if node in visited or depth > max_depth:
-        return []
-
-    visited.add(node)
-    current_path.append(node)
-    paths = []
-
-    node_tag = G.nodes[node].get("tag")
-    if node_tag in (stop_at_semantic_types if isinstance(stop_at_semantic_types, list) else [stop_at_semantic_types]):  # type: ignore
-        paths.append(current_path.copy())
-        current_path.pop()
-        return paths
-
-    # Check if the node is in the top 1% of highly connected nodes
-    if node in top_one_percent_nodes:
-        paths.append(current_path.copy())
-        current_path.pop()
-        return paths
-
-    if not semantic_types or node_tag in (semantic_types if isinstance(semantic_types, list) else [semantic_types]):
-        paths.append(current_path.copy())
-
-    candidates = list(G.predecessors(node)) + list(G.successors(node))
-    for neighbor in candidates:
-        paths += recursive_search(
-            G,
-            neighbor,
-            semantic_types,
-            stop_at_semantic_types,
-            visited,
-            depth + 1,
-            max_depth,
-            current_path,
-            top_one_percent_nodes=top_one_percent_nodes,
-        )
-
-    current_path.pop()
-    return paths
+    return search_paths(
+        G,
+        [node],
+        semantic_types,
+        stop_at_semantic_types,
+        max_depth=max_depth,
+        hubs=top_one_percent_nodes,
+        visited=visited,
+        start_depth=depth,
+        prefix=current_path,
+    )
 
 
 def find_related_subgraphs(
@@ -269,7 +241,7 @@ def find_related_subgraphs(
     Returns:
     Tuple[nx.Graph, List[int]]: A tuple containing the resulting subgraph and a list of semantically similar nodes.
     """
-    top_1 = calculate_top_one_percent_nodes(G)
+    top_1 = hub_index(G)
     semantically_similar_nodes = []
     if semantic_types and not all(
         st in SEMANTIC_TAGS for st in (semantic_types if isinstance(semantic_types, list) else [semantic_types])
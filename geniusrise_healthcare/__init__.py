@@ -13,4 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .genius import InPatientAPI
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # Imported on first use, so that the knowledge graph packages import without the API's dependencies
+    if name == "InPatientAPI":
+        from .genius import InPatientAPI
+
+        return InPatientAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,255 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .cache import graph_cache
+
+log = logging.getLogger(__name__)
+
+try:
+    import networkit as nk
+
+    HAS_NETWORKIT = True
+except ImportError:  # pragma: no cover
+    nk = None
+    HAS_NETWORKIT = False
+
+
+class NetworkitGraph:
+    """
+    A networkit copy of a NetworkX graph, with the mapping between NetworkX nodes and networkit node ids.
+    """
+
+    def __init__(self, graph: Any, nodes: List[Hashable]) -> None:
+        """
+        Args:
+            graph (networkit.Graph): The networkit graph.
+            nodes (List[Hashable]): NetworkX node of every networkit node id.
+        """
+        self.graph = graph
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self._transpose: Optional[Any] = None
+
+    @property
+    def transpose(self) -> Any:
+        """
+        The graph with every edge reversed, built on first use.
+        """
+        if self._transpose is None:
+            self._transpose = nk.graphtools.transpose(self.graph)
+        return self._transpose
+
+    def to_dict(self, values: List[float]) -> Dict[Hashable, float]:
+        return dict(zip(self.nodes, values))
+
+
+def _convert(G: nx.DiGraph, weight: Optional[str]) -> NetworkitGraph:
+    nodes = list(G)
+    index = {node: i for i, node in enumerate(nodes)}
+    m = G.number_of_edges()
+    sources = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.uint64, count=m)
+    targets = np.fromiter((index[v] for _, v in G.edges()), dtype=np.uint64, count=m)
+    graph = nk.graph.Graph(len(nodes), weighted=weight is not None, directed=G.is_directed())
+    if weight is None:
+        graph.addEdges((sources, targets))
+    else:
+        weights = np.fromiter((data.get(weight, 1.0) for _, _, data in G.edges(data=True)), dtype=np.float64, count=m)
+        graph.addEdges((weights, (sources, targets)))
+    log.info(f"Converted graph with {len(nodes)} nodes and {m} edges to networkit")
+    return NetworkitGraph(graph, nodes)
+
+
+def to_networkit(G: nx.DiGraph, weight: Optional[str] = None) -> NetworkitGraph:
+    """
+    Converts a NetworkX graph to networkit, caching the conversion per graph version. The conversion holds the
+    weights, call `graph_cache.invalidate(G)` after editing them.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        weight (Optional[str]): Edge attribute holding the weight, unweighted if not given. Edges without it weigh 1.
+
+    Returns:
+        NetworkitGraph: The converted graph.
+
+    Raises:
+        ImportError: If networkit is not installed.
+    """
+    if not HAS_NETWORKIT:
+        raise ImportError("networkit is not installed")
+    return graph_cache.get(G, ("networkit", weight), lambda: _convert(G, weight))
+
+
+def set_threads(threads: int) -> None:
+    """
+    Sets the number of threads networkit algorithms use.
+    """
+    if HAS_NETWORKIT:
+        nk.setNumberOfThreads(threads)
+
+
+def pagerank(
+    G: nx.DiGraph,
+    alpha: float = 0.85,
+    max_iter: int = 100,
+    tol: float = 1.0e-6,
+    weight: Optional[str] = "weight",
+    personalization: Optional[Dict] = None,
+    nstart: Optional[Dict] = None,
+    dangling: Optional[Dict] = None,
+) -> Dict[Hashable, float]:
+    """
+    Computes PageRank, multi-threaded with networkit when available.
+
+    Dangling nodes distribute their rank uniformly and the scores sum to 1, as with `nx.pagerank`. Personalized
+    PageRank, custom starting vectors and dangling distributions are computed with NetworkX.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        alpha (float): The damping factor (default is 0.85).
+        max_iter (int): Maximum number of iterations (default is 100).
+        tol (float): Error tolerance of the iteration (default is 1e-6).
+        weight (Optional[str]): Edge attribute holding the weight, edges without it weigh 1. None ignores weights
+            (default is "weight", as with `nx.pagerank`).
+        personalization (Optional[Dict]): Personalization vector, see `nx.pagerank`.
+        nstart (Optional[Dict]): Starting values, see `nx.pagerank`.
+        dangling (Optional[Dict]): Out-edges of dangling nodes, see `nx.pagerank`.
+
+    Returns:
+        Dict[Hashable, float]: PageRank of every node.
+    """
+    if not HAS_NETWORKIT or personalization is not None or nstart is not None or dangling is not None:
+        return nx.pagerank(
+            G,
+            alpha=alpha,
+            personalization=personalization,
+            max_iter=max_iter,
+            tol=tol,
+            nstart=nstart,
+            weight=weight,
+            dangling=dangling,
+        )
+    if G.number_of_nodes() == 0:
+        return {}
+
+    converted = to_networkit(G, weight)
+    algorithm = nk.centrality.PageRank(
+        converted.graph, damp=alpha, tol=tol, distributeSinks=nk.centrality.SinkHandling.DistributeSinks
+    )
+    algorithm.maxIterations = max_iter
+    algorithm.run()
+    scores = np.asarray(algorithm.scores())
+    return converted.to_dict((scores / scores.sum()).tolist())
+
+
+def connected_components(G: nx.DiGraph, strong: bool = False) -> List[Set[Hashable]]:
+    """
+    Finds the connected components, weakly connected for directed graphs unless `strong` is set.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        strong (bool): Find strongly connected components of a directed graph (default is False).
+
+    Returns:
+        List[Set[Hashable]]: The components.
+    """
+    if not HAS_NETWORKIT:
+        if not G.is_directed():
+            return list(nx.connected_components(G))
+        return list(nx.strongly_connected_components(G) if strong else nx.weakly_connected_components(G))
+
+    converted = to_networkit(G)
+    if not G.is_directed():
+        algorithm = nk.components.ConnectedComponents(converted.graph)
+    elif strong:
+        algorithm = nk.components.StronglyConnectedComponents(converted.graph)
+    else:
+        algorithm = nk.components.WeaklyConnectedComponents(converted.graph)
+    algorithm.run()
+    nodes = converted.nodes
+    return [{nodes[i] for i in component} for component in algorithm.getComponents()]
+
+
+def bfs_distances(G: nx.DiGraph, source: Hashable, reverse: bool = False) -> Dict[Hashable, int]:
+    """
+    Computes the hop distance from a node to every node reachable from it.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        source (Hashable): The source node.
+        reverse (bool): Follow edges backwards, i.e. distances to the source (default is False).
+
+    Returns:
+        Dict[Hashable, int]: Distance of every reachable node, the source included.
+    """
+    if not HAS_NETWORKIT:
+        return dict(nx.single_source_shortest_path_length(G.reverse(copy=False) if reverse else G, source))
+
+    converted = to_networkit(G)
+    if source not in converted.index:
+        raise nx.NodeNotFound(f"Source {source} is not in G")
+    graph = converted.transpose if reverse and G.is_directed() else converted.graph
+    algorithm = nk.distance.BFS(graph, converted.index[source], storePaths=False)
+    algorithm.run()
+    distances = np.asarray(algorithm.getDistances())
+    reached = np.flatnonzero(distances < np.finfo(np.float64).max)
+    nodes = converted.nodes
+    return {nodes[i]: int(distances[i]) for i in reached.tolist()}
+
+
+def approximate_betweenness(
+    G: nx.DiGraph, epsilon: float = 0.01, delta: float = 0.1, k: Optional[int] = None, seed: Optional[int] = None
+) -> Dict[Hashable, float]:
+    """
+    Approximates betweenness centrality by sampling shortest paths.
+
+    With networkit, the error is at most `epsilon` with probability at least 1 - `delta`. The NetworkX fallback
+    samples `k` source nodes instead, by default enough for a similar error.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        epsilon (float): Maximum additive error (default is 0.01).
+        delta (float): Probability of exceeding the error (default is 0.1).
+        k (Optional[int]): Number of sampled sources of the NetworkX fallback.
+        seed (Optional[int]): Seed of the NetworkX fallback.
+
+    Returns:
+        Dict[Hashable, float]: Normalized betweenness of every node.
+    """
+    if not HAS_NETWORKIT:
+        if k is None:
+            k = min(G.number_of_nodes(), int(np.ceil(np.log(2 / delta) / (2 * epsilon**2))))
+        return nx.betweenness_centrality(G, k=k, seed=seed)
+
+    converted = to_networkit(G)
+    algorithm = nk.centrality.ApproxBetweenness(converted.graph, epsilon=epsilon, delta=delta)
+    algorithm.run()
+    return converted.to_dict(algorithm.scores())
+
+
+def largest_component(G: nx.DiGraph, strong: bool = False) -> Tuple[Set[Hashable], int]:
+    """
+    Finds the largest connected component.
+
+    Returns:
+        The nodes of the largest component and the number of components.
+    """
+    components = connected_components(G, strong=strong)
+    return max(components, key=len), len(components)
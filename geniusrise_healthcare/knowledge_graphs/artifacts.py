@@ -0,0 +1,81 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+def file_digest(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Computes the SHA-256 digest of a file.
+
+    Args:
+        file_path (str): Path to the file.
+        chunk_size (int): Number of bytes hashed at a time (default is 1 MiB).
+
+    Returns:
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_artifact(obj: Any, file_path: str) -> None:
+    """
+    Pickles an object to a file atomically, so that readers never see a partially written artifact.
+
+    Args:
+        obj (Any): The object to save.
+        file_path (str): The file path where the object will be saved.
+
+    Returns:
+        None
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    log.info(f"Saved artifact to {file_path}")
+
+
+def load_artifact(file_path: str) -> Any:
+    """
+    Loads a pickled artifact.
+
+    Args:
+        file_path (str): The file path from which to load the object.
+
+    Returns:
+        The loaded object.
+    """
+    log.info(f"Loading artifact from {file_path}")
+    with open(file_path, "rb") as f:
+        return pickle.load(f)
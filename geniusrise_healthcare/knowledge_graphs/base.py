@@ -14,33 +14,311 @@
 # limitations under the License.
 
 # base.py
+import json
 import logging
+import os
+import sys
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
 import networkx as nx
+import numpy as np
 
-from disease_ontology.base import load_disease_ontology
-from drugbank.base import load_drugbank
-from gene_ontology.base import load_gene_ontology
-from mesh.base import load_mesh
-from rxnorm.base import load_rxnorm
-from snomed.base import load_snomed
-from umls.base import load_umls
+from .artifacts import load_artifact, save_artifact
+from .cache import graph_cache
+from .disease_ontology.base import load_disease_ontology
+from .drugbank.base import load_drugbank
+from .gene_ontology.base import load_gene_ontology
+from .ids import IdRegistry
+from .lazy import make_lazy
+from .manifest import BuildManifest, code_version
+from .mesh.base import load_mesh
+from .rxnorm.base import load_rxnorm
+from .snapshot import save_snapshot
+from .snomed.base import load_snomed
+from .umls.base import load_umls
 
 log = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 
-def load():
-    nx.DiGraph()
+def _load_umls(path: str, **options: Any) -> nx.DiGraph:
+    return load_umls(nx.DiGraph(), path, **options)
+
+
+def _load_snomed(path: str, **options: Any) -> nx.DiGraph:
+    return load_snomed(nx.DiGraph(), path, **options)
+
+
+def _load_rxnorm(path: str, **options: Any) -> nx.DiGraph:
+    return load_rxnorm(nx.DiGraph(), path, **options)
+
+
+def _load_mesh(path: str, **options: Any) -> nx.DiGraph:
+    return load_mesh(nx.DiGraph(), path, **options)
+
+
+def _load_drugbank(path: str, **options: Any) -> nx.DiGraph:
+    return load_drugbank(path, **options)
+
+
+def _load_gene_ontology(path: str, **options: Any) -> nx.DiGraph:
+    return load_gene_ontology(nx.DiGraph(), path, **options)
+
+
+def _load_disease_ontology(path: str, **options: Any) -> nx.DiGraph:
+    return load_disease_ontology(nx.DiGraph(), path, **options)
+
+
+# Source name to a loader building that source into a new graph from a path and loader specific options
+LOADERS: Dict[str, Callable[..., nx.DiGraph]] = {
+    "umls": _load_umls,
+    "snomed": _load_snomed,
+    "rxnorm": _load_rxnorm,
+    "mesh": _load_mesh,
+    "drugbank": _load_drugbank,
+    "gene_ontology": _load_gene_ontology,
+    "disease_ontology": _load_disease_ontology,
+}
+
+
+def _graph_records(H: nx.DiGraph) -> Dict[str, Any]:
+    """
+    Flattens a source graph into the compact records returned by the workers: the node ids with their attribute
+    dicts, the edges as integer arrays of node positions with their attribute dicts, and the graph attributes.
+    These pickle without the nested adjacency dicts of the graph, and are inserted by `_merge` without copies.
+    """
+    nodes = list(H)
+    position = {node: i for i, node in enumerate(nodes)}
+    successors = H._succ  # type: ignore
+    dtype = np.min_scalar_type(max(len(nodes) - 1, 0))
+    degrees = np.fromiter((len(successors[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+    return {
+        "nodes": nodes,
+        "node_attributes": [H._node[node] for node in nodes],  # type: ignore
+        "sources": np.repeat(np.arange(len(nodes), dtype=dtype), degrees),
+        "targets": np.fromiter(
+            (position[target] for node in nodes for target in successors[node]),
+            dtype=dtype,
+            count=int(degrees.sum()),
+        ),
+        "edge_attributes": [data for node in nodes for data in successors[node].values()],
+        "graph": H.graph,
+    }
+
+
+def _build_source(
+    source: str, path: str, options: Dict[str, Any], artifact: Optional[str] = None, cached: bool = False
+) -> Tuple[Dict[str, Any], float]:
+    """
+    Builds one source, in a worker process when run from `load`.
+
+    Args:
+        source (str): The source.
+        path (str): The input file or directory of the source.
+        options (Dict[str, Any]): Options of the loader.
+        artifact (Optional[str]): Per-source artifact, loaded instead of building if `cached`, else written after.
+        cached (bool): Whether `artifact` is current.
+
+    Returns:
+        The records of the source graph, see `_graph_records`, and the seconds it took to build or load.
+    """
+    start = time.perf_counter()
+    if cached and artifact is not None:
+        records = load_artifact(artifact)
+    else:
+        records = _graph_records(LOADERS[source](path, **options))
+        if artifact is not None:
+            save_artifact(records, artifact)
+    return records, time.perf_counter() - start
+
+
+def _merge(G: nx.DiGraph, records: Dict[str, Any], source: str, registry: Optional[IdRegistry] = None) -> None:
+    """
+    Merges the records of one source into the combined graph.
+
+    The attribute dicts of the records are inserted directly into the adjacency of the combined graph. Node and
+    edge attributes of a later source are added to those of an earlier one sharing the same node. Graph level
+    indexes are kept under their own key, and a key already set by an earlier source is kept under
+    `"{source}:{key}"` instead. With a `registry`, nodes are relabeled to their dense ids on the way in.
+    """
+    nodes = records["nodes"]
+    if registry is not None:
+        nodes = registry.register_many(source, nodes).tolist()
+        log.info(f"Relabeled {len(nodes)} {source} nodes")
+
+    node_data, successors, predecessors = G._node, G._succ, G._pred  # type: ignore
+    for node, data in zip(nodes, records["node_attributes"]):
+        if node in node_data:
+            node_data[node].update(data)
+        else:
+            node_data[node] = data
+            successors[node] = {}
+            predecessors[node] = {}
+
+    for u, v, data in zip(records["sources"].tolist(), records["targets"].tolist(), records["edge_attributes"]):
+        u, v = nodes[u], nodes[v]
+        existing = successors[u].get(v)
+        if existing is None:
+            successors[u][v] = predecessors[v][u] = data
+        else:
+            existing.update(data)
+
+    # The adjacency was written directly, bypassing the cache clearing of NetworkX
+    graph_cache.invalidate(G)
+    for key, value in records["graph"].items():
+        if key in G.graph:
+            log.warning(f"Graph attribute {key} of {source} is already set, storing it as {source}:{key}")
+            key = f"{source}:{key}"
+        G.graph[key] = value
+
+
+def _read_config(config: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+    if isinstance(config, str):
+        with open(config) as f:
+            config = json.load(f)
+    return config  # type: ignore
+
+
+def load(
+    config: Union[str, Dict[str, Any]], workers: Optional[int] = None, dense_ids: Optional[bool] = None
+) -> nx.DiGraph:
+    """
+    Builds the combined knowledge graph from several sources, building independent sources concurrently.
+
+    The config lists every source with the path to its files and any options of its loader, e.g.
+
+        {
+            "sources": {
+                "umls": {"path": "./data/umls/2024AA/META"},
+                "snomed": {"path": "./data/snomed/snomed/Snapshot/Terminology", "version": "INT_20240501"},
+                "gene_ontology": {"path": "data/gene_ontology/go.obo", "cache_dir": "data/cache"}
+            },
+            "workers": 4,
+            "dense_ids": true,
+            "cache_dir": "data/cache",
+            "snapshot": "saved/knowledge_graph.snap",
+            "lazy_attributes": "saved/knowledge_graph.attrs"
+        }
+
+    Each source is built into its own graph in a process pool, so the build takes about as long as the slowest
+    source. Workers send back compact node and edge records instead of the graph, which are inserted into the
+    combined graph in config order, so the result does not depend on which source finished first. Build and merge
+    timings are logged and stored under `G.graph["build_report"]`.
+
+    With `dense_ids`, every node is relabeled to a dense integer from an `IdRegistry` stored under
+    `G.graph["id_registry"]` as it is merged, so that native ids of different sources never collide. Graph level
+    indexes of the sources keep native ids, translate them with `registry.lookup(source, native_id)`.
+
+    With a `cache_dir`, every source graph is saved there as an artifact and a `BuildManifest` records the digests
+    of its input files, its loader code and options. Later builds load the artifact of every unchanged source
+    instead of rebuilding it. The combined graph is written to `snapshot` if given, which is skipped when no source
+    changed and the snapshot exists.
+
+    With `lazy_attributes`, every node and edge attribute but the hot ones (`lazy.HOT_NODE_ATTRIBUTES` and the edge
+    types) is moved to an attribute store at that path and read back on demand, see `lazy.make_lazy`.
+
+    Args:
+        config (Union[str, Dict[str, Any]]): The config, or the path to a JSON file containing it.
+        workers (Optional[int]): Number of worker processes, overriding the config. Defaults to one per source up
+            to the number of CPUs. With 1, the sources are built one after the other in this process.
+        dense_ids (Optional[bool]): Relabel the nodes to dense integer ids, overriding the config's "dense_ids"
+            (default is the config's, else False).
+
+    Returns:
+        nx.DiGraph: The combined graph.
+    """
+    config = _read_config(config)
+    sources: Dict[str, Dict[str, Any]] = config["sources"]
+    for source in sources:
+        if source not in LOADERS:
+            raise ValueError(f"Unknown source {source}, expected one of {sorted(LOADERS)}")
+
+    if workers is None:
+        workers = config.get("workers") or min(len(sources), os.cpu_count() or 1)
+    if dense_ids is None:
+        dense_ids = bool(config.get("dense_ids", False))
+    registry = IdRegistry() if dense_ids else None
+
+    start = time.perf_counter()
+    cache_dir = config.get("cache_dir")
+    manifest = BuildManifest(os.path.join(cache_dir, "manifest.json")) if cache_dir else None
+    jobs: Dict[str, Tuple[Any, ...]] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    for source, spec in sources.items():
+        options = {key: value for key, value in spec.items() if key != "path"}
+        if manifest is None:
+            jobs[source] = (source, spec["path"], options)
+            continue
+        entry = entries[source] = manifest.fingerprint(
+            spec["path"], options, code_version(os.path.join(os.path.dirname(__file__), source))
+        )
+        cached = manifest.is_current(source, entry)
+        if not cached:
+            log.info(f"Rebuilding {source}: {', '.join(manifest.changes(source, entry))}")
+        artifact = os.path.join(cache_dir, f"{source}.{entry['fingerprint'][:16]}.records")
+        jobs[source] = (source, spec["path"], options, artifact, cached)
+
+    executor: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        futures: Dict[str, Future] = {}
+        if executor is not None:
+            futures = {source: executor.submit(_build_source, *job) for source, job in jobs.items()}
+
+        G = nx.DiGraph()
+        report: Dict[str, Dict[str, Any]] = {}
+        for source, job in jobs.items():
+            records, seconds = futures[source].result() if executor is not None else _build_source(*job)
+            merge_start = time.perf_counter()
+            nodes, edges = len(records["nodes"]), len(records["sources"])
+            _merge(G, records, source, registry)
+            report[source] = {
+                "path": job[1],
+                "nodes": nodes,
+                "edges": edges,
+                "cached": len(job) > 4 and job[4],
+                "build_seconds": seconds,
+                "merge_seconds": time.perf_counter() - merge_start,
+            }
+            if manifest is not None:
+                manifest.record(source, entries[source], job[3])
+            del records
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
 
-    # for graph in graphs:
+    total = time.perf_counter() - start
+    for source, row in report.items():
+        log.info(
+            f"{source}: {row['nodes']} nodes, {row['edges']} edges, "
+            f"{'loaded' if row['cached'] else 'built'} in {row['build_seconds']:.1f}s, "
+            f"merged in {row['merge_seconds']:.1f}s"
+        )
+    log.info(
+        f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges from {len(report)} sources in {total:.1f}s"
+    )
+    G.graph["build_report"] = {"sources": report, "total_seconds": total, "workers": workers}
+    if registry is not None:
+        G.graph["id_registry"] = registry
 
-    # load_umls(G, "./data/umls/2024AA/META")
-    # load_snomed(G, "./data/snomed/snomed/Snapshot/Terminology", version="INT_20240501")
-    # load_rxnorm(G, "data/rxnorm/rrf")
-    # load_mesh(G, "./data/mesh")
-    # load_gene_ontology(G, "data/gene_ontology/go.owl")
-    # load_disease_ontology(G, "data/disease_ontology/HumanDiseaseOntology/src/ontology/releases/doid-merged.owl")
+    snapshot = config.get("snapshot")
+    if manifest is not None:
+        dependencies = {source: entry["fingerprint"] for source, entry in entries.items()}
+        dependencies["dense_ids"] = str(dense_ids)
+        if snapshot and manifest.derived_is_current("snapshot", dependencies, snapshot):
+            log.info(f"Snapshot {snapshot} is up to date")
+            snapshot = None
+        elif snapshot:
+            manifest.record_derived("snapshot", dependencies)
+    if snapshot:
+        save_snapshot(G, snapshot)
+    if manifest is not None:
+        manifest.save()
+    if config.get("lazy_attributes"):
+        make_lazy(G, config["lazy_attributes"])
+    return G
 
 
 if __name__ == "__main__":
-    load()
+    logging.basicConfig(level=logging.INFO)
+    load(sys.argv[1])
@@ -0,0 +1,158 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .base import LOADERS
+from .instrumentation import configure
+from .synthetic import generate_all
+
+log = logging.getLogger(__name__)
+
+# Metrics compared against baselines, with whether higher values are better
+METRICS = {"rows_per_second": True, "bytes_per_second": True, "peak_rss": False}
+
+
+def _run_loader(source: str, path: str) -> Dict[str, Any]:
+    """
+    Builds one source in this (child) process and returns the instrumentation summary of the load.
+    """
+    events: List[Dict[str, Any]] = []
+    configure(sinks=[events.append])
+    G = LOADERS[source](path)
+    summary = dict(events[-1])
+    summary.pop("stages", None)
+    summary.update({"nodes": G.number_of_nodes(), "edges": G.number_of_edges()})
+    return summary
+
+
+def run_benchmarks(
+    directory: str, rows: int, sources: Optional[List[str]] = None, seed: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generates synthetic releases and builds each source from them in a fresh child process, so that the peak RSS of
+    one loader does not carry over to the next.
+
+    Args:
+        directory (str): Directory for the synthetic releases.
+        rows (int): Approximate rows of the largest file of each source, see `synthetic.generate_all`.
+        sources (Optional[List[str]]): Sources to benchmark (default is all).
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The load summary of each source.
+    """
+    config = generate_all(directory, rows, seed=seed)
+    results = {}
+    for source, options in config["sources"].items():
+        if sources and source not in sources:
+            continue
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[source] = executor.submit(_run_loader, source, options["path"]).result()
+        log.info(
+            f"{source}: {results[source]['rows_read']} rows in {results[source]['seconds']:.2f}s, "
+            f"{results[source]['rows_per_second']:.0f} rows/s, peak RSS {results[source]['peak_rss'] / 2**20:.1f} MiB"
+        )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baselines: Dict[str, Dict[str, Any]], tolerance: float = 0.25
+) -> List[str]:
+    """
+    Compares benchmark results with baselines.
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Load summaries by source, from `run_benchmarks`.
+        baselines (Dict[str, Dict[str, Any]]): Baseline summaries by source.
+        tolerance (float): Allowed relative regression of every metric (default is 0.25).
+
+    Returns:
+        List[str]: The regressions found, empty if none.
+    """
+    regressions = []
+    for source, result in results.items():
+        baseline = baselines.get(source)
+        if not baseline:
+            log.warning(f"No baseline for {source}")
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if not baseline.get(metric):
+                continue
+            change = result[metric] / baseline[metric] - 1
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(
+                    f"{source} {metric} regressed by {abs(change):.0%}: {result[metric]:.0f} vs {baseline[metric]:.0f}"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the knowledge graph loaders on synthetic releases.")
+    parser.add_argument("--rows", type=int, default=10000, help="Approximate rows per source, 10k to 10M.")
+    parser.add_argument("--sources", nargs="*", choices=sorted(LOADERS), help="Sources to benchmark, default all.")
+    parser.add_argument("--baseline", default="benchmarks/baselines.json", help="Baselines file.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression.")
+    parser.add_argument("--update", action="store_true", help="Store the results as the new baselines.")
+    parser.add_argument("--directory", help="Directory for the synthetic releases, default a temporary one.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args(argv)
+
+    if args.directory:
+        results = run_benchmarks(args.directory, args.rows, args.sources)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = run_benchmarks(directory, args.rows, args.sources)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # Baselines are kept per scale, rows per second and memory do not scale linearly
+    stored: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+    scale = str(args.rows)
+
+    if args.update:
+        stored.setdefault(scale, {}).update(
+            {source: {metric: result[metric] for metric in METRICS} for source, result in results.items()}
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        log.info(f"Updated baselines for {scale} rows in {args.baseline}")
+        return 0
+
+    if scale not in stored:
+        log.warning(f"No baselines for {scale} rows in {args.baseline}, run with --update to record them")
+        return 0
+    regressions = compare(results, stored[scale], args.tolerance)
+    for regression in regressions:
+        log.error(regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import networkx as nx
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+# Key of the version token kept in a graph's `__networkx_cache__`, which NetworkX clears on every structural edit
+_VERSION_KEY = "geniusrise_healthcare.version"
+
+
+def _root(G: Any) -> Any:
+    # Subgraph and reverse views share the structure of the graph they were made from
+    while getattr(G, "_graph", None) is not None:
+        G = G._graph
+    return G
+
+
+def graph_version(G: nx.DiGraph) -> Optional[object]:
+    """
+    Token identifying the current version of a graph's structure.
+
+    The token lives in the graph's `__networkx_cache__`, which NetworkX clears from every method adding or removing
+    nodes or edges, so any such edit, including rewiring that keeps the node and edge counts, yields a new token.
+    Views get the token of the graph they were made from. Graphs without that cache, such as `CSRGraph`, are
+    immutable and have no token.
+    """
+    cache = getattr(_root(G), "__networkx_cache__", None)
+    if cache is None:
+        return None
+    return cache.setdefault(_VERSION_KEY, object())
+
+
+def graph_signature(G: nx.DiGraph) -> Tuple[int, int, Optional[object]]:
+    """
+    Cheap fingerprint of a graph's structure: its node and edge counts and its version token.
+
+    Adding, removing or rewiring nodes and edges through NetworkX invalidates values cached for a graph. Attribute
+    edits (`G.nodes[n][key] = value`, `G.edges[u, v][key] = value`) and writes to the adjacency dicts are not
+    detected, call `GraphCache.invalidate` after them.
+    """
+    return G.number_of_nodes(), G.number_of_edges(), graph_version(G)
+
+
+class GraphCache:
+    """
+    Values derived from a graph (conversions, indexes, scores) cached per graph object.
+
+    Entries are held weakly by graph, so they are dropped with the graph, and are rebuilt when the graph's
+    signature changes. Edits the signature cannot see, such as attribute edits, require `invalidate`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: (
+            "weakref.WeakKeyDictionary[nx.DiGraph, Tuple[Tuple[int, int, Optional[object]], Dict[Hashable, Any]]]"
+        ) = weakref.WeakKeyDictionary()
+
+    def get(self, G: nx.DiGraph, key: Hashable, build: Callable[[], T]) -> T:
+        """
+        Returns the value cached for a graph under a key, building and caching it if missing or stale.
+
+        Args:
+            G (nx.DiGraph): The graph.
+            key (Hashable): Identifies the derived value, including any parameters it depends on.
+            build (Callable[[], T]): Builds the value.
+
+        Returns:
+            The value.
+        """
+        signature = graph_signature(G)
+        entry = self._entries.get(G)
+        if entry is None or entry[0] != signature:
+            entry = (signature, {})
+            self._entries[G] = entry
+        values = entry[1]
+        if key not in values:
+            log.debug(f"Building {key} for graph with signature {signature}")
+            values[key] = build()
+        return values[key]
+
+    def invalidate(self, G: nx.DiGraph) -> None:
+        """
+        Drops everything cached for a graph and bumps its version, so that values cached for its views are rebuilt too.
+        """
+        cache = getattr(_root(G), "__networkx_cache__", None)
+        if cache is not None:
+            cache.pop(_VERSION_KEY, None)
+        self._entries.pop(G, None)
+
+
+# Shared by the accelerated algorithms, views and indexes built over a graph
+graph_cache = GraphCache()
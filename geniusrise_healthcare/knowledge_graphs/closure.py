@@ -0,0 +1,232 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class ClosureIndex:
+    """
+    Transitive closure of a hierarchy (e.g. `is_a`), kept outside the graph.
+
+    The graph only stores edges to direct parents. The closure is computed once, in topological order, and
+    stored as two CSR arrays over dense node indices: the ancestors of each node, and its transpose, the
+    descendants. Each row is sorted, so membership tests are binary searches.
+    """
+
+    def __init__(
+        self,
+        nodes: List[Hashable],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        order: np.ndarray,
+    ) -> None:
+        """
+        Args:
+            nodes (List[Hashable]): Node ids, position is the dense index of the node.
+            indptr (np.ndarray): Row pointers of the ancestors CSR.
+            indices (np.ndarray): Ancestor indices, sorted within each row.
+            order (np.ndarray): Node indices in topological order, parents before children.
+        """
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.order = order
+
+        # Transpose the ancestors into the descendants
+        rows = np.repeat(np.arange(len(nodes), dtype=np.int32), np.diff(indptr))
+        permutation = np.lexsort((rows, indices))
+        self.descendant_indices = rows[permutation]
+        self.descendant_indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(nodes)), out=self.descendant_indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.index
+
+    @classmethod
+    def from_edges(
+        cls, edges: Iterable[Tuple[Hashable, Hashable]], nodes: Optional[Iterable[Hashable]] = None
+    ) -> "ClosureIndex":
+        """
+        Builds the closure from (child, parent) edges.
+
+        Args:
+            edges (Iterable[Tuple[Hashable, Hashable]]): (child, parent) edges of the hierarchy.
+            nodes (Optional[Iterable[Hashable]]): Nodes to include even if they have no edges.
+
+        Returns:
+            The closure index.
+        """
+        index: Dict[Hashable, int] = {}
+        for node in nodes or []:
+            index.setdefault(node, len(index))
+        children: List[int] = []
+        parents: List[int] = []
+        for child, parent in edges:
+            if child == parent:
+                continue
+            children.append(index.setdefault(child, len(index)))
+            parents.append(index.setdefault(parent, len(index)))
+
+        n = len(index)
+        children_array = np.array(children, dtype=np.int64)
+        parents_array = np.array(parents, dtype=np.int64)
+
+        # Direct parents of every node, as CSR
+        permutation = np.argsort(children_array, kind="stable")
+        parent_indices = parents_array[permutation]
+        parent_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(children_array, minlength=n), out=parent_indptr[1:])
+
+        # Kahn's algorithm from the roots down, so that every parent is closed before its children
+        pending = np.diff(parent_indptr)
+        child_permutation = np.argsort(parents_array, kind="stable")
+        child_indices = children_array[child_permutation]
+        child_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents_array, minlength=n), out=child_indptr[1:])
+
+        order = list(np.flatnonzero(pending == 0))
+        ancestors: List[np.ndarray] = [np.empty(0, dtype=np.int32)] * n
+        head = 0
+        while head < len(order):
+            node = order[head]
+            head += 1
+            direct = parent_indices[parent_indptr[node] : parent_indptr[node + 1]]
+            if len(direct):
+                ancestors[node] = np.unique(np.concatenate([direct.astype(np.int32)] + [ancestors[p] for p in direct]))
+            for child in child_indices[child_indptr[node] : child_indptr[node + 1]]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    order.append(child)
+
+        if len(order) < n:
+            log.error(f"Hierarchy has a cycle through {n - len(order)} nodes")
+            raise ValueError(f"Hierarchy has a cycle through {n - len(order)} nodes")
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in ancestors], out=indptr[1:])
+        indices = np.concatenate(ancestors) if n else np.empty(0, dtype=np.int32)
+        log.info(f"Built closure of {n} nodes with {len(indices)} ancestor pairs.")
+        return cls(list(index), indptr, indices, np.array(order, dtype=np.int32))
+
+    @classmethod
+    def from_graph(cls, G: nx.DiGraph, relationship: Any = "is_a", key: str = "type") -> "ClosureIndex":
+        """
+        Builds the closure from the edges of a graph that point from children to parents.
+
+        Args:
+            G (nx.DiGraph): The NetworkX graph.
+            relationship (Any): Value of the edge attribute selecting the hierarchy edges (default is "is_a").
+            key (str): The edge attribute holding the relationship (default is "type").
+
+        Returns:
+            The closure index.
+        """
+        return cls.from_edges((u, v) for u, v, value in G.edges(data=key) if value == relationship)
+
+    def ancestor_indices(self, i: int) -> np.ndarray:
+        """
+        Dense indices of the ancestors of the node with dense index `i`.
+        """
+        return self.indices[self.indptr[i] : self.indptr[i + 1]]
+
+    def descendant_indices_of(self, i: int) -> np.ndarray:
+        """
+        Dense indices of the descendants of the node with dense index `i`.
+        """
+        return self.descendant_indices[self.descendant_indptr[i] : self.descendant_indptr[i + 1]]
+
+    def ancestors(self, node: Hashable) -> List[Hashable]:
+        """
+        Lists all ancestors of a node, excluding the node itself.
+
+        Args:
+            node (Hashable): The node id.
+
+        Returns:
+            List of ancestor node ids.
+        """
+        i = self.index.get(node)
+        if i is None:
+            return []
+        return [self.nodes[j] for j in self.ancestor_indices(i)]
+
+    def descendants(self, node: Hashable) -> List[Hashable]:
+        """
+        Lists all descendants of a node, excluding the node itself.
+
+        Args:
+            node (Hashable): The node id.
+
+        Returns:
+            List of descendant node ids.
+        """
+        i = self.index.get(node)
+        if i is None:
+            return []
+        return [self.nodes[j] for j in self.descendant_indices_of(i)]
+
+    def is_ancestor(self, ancestor: Hashable, node: Hashable) -> bool:
+        """
+        Checks whether `ancestor` is a strict ancestor of `node`.
+
+        Args:
+            ancestor (Hashable): The candidate ancestor id.
+            node (Hashable): The node id.
+
+        Returns:
+            True if `ancestor` is reachable from `node` through the hierarchy.
+        """
+        i = self.index.get(node)
+        j = self.index.get(ancestor)
+        if i is None or j is None:
+            return False
+        row = self.ancestor_indices(i)
+        position = np.searchsorted(row, j)
+        return bool(position < len(row) and row[position] == j)
+
+    def restrict(self, nodes: Iterable[Hashable]) -> "ClosureIndex":
+        """
+        The closure over a subset of the nodes, keeping only ancestors inside the subset. The result is the closure
+        of the sub-hierarchy when the subset is closed under ancestors.
+
+        Args:
+            nodes (Iterable[Hashable]): Nodes to keep, nodes missing from the closure are ignored.
+
+        Returns:
+            The restricted closure index.
+        """
+        keep = np.zeros(len(self.nodes), dtype=bool)
+        keep[[self.index[node] for node in nodes if node in self.index]] = True
+        remap = np.cumsum(keep, dtype=np.int64) - 1
+
+        rows = np.repeat(np.arange(len(self.nodes)), np.diff(self.indptr))
+        mask = keep[rows] & keep[self.indices]
+        indptr = np.zeros(int(keep.sum()) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(remap[rows[mask]], minlength=len(indptr) - 1), out=indptr[1:])
+        # Rows stay sorted: the remap is monotonic
+        indices = remap[self.indices[mask]].astype(np.int32)
+        order = remap[self.order[keep[self.order]]].astype(np.int32)
+        return ClosureIndex([node for node, kept in zip(self.nodes, keep) if kept], indptr, indices, order)
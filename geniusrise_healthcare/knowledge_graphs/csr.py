@@ -0,0 +1,570 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from .cache import graph_cache
+
+log = logging.getLogger(__name__)
+
+# Edge attributes naming the relationship of an edge, in order of preference, across the loaders
+EDGE_TYPE_KEYS = ("type", "relationship_type", "rel")
+
+# Node attributes with more distinct values than this are not kept as categorical columns
+MAX_CATEGORIES = 1 << 16
+
+
+def _gather(indptr: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """
+    Returns the positions in the CSR indices of all entries of the rows in `frontier`.
+    """
+    starts = indptr[frontier]
+    lengths = indptr[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+class CSRGraph:
+    """
+    Immutable compressed sparse row copy of a built knowledge graph.
+
+    Nodes are dense positions into `nodes`, which holds the native ids. Out- and in-adjacency are CSR arrays
+    with neighbors sorted within each row, and the relationship of every edge is a small integer code into
+    `edge_type_names`. Low cardinality node attributes (`type`, `tag`, ...) are kept as categorical columns. This
+    takes a few bytes per edge instead of the hundreds a NetworkX dict-of-dicts takes, and neighborhoods are
+    gathered with NumPy instead of Python loops.
+    """
+
+    def __init__(
+        self,
+        nodes: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        edge_types: np.ndarray,
+        edge_type_names: List[Any],
+        columns: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+        in_adjacency: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+        sorter: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Args:
+            nodes (np.ndarray): Native node ids, position is the dense index of the node.
+            indptr (np.ndarray): Row pointers of the out-adjacency.
+            indices (np.ndarray): Targets of the out-edges, sorted within each row.
+            edge_types (np.ndarray): Relationship code of every out-edge.
+            edge_type_names (List[Any]): Relationship of every code.
+            columns (Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]): Node attribute name to the category code
+                of every node (-1 if unset) and the categories.
+            in_adjacency (Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]): Precomputed row pointers, sources and
+                relationship codes of the in-adjacency, transposed from the out-adjacency if not given.
+            sorter (Optional[np.ndarray]): Precomputed argsort of integer node ids.
+        """
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types
+        self.edge_type_names = edge_type_names
+        self.edge_type_codes = {name: code for code, name in enumerate(edge_type_names)}
+        self.columns = columns or {}
+
+        # Integer ids are found by binary search, anything else through a dict, both built on first lookup
+        self._sorter = sorter
+        self._sorted: Optional[np.ndarray] = None
+        self._index: Optional[Dict[Hashable, int]] = None
+
+        if in_adjacency is not None:
+            self.in_indptr, self.in_indices, self.in_edge_types = in_adjacency
+            return
+
+        # Transpose the out-adjacency into the in-adjacency
+        n = len(nodes)
+        sources = self.edge_sources()
+        permutation = np.lexsort((sources, indices))
+        self.in_indices = sources[permutation]
+        self.in_edge_types = edge_types[permutation]
+        self.in_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n), out=self.in_indptr[1:])
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: object) -> bool:
+        return self.position(node) >= 0
+
+    def number_of_nodes(self) -> int:
+        return len(self.nodes)
+
+    def number_of_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes taken by the adjacency and column arrays, excluding the native ids.
+        """
+        arrays = [self.indptr, self.indices, self.edge_types, self.in_indptr, self.in_indices, self.in_edge_types]
+        arrays += [codes for codes, _ in self.columns.values()]
+        return sum(array.nbytes for array in arrays)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        nodes: np.ndarray,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        edge_types: np.ndarray,
+        edge_type_names: List[Any],
+        columns: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+    ) -> "CSRGraph":
+        """
+        Builds the graph from edges given as arrays of dense node positions.
+
+        Args:
+            nodes (np.ndarray): Native node ids.
+            sources (np.ndarray): Source position of every edge.
+            targets (np.ndarray): Target position of every edge.
+            edge_types (np.ndarray): Relationship code of every edge.
+            edge_type_names (List[Any]): Relationship of every code.
+            columns (Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]]): Categorical node columns.
+
+        Returns:
+            CSRGraph: The graph.
+        """
+        n = len(nodes)
+        index_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+        permutation = np.lexsort((targets, sources))
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        if len(edge_type_names) <= 1 << 8:
+            type_dtype: Any = np.uint8
+        elif len(edge_type_names) <= 1 << 16:
+            type_dtype = np.uint16
+        else:
+            type_dtype = np.int32
+        return cls(
+            nodes,
+            indptr,
+            np.asarray(targets, dtype=index_dtype)[permutation],
+            np.asarray(edge_types, dtype=type_dtype)[permutation],
+            edge_type_names,
+            columns,
+        )
+
+    @classmethod
+    def from_networkx(
+        cls,
+        G: nx.DiGraph,
+        edge_type_keys: Sequence[str] = EDGE_TYPE_KEYS,
+        node_columns: Optional[Iterable[str]] = None,
+    ) -> "CSRGraph":
+        """
+        Converts a built NetworkX graph.
+
+        Args:
+            G (nx.DiGraph): The graph.
+            edge_type_keys (Sequence[str]): Edge attributes holding the relationship, the first one set on an edge is
+                used (default is "type", "relationship_type" then "rel").
+            node_columns (Optional[Iterable[str]]): Node attributes to keep as categorical columns. Defaults to every
+                attribute whose values are all hashable and have at most 65536 distinct values.
+
+        Returns:
+            CSRGraph: The graph.
+        """
+        node_list = list(G)
+        if all(isinstance(node, (int, np.integer)) and not isinstance(node, bool) for node in node_list):
+            nodes = np.array(node_list, dtype=np.int64)
+        else:
+            nodes = np.empty(len(node_list), dtype=object)
+            nodes[:] = node_list
+        position = {node: i for i, node in enumerate(node_list)}
+
+        edge_type_codes: Dict[Any, int] = {}
+        sources = np.empty(G.number_of_edges(), dtype=np.int64)
+        targets = np.empty(G.number_of_edges(), dtype=np.int64)
+        edge_types = np.empty(G.number_of_edges(), dtype=np.int32)
+        for i, (u, v, data) in enumerate(G.edges(data=True)):
+            sources[i] = position[u]
+            targets[i] = position[v]
+            relationship = next((data[key] for key in edge_type_keys if key in data), None)
+            code = edge_type_codes.get(relationship)
+            if code is None:
+                code = edge_type_codes[relationship] = len(edge_type_codes)
+            edge_types[i] = code
+
+        columns = cls._node_columns(G, node_columns)
+        graph = cls.from_arrays(nodes, sources, targets, edge_types, list(edge_type_codes), columns)
+        log.info(
+            f"Converted {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges with "
+            f"{len(edge_type_codes)} edge types and {len(columns)} node columns into {graph.nbytes} bytes"
+        )
+        return graph
+
+    @staticmethod
+    def _node_columns(G: nx.DiGraph, keys: Optional[Iterable[str]]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        wanted = None if keys is None else set(keys)
+        categories: Dict[str, Dict[Any, int]] = {}
+        rejected = set()
+        codes: Dict[str, np.ndarray] = {}
+        for i, (_, data) in enumerate(G.nodes(data=True)):
+            for key, value in data.items():
+                if key in rejected or (wanted is not None and key not in wanted):
+                    continue
+                column = categories.get(key)
+                if column is None:
+                    column = categories[key] = {}
+                    codes[key] = np.full(G.number_of_nodes(), -1, dtype=np.int32)
+                try:
+                    code = column.get(value)
+                except TypeError:
+                    code = None
+                    if wanted is None:
+                        rejected.add(key)
+                        continue
+                    value = tuple(value)
+                    code = column.get(value)
+                if code is None:
+                    if len(column) >= MAX_CATEGORIES and wanted is None:
+                        rejected.add(key)
+                        continue
+                    code = column[value] = len(column)
+                codes[key][i] = code
+
+        columns = {}
+        for key, column in categories.items():
+            if key in rejected:
+                continue
+            values = np.empty(len(column), dtype=object)
+            values[:] = list(column)
+            columns[key] = (codes[key], values)
+        return columns
+
+    @property
+    def integer_ids(self) -> bool:
+        """
+        Whether the native node ids are integers.
+        """
+        return self.nodes.dtype.kind in "iu"
+
+    @property
+    def sorter(self) -> np.ndarray:
+        """
+        Argsort of the integer node ids, used to find nodes by binary search.
+        """
+        if self._sorter is None:
+            self._sorter = np.argsort(self.nodes, kind="stable")
+        return self._sorter
+
+    def _lookup(self) -> Any:
+        if self.integer_ids:
+            if self._sorted is None:
+                self._sorted = self.nodes[self.sorter]
+            return self._sorted
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.nodes.tolist())}
+        return self._index
+
+    def position(self, node: Hashable) -> int:
+        """
+        Returns the dense position of a node, -1 if it is not in the graph.
+        """
+        lookup = self._lookup()
+        if isinstance(lookup, dict):
+            return lookup.get(node, -1)
+        if not isinstance(node, (int, np.integer)):
+            return -1
+        i = int(np.searchsorted(lookup, node))
+        return int(self.sorter[i]) if i < len(lookup) and lookup[i] == node else -1
+
+    def positions(self, nodes: Iterable[Hashable]) -> np.ndarray:
+        """
+        Returns the dense positions of many nodes, -1 for nodes not in the graph.
+        """
+        lookup = self._lookup()
+        if isinstance(lookup, dict):
+            get = lookup.get
+            return np.array([get(node, -1) for node in nodes], dtype=np.int64)
+        query = np.asarray(list(nodes), dtype=np.int64)
+        if len(lookup) == 0:
+            return np.full(len(query), -1, dtype=np.int64)
+        i = np.minimum(np.searchsorted(lookup, query), len(lookup) - 1)
+        return np.where(lookup[i] == query, self.sorter[i], -1)
+
+    def _require(self, node: Hashable) -> int:
+        i = self.position(node)
+        if i < 0:
+            raise KeyError(f"Node {node} not found in the graph.")
+        return i
+
+    def _type_mask(self, types: np.ndarray, edge_types: Optional[Iterable[Any]]) -> Optional[np.ndarray]:
+        if edge_types is None:
+            return None
+        codes = [self.edge_type_codes[name] for name in edge_types if name in self.edge_type_codes]
+        return np.isin(types, codes)
+
+    def edge_sources(self) -> np.ndarray:
+        """
+        Returns the source position of every out-edge, aligned with `indices`.
+        """
+        return np.repeat(np.arange(len(self.nodes), dtype=self.indices.dtype), np.diff(self.indptr))
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_indptr)
+
+    def degree(self) -> np.ndarray:
+        return self.out_degree() + self.in_degree()
+
+    def successor_positions(self, i: int, edge_types: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Returns the positions of the successors of the node at position `i`.
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        neighbors = self.indices[start:end]
+        mask = self._type_mask(self.edge_types[start:end], edge_types)
+        return neighbors if mask is None else neighbors[mask]
+
+    def predecessor_positions(self, i: int, edge_types: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Returns the positions of the predecessors of the node at position `i`.
+        """
+        start, end = self.in_indptr[i], self.in_indptr[i + 1]
+        neighbors = self.in_indices[start:end]
+        mask = self._type_mask(self.in_edge_types[start:end], edge_types)
+        return neighbors if mask is None else neighbors[mask]
+
+    def successors(self, node: Hashable, edge_types: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Returns the successors of a node.
+
+        Args:
+            node (Hashable): The node.
+            edge_types (Optional[Iterable[Any]]): Only follow edges of these relationships.
+
+        Returns:
+            np.ndarray: Native ids of the successors.
+        """
+        return self.nodes[self.successor_positions(self._require(node), edge_types)]
+
+    def predecessors(self, node: Hashable, edge_types: Optional[Iterable[Any]] = None) -> np.ndarray:
+        """
+        Returns the predecessors of a node.
+
+        Args:
+            node (Hashable): The node.
+            edge_types (Optional[Iterable[Any]]): Only follow edges of these relationships.
+
+        Returns:
+            np.ndarray: Native ids of the predecessors.
+        """
+        return self.nodes[self.predecessor_positions(self._require(node), edge_types)]
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        """
+        Returns whether the edge u -> v exists.
+        """
+        i, j = self.position(u), self.position(v)
+        if i < 0 or j < 0:
+            return False
+        row = self.indices[self.indptr[i] : self.indptr[i + 1]]
+        k = int(np.searchsorted(row, j))
+        return k < len(row) and row[k] == j
+
+    def edge_type(self, u: Hashable, v: Hashable) -> Any:
+        """
+        Returns the relationship of the edge u -> v.
+
+        Raises:
+            KeyError: If the edge does not exist.
+        """
+        i, j = self._require(u), self._require(v)
+        start = self.indptr[i]
+        row = self.indices[start : self.indptr[i + 1]]
+        k = int(np.searchsorted(row, j))
+        if k == len(row) or row[k] != j:
+            raise KeyError(f"Edge {u} -> {v} not found in the graph.")
+        return self.edge_type_names[self.edge_types[start + k]]
+
+    def node_attribute(self, key: str, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns a categorical node attribute, None where it is unset.
+
+        Args:
+            key (str): The attribute.
+            positions (Optional[np.ndarray]): Node positions, all nodes if not given.
+
+        Returns:
+            np.ndarray: The attribute values.
+        """
+        codes, categories = self.columns[key]
+        if positions is not None:
+            codes = codes[positions]
+        values = np.empty(len(codes), dtype=object)
+        values[codes >= 0] = categories[codes[codes >= 0]]
+        return values
+
+    def nodes_where(self, key: str, values: Iterable[Any]) -> np.ndarray:
+        """
+        Returns the positions of the nodes whose categorical attribute is one of `values`.
+        """
+        codes, categories = self.columns[key]
+        values = set(values)
+        wanted = [code for code, value in enumerate(categories.tolist()) if value in values]
+        return np.flatnonzero(np.isin(codes, wanted))
+
+    def k_hop_positions(
+        self,
+        sources: np.ndarray,
+        k: int = 1,
+        direction: str = "out",
+        edge_types: Optional[Iterable[Any]] = None,
+    ) -> np.ndarray:
+        """
+        Returns the positions of the nodes within k hops of the sources, the sources included.
+
+        Args:
+            sources (np.ndarray): Positions of the source nodes.
+            k (int): The number of hops (default is 1).
+            direction (str): Follow "out" edges, "in" edges or "both" (default is "out").
+            edge_types (Optional[Iterable[Any]]): Only follow edges of these relationships.
+
+        Returns:
+            np.ndarray: Sorted positions of the reached nodes.
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction {direction}, expected out, in or both")
+        adjacencies = []
+        if direction in ("out", "both"):
+            adjacencies.append((self.indptr, self.indices, self.edge_types))
+        if direction in ("in", "both"):
+            adjacencies.append((self.in_indptr, self.in_indices, self.in_edge_types))
+
+        visited = np.zeros(len(self.nodes), dtype=bool)
+        frontier = np.unique(np.asarray(sources, dtype=np.int64))
+        visited[frontier] = True
+        for _ in range(k):
+            reached = []
+            for indptr, indices, types in adjacencies:
+                entries = _gather(indptr, frontier)
+                mask = self._type_mask(types[entries], edge_types)
+                reached.append(indices[entries] if mask is None else indices[entries[mask]])
+            frontier = np.unique(np.concatenate(reached))
+            frontier = frontier[~visited[frontier]]
+            if len(frontier) == 0:
+                break
+            visited[frontier] = True
+        return np.flatnonzero(visited)
+
+    def k_hop(
+        self,
+        sources: Iterable[Hashable],
+        k: int = 1,
+        direction: str = "out",
+        edge_types: Optional[Iterable[Any]] = None,
+    ) -> np.ndarray:
+        """
+        Returns the nodes within k hops of the sources, the sources included.
+
+        Args:
+            sources (Iterable[Hashable]): The source nodes.
+            k (int): The number of hops (default is 1).
+            direction (str): Follow "out" edges, "in" edges or "both" (default is "out").
+            edge_types (Optional[Iterable[Any]]): Only follow edges of these relationships.
+
+        Returns:
+            np.ndarray: Native ids of the reached nodes.
+        """
+        positions = self.positions(sources)
+        if (positions < 0).any():
+            raise KeyError("Source nodes not found in the graph.")
+        return self.nodes[self.k_hop_positions(positions, k, direction, edge_types)]
+
+    def subgraph_positions(self, positions: np.ndarray) -> "CSRGraph":
+        """
+        Returns the subgraph induced by the nodes at `positions`.
+        """
+        positions = np.unique(np.asarray(positions, dtype=np.int64))
+        remap = np.full(len(self.nodes), -1, dtype=np.int64)
+        remap[positions] = np.arange(len(positions))
+        sources = remap[self.edge_sources()]
+        targets = remap[self.indices]
+        keep = (sources >= 0) & (targets >= 0)
+        columns = {key: (codes[positions], categories) for key, (codes, categories) in self.columns.items()}
+        return CSRGraph.from_arrays(
+            self.nodes[positions], sources[keep], targets[keep], self.edge_types[keep], self.edge_type_names, columns
+        )
+
+    def subgraph(self, nodes: Iterable[Hashable]) -> "CSRGraph":
+        """
+        Returns the subgraph induced by `nodes`, ignoring nodes not in the graph.
+        """
+        positions = self.positions(nodes)
+        return self.subgraph_positions(positions[positions >= 0])
+
+    def with_adjacency(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        edge_types: np.ndarray,
+        in_adjacency: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> "CSRGraph":
+        """
+        Returns a graph over the same nodes, columns and node lookup with other edges, e.g. a subset of the edges.
+        """
+        lookup = self._lookup()
+        graph = CSRGraph(
+            self.nodes, indptr, indices, edge_types, self.edge_type_names, self.columns, in_adjacency, self._sorter
+        )
+        if isinstance(lookup, dict):
+            graph._index = lookup
+        else:
+            graph._sorted = lookup
+        return graph
+
+    def to_networkx(self, edge_type_key: str = "type") -> nx.DiGraph:
+        """
+        Converts back to NetworkX, with the categorical columns as node attributes and the relationship under
+        `edge_type_key`.
+        """
+        G = nx.DiGraph()
+        nodes = self.nodes.tolist()
+        columns = [(key, self.node_attribute(key).tolist()) for key in self.columns]
+        for i, node in enumerate(nodes):
+            G.add_node(node, **{key: values[i] for key, values in columns if values[i] is not None})
+        names = self.edge_type_names
+        G.add_edges_from(
+            (nodes[u], nodes[v], {} if names[t] is None else {edge_type_key: names[t]})
+            for u, v, t in zip(self.edge_sources().tolist(), self.indices.tolist(), self.edge_types.tolist())
+        )
+        return G
+
+
+def csr_graph(G: Union[nx.DiGraph, CSRGraph]) -> CSRGraph:
+    """
+    The CSR copy of a NetworkX graph, converted once and cached in `graph_cache` until the graph changes. CSR graphs
+    are returned as they are. The copy holds the edge types and node columns, so call `graph_cache.invalidate(G)`
+    after editing those attributes.
+    """
+    if isinstance(G, CSRGraph):
+        return G
+    return graph_cache.get(G, "csr", lambda: CSRGraph.from_networkx(G))
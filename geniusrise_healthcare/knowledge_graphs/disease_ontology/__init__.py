@@ -16,3 +16,5 @@
 from .base import load_disease_ontology
 from .diseases import process_diseases
 from .relationships import process_relationships
+from .utils import extract_ontology_records, load_ontology_records
+from .xrefs import XrefIndex, normalize_xref
@@ -14,28 +14,46 @@
 # limitations under the License.
 
 import logging
+from typing import Optional
 import networkx as nx
 from .diseases import process_diseases
 from .relationships import process_relationships
+from .utils import load_ontology_records
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
-def load_disease_ontology(G: nx.DiGraph, ontology_file: str) -> nx.DiGraph:
+@instrumented("disease_ontology")
+def load_disease_ontology(
+    G: nx.DiGraph, ontology_file: str, cache_dir: Optional[str] = None, parser: str = "auto"
+) -> nx.DiGraph:
     """
     Loads Disease Ontology data into a NetworkX graph.
 
     Args:
         G: (nx.DiGraph): The networkx graph.
         ontology_file (str): Path to the Disease Ontology OBO or OWL file.
+        cache_dir (Optional[str]): Directory in which the extracted diseases and edges are cached, so that
+            repeat builds from the same file skip parsing it (default is None, no caching).
+        parser (str): "obo" for the native OBO parser, "pronto", or "auto" to pick by file extension
+            (default is "auto").
 
     Returns:
         The NetworkX graph containing Disease Ontology data.
     """
     try:
-        process_diseases(ontology_file, G)
+        # Parse the ontology once and share the records across the processors, which work in memory. The records
+        # stage reads one row per term stanza
+        with stage("disease_ontology.records", G, ontology_file) as current:
+            records = load_ontology_records(ontology_file, cache_dir=cache_dir, parser=parser)
+            current.rows_read = len(records["terms"])
 
-        process_relationships(ontology_file, G)
+        with stage("disease_ontology.diseases", G):
+            process_diseases(ontology_file, G, records=records)
+
+        with stage("disease_ontology.relationships", G):
+            process_relationships(ontology_file, G, records=records)
 
         log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     except Exception as e:
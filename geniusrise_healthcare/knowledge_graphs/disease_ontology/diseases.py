@@ -14,33 +14,37 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 import networkx as nx
-from .utils import read_ontology_file
+from .utils import load_ontology_records
+from .xrefs import XrefIndex
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_diseases(ontology_file: str, G: nx.DiGraph) -> None:
+def process_diseases(ontology_file: str, G: nx.DiGraph, records: Optional[Dict[str, List[Any]]] = None) -> None:
     """
     Processes the Disease Ontology file and adds disease nodes to the graph.
 
     Args:
         ontology_file (str): Path to the Disease Ontology OBO or OWL file.
-        G (nx.DiGraph): The NetworkX graph to which the disease nodes will be added.
+        G (nx.DiGraph): The NetworkX graph to which the disease nodes will be added. The xref inverted index is
+            stored in `G.graph["xref_index"]`.
+        records (Optional[Dict[str, List[Any]]]): Records already extracted from `ontology_file` by
+            `load_ontology_records`, parsed from the file if not given.
 
     Returns:
         None
     """
     log.info(f"Loading diseases from {ontology_file}")
 
-    ontology = read_ontology_file(ontology_file)
-    for term in ontology.terms():
+    if records is None:
+        records = load_ontology_records(ontology_file)
+    for term_id, name, definition, synonyms, xrefs in track(records["terms"]):
         try:
-            if term.id.startswith("DOID:"):
-                synonyms = [synonym.description for synonym in term.synonyms]
-                xrefs = [xref.id for xref in term.xrefs]
-                G.add_node(
-                    term.id, name=term.name, definition=term.definition, type="disease", synonyms=synonyms, xrefs=xrefs
-                )
+            G.add_node(term_id, name=name, definition=definition, type="disease", synonyms=synonyms, xrefs=xrefs)
         except Exception as e:
-            log.error(f"Error processing disease {term}: {e}")
+            log.error(f"Error processing disease {term_id}: {e}")
+
+    G.graph["xref_index"] = XrefIndex.from_terms((term_id, xrefs) for term_id, _, _, _, xrefs in records["terms"])
@@ -14,37 +14,39 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 import networkx as nx
-from .utils import read_ontology_file
+from ..closure import ClosureIndex
+from .utils import load_ontology_records
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_relationships(ontology_file: str, G: nx.DiGraph) -> None:
+def process_relationships(ontology_file: str, G: nx.DiGraph, records: Optional[Dict[str, List[Any]]] = None) -> None:
     """
     Processes the Disease Ontology file and adds relationships to the graph.
 
+    Only edges to direct parents are added as `is_a` edges. Ancestor and descendant queries are served by a
+    `ClosureIndex` stored in `G.graph["disease_closure"]`.
+
     Args:
         ontology_file (str): Path to the Disease Ontology OBO or OWL file.
         G (nx.DiGraph): The NetworkX graph to which the relationships will be added.
+        records (Optional[Dict[str, List[Any]]]): Records already extracted from `ontology_file` by
+            `load_ontology_records`, parsed from the file if not given.
 
     Returns:
         None
     """
     log.info(f"Loading relationships from {ontology_file}")
 
-    ontology = read_ontology_file(ontology_file)
-    for term in ontology.terms():
-        if term.id.startswith("DOID:"):
-            # Process parent relationships (rdfs:subClassOf)
-            for parent in term.superclasses(with_self=False):
-                if parent.id.startswith("DOID:"):
-                    G.add_edge(term.id, parent.id, type="is_a")
-
-            # Process other relationships (owl:Restriction)
-            if hasattr(term, "restrictions"):
-                for restriction in term.restrictions():
-                    if restriction.property.id.startswith("http://purl.obolibrary.org/obo/"):
-                        for target in restriction.value:
-                            if target.id.startswith("http://purl.obolibrary.org/obo/"):
-                                G.add_edge(term.id, target.id, type=restriction.property.id)
+    if records is None:
+        records = load_ontology_records(ontology_file)
+    for term_id, related_id, relationship in track(records["edges"]):
+        G.add_edge(term_id, related_id, type=relationship)
+
+    G.graph["disease_closure"] = ClosureIndex.from_edges(
+        ((term_id, related_id) for term_id, related_id, relationship in records["edges"] if relationship == "is_a"),
+        nodes=(term[0] for term in records["terms"]),
+    )
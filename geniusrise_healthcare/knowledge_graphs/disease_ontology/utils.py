@@ -14,10 +14,15 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 from pronto import Ontology
+from .. import obo
 
 log = logging.getLogger(__name__)
 
+# Bumped whenever the extracted records change, to invalidate cached records
+RECORDS_VERSION = "2"
+
 
 def read_ontology_file(file_path: str) -> Ontology:
     """
@@ -35,3 +40,68 @@ def read_ontology_file(file_path: str) -> Ontology:
     except Exception as e:
         log.error(f"Error reading ontology file {file_path}: {e}")
         raise ValueError(f"Error reading ontology file {file_path}: {e}")
+
+
+def extract_ontology_records(ontology: Ontology) -> Dict[str, List[Any]]:
+    """
+    Extracts the Disease Ontology diseases and edges from an Ontology object into plain Python records.
+
+    Args:
+        ontology (Ontology): The parsed ontology.
+
+    Returns:
+        Dictionary with `terms`, a list of (id, name, definition, synonyms, xrefs) tuples, and `edges`, a list of
+        (disease, related disease, type) tuples. `is_a` edges point to the direct parents of a disease.
+    """
+    terms = []
+    edges = []
+    for term in ontology.terms():
+        try:
+            if not term.id.startswith("DOID:"):
+                continue
+            terms.append(
+                (
+                    term.id,
+                    term.name,
+                    str(term.definition) if term.definition is not None else None,
+                    [synonym.description for synonym in term.synonyms],
+                    [xref.id for xref in term.xrefs],
+                )
+            )
+            # Process direct parent relationships (rdfs:subClassOf), ancestors are served by the ClosureIndex
+            for parent in term.superclasses(distance=1, with_self=False):
+                if parent.id.startswith("DOID:"):
+                    edges.append((term.id, parent.id, "is_a"))
+
+            # Process other relationships (owl:Restriction)
+            for relationship, targets in term.relationships.items():
+                for target in targets:
+                    if target.id.startswith("DOID:"):
+                        edges.append((term.id, target.id, relationship.id))
+        except Exception as e:
+            log.error(f"Error extracting disease {term}: {e}")
+    return {"terms": terms, "edges": edges}
+
+
+def load_ontology_records(
+    file_path: str, cache_dir: Optional[str] = None, parser: str = "auto"
+) -> Dict[str, List[Any]]:
+    """
+    Parses an ontology file once and returns its records, optionally through a persistent cache.
+
+    Args:
+        file_path (str): Path to the ontology file.
+        cache_dir (Optional[str]): Directory of the records cache (default is None, no caching).
+        parser (str): "obo", "pronto", or "auto" to pick by file extension (default is "auto").
+
+    Returns:
+        The records as returned by `extract_ontology_records`.
+    """
+    return obo.load_ontology_records(
+        file_path,
+        prefix="DOID:",
+        extract=lambda path: extract_ontology_records(read_ontology_file(path)),
+        records_version=RECORDS_VERSION,
+        cache_dir=cache_dir,
+        parser=parser,
+    )
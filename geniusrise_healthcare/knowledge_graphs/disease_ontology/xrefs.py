@@ -0,0 +1,155 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Prefix spellings used across DO releases and by the source vocabularies themselves
+PREFIX_ALIASES = {
+    "UMLS_CUI": "UMLS",
+    "UMLS": "UMLS",
+    "MSH": "MESH",
+    "MESH": "MESH",
+    "MIM": "OMIM",
+    "OMIM": "OMIM",
+    "ICD10CM": "ICD10CM",
+    "ICD-10-CM": "ICD10CM",
+    "ICD9CM": "ICD9CM",
+    "ICD-9-CM": "ICD9CM",
+    "ICD10": "ICD10",
+    "ICD-10": "ICD10",
+    "ICDO": "ICDO",
+    "NCI": "NCI",
+    "NCIT": "NCI",
+    "ORDO": "ORPHANET",
+    "ORPHANET": "ORPHANET",
+    "GARD": "GARD",
+    "KEGG": "KEGG",
+    "MEDDRA": "MEDDRA",
+}
+
+# ICD codes are matched without the dot, so "C34.9" and "C349" are the same code
+DOTLESS_PREFIXES = {"ICD10CM", "ICD9CM", "ICD10", "ICDO"}
+
+
+def normalize_prefix(prefix: str) -> str:
+    """
+    Normalizes an xref prefix, e.g. `UMLS_CUI` to `UMLS` and `SNOMEDCT_US_2021_09_01` to `SNOMEDCT`.
+
+    Args:
+        prefix (str): The prefix.
+
+    Returns:
+        str: The normalized prefix.
+    """
+    prefix = prefix.strip().upper()
+    if prefix.startswith("SNOMEDCT"):
+        return "SNOMEDCT"
+    return PREFIX_ALIASES.get(prefix, prefix)
+
+
+def normalize_xref(xref: str, prefix: Optional[str] = None) -> str:
+    """
+    Normalizes an xref to `PREFIX:CODE`.
+
+    Args:
+        xref (str): The xref, either `PREFIX:CODE` or a bare code if `prefix` is given.
+        prefix (Optional[str]): The prefix of a bare code.
+
+    Returns:
+        str: The normalized xref.
+    """
+    if prefix is None:
+        prefix, _, code = xref.partition(":")
+    else:
+        code = xref
+    prefix = normalize_prefix(prefix)
+    code = code.strip().upper()
+    if prefix in DOTLESS_PREFIXES:
+        code = code.replace(".", "")
+    return f"{prefix}:{code}"
+
+
+class XrefIndex:
+    """
+    Inverted index from normalized xrefs (UMLS, ICD, MeSH, OMIM, ...) to the DOIDs that reference them.
+    """
+
+    def __init__(self, index: Dict[str, Tuple[str, ...]]) -> None:
+        """
+        Args:
+            index (Dict[str, Tuple[str, ...]]): Normalized xref to DOIDs.
+        """
+        self.index = index
+
+    @classmethod
+    def from_terms(cls, terms: Iterable[Tuple[str, Iterable[str]]]) -> "XrefIndex":
+        """
+        Builds the index from (DOID, xrefs) pairs.
+
+        Args:
+            terms (Iterable[Tuple[str, Iterable[str]]]): The DOIDs with their xrefs.
+
+        Returns:
+            XrefIndex: The index.
+        """
+        index: Dict[str, List[str]] = defaultdict(list)
+        for term_id, xrefs in terms:
+            for xref in xrefs:
+                if ":" not in xref:
+                    continue
+                doids = index[normalize_xref(xref)]
+                if term_id not in doids:
+                    doids.append(term_id)
+        return cls({xref: tuple(doids) for xref, doids in index.items()})
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, xref: str) -> bool:
+        return normalize_xref(xref) in self.index
+
+    def lookup(self, code: str, prefix: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Returns the DOIDs referencing a code.
+
+        Args:
+            code (str): The code, either `PREFIX:CODE` or a bare code if `prefix` is given.
+            prefix (Optional[str]): The vocabulary of a bare code, e.g. "ICD10CM" or "UMLS_CUI".
+
+        Returns:
+            Tuple[str, ...]: The DOIDs, empty if the code is unknown.
+        """
+        return self.index.get(normalize_xref(code, prefix), ())
+
+    def lookup_many(self, codes: Iterable[str], prefix: Optional[str] = None) -> List[Tuple[str, ...]]:
+        """
+        Returns the DOIDs referencing each of many codes.
+
+        Args:
+            codes (Iterable[str]): The codes, either `PREFIX:CODE` or bare codes if `prefix` is given.
+            prefix (Optional[str]): The vocabulary of bare codes.
+
+        Returns:
+            List[Tuple[str, ...]]: The DOIDs of every code, in order.
+        """
+        get = self.index.get
+        if prefix is not None:
+            prefix = normalize_prefix(prefix)
+            if prefix in DOTLESS_PREFIXES:
+                return [get(f"{prefix}:{code.strip().upper().replace('.', '')}", ()) for code in codes]
+            return [get(f"{prefix}:{code.strip().upper()}", ()) for code in codes]
+        return [get(normalize_xref(code), ()) for code in codes]
@@ -14,8 +14,9 @@
 # limitations under the License.
 
 from .base import load_drugbank
-from .drugs import process_drugs
+from .drugs import parse_drug_record, process_drugs
 from .interactions import process_interactions
+from .interaction_index import InteractionIndex, build_interaction_index
 from .targets import process_targets
 from .enzymes import process_enzymes
 from .carriers import process_carriers
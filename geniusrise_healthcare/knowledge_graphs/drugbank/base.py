@@ -18,20 +18,27 @@ import os
 import networkx as nx
 from .drugs import process_drugs
 from .interactions import process_interactions
+from .interaction_index import build_interaction_index
 from .targets import process_targets
 from .enzymes import process_enzymes
 from .carriers import process_carriers
 from .transporters import process_transporters
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
-def load_drugbank(drugbank_path: str) -> nx.DiGraph:
+@instrumented("drugbank")
+def load_drugbank(drugbank_path: str, compact_interactions: bool = False, lazy_details: bool = False) -> nx.DiGraph:
     """
     Loads DrugBank data into a NetworkX graph.
 
     Args:
         drugbank_path (str): Path to the DrugBank XML file.
+        compact_interactions (bool): Store drug-drug interactions in an `InteractionIndex` under
+            `G.graph["interaction_index"]` instead of as `interaction` edges (default is False).
+        lazy_details (bool): Keep the drug descriptions, categories and synonyms on disk and serve them from
+            `G.graph["drug_records"].get_record(drugbank_id)` (default is False).
 
     Returns:
         The NetworkX graph containing DrugBank data.
@@ -40,12 +47,22 @@ def load_drugbank(drugbank_path: str) -> nx.DiGraph:
 
     drugs_file = os.path.join(drugbank_path, "drugbank.xml")
 
-    process_drugs(drugs_file, G)
-    process_interactions(drugs_file, G)
-    process_targets(drugs_file, G)
-    process_enzymes(drugs_file, G)
-    process_carriers(drugs_file, G)
-    process_transporters(drugs_file, G)
+    with stage("drugbank.drugs", G, drugs_file):
+        process_drugs(drugs_file, G, lazy=lazy_details)
+    if compact_interactions:
+        with stage("drugbank.interactions", G, drugs_file):
+            G.graph["interaction_index"] = build_interaction_index(drugs_file)
+    else:
+        with stage("drugbank.interactions", G, drugs_file):
+            process_interactions(drugs_file, G)
+    with stage("drugbank.targets", G, drugs_file):
+        process_targets(drugs_file, G)
+    with stage("drugbank.enzymes", G, drugs_file):
+        process_enzymes(drugs_file, G)
+    with stage("drugbank.carriers", G, drugs_file):
+        process_carriers(drugs_file, G)
+    with stage("drugbank.transporters", G, drugs_file):
+        process_transporters(drugs_file, G)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
@@ -16,6 +16,7 @@
 import logging
 import networkx as nx
 from .utils import read_xml_file, get_elements_by_tag
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ def process_carriers(drugbank_file: str, G: nx.DiGraph) -> None:
     tree = read_xml_file(drugbank_file)
     drug_elements = get_elements_by_tag(tree, "drug")
 
-    for drug in drug_elements:
+    for drug in track(drug_elements):
         drugbank_id = drug.findtext("drugbank-id[@primary='true']")
         carriers = drug.find("carriers")
         if carriers is not None:
@@ -51,3 +52,5 @@ def process_carriers(drugbank_file: str, G: nx.DiGraph) -> None:
                         G.add_edge(drugbank_id, carrier_id, type="carrier", actions=actions)
                 except Exception as e:
                     log.error(f"Error processing carrier for drug {drugbank_id}: {e}")
+        else:
+            skipped()
@@ -14,47 +14,79 @@
 # limitations under the License.
 
 import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict
 import networkx as nx
+from ..records import XMLRecordStore, iter_xml_records
 from .utils import read_xml_file, get_elements_by_tag
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
 
-def process_drugs(drugbank_file: str, G: nx.DiGraph) -> None:
+def parse_drug_record(drug: ET.Element) -> Dict[str, Any]:
+    """
+    Extracts the drug attributes from a DrugBank drug element.
+
+    Args:
+        drug (ET.Element): The drug element.
+
+    Returns:
+        Dictionary of drug attributes.
+    """
+    return {
+        "name": drug.findtext("name"),
+        "description": drug.findtext("description"),
+        "drug_type": drug.findtext("type"),
+        "categories": [category.text for category in drug.findall("categories/category")],
+        "synonyms": [synonym.text for synonym in drug.findall("synonyms/synonym")],
+    }
+
+
+def process_drugs(drugbank_file: str, G: nx.DiGraph, lazy: bool = False) -> None:
     """
     Processes the DrugBank drugs data and adds it to the graph.
 
+    In lazy mode the drug nodes only get their `name`, `type` and `drug_type`, and the full records are served
+    on demand by an `XMLRecordStore` kept in `G.graph["drug_records"]`.
+
     Args:
         drugbank_file (str): Path to the DrugBank XML file.
         G (nx.DiGraph): The NetworkX graph to which the drug data will be added.
+        lazy (bool): Leave the heavy text attributes out of the graph (default is False).
 
     Returns:
         None
     """
     log.info(f"Loading drugs from {drugbank_file}")
 
+    if lazy:
+        store = XMLRecordStore(drugbank_file, parse_drug_record)
+        for drug, offset, length in track(iter_xml_records(drugbank_file, "drug")):
+            try:
+                drugbank_id = drug.findtext("drugbank-id[@primary='true']")
+                if drugbank_id:
+                    G.add_node(drugbank_id, name=drug.findtext("name"), type="drug", drug_type=drug.findtext("type"))
+                    store.add(drugbank_id, offset, length)
+                else:
+                    skipped()
+            except Exception as e:
+                log.error(f"Error processing drug {drug}: {e}")
+                raise
+        G.graph["drug_records"] = store
+        return
+
     tree = read_xml_file(drugbank_file)
     drug_elements = get_elements_by_tag(tree, "drug")
 
-    for drug in drug_elements:
+    for drug in track(drug_elements):
         try:
             drugbank_id = drug.findtext("drugbank-id[@primary='true']")
-            name = drug.findtext("name")
-            description = drug.findtext("description")
-            drug_type = drug.findtext("type")
-            categories = [category.text for category in drug.findall("categories/category")]
-            synonyms = [synonym.text for synonym in drug.findall("synonyms/synonym")]
 
             if drugbank_id:
-                G.add_node(
-                    drugbank_id,
-                    name=name,
-                    description=description,
-                    type="drug",
-                    drug_type=drug_type,
-                    categories=categories,
-                    synonyms=synonyms,
-                )
+                G.add_node(drugbank_id, type="drug", **parse_drug_record(drug))
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing drug {drug}: {e}")
             raise
@@ -0,0 +1,291 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from .utils import iter_elements_by_tag
+
+log = logging.getLogger(__name__)
+
+
+def _templatize(description: Optional[str], drug_name: Optional[str], partner_name: Optional[str]) -> str:
+    """
+    Replaces the drug names in an interaction description with placeholders.
+
+    DrugBank descriptions are generated from a few hundred sentences which differ only in the two drug names,
+    so removing the names lets identical sentences share a single template.
+
+    Args:
+        description (Optional[str]): The interaction description.
+        drug_name (Optional[str]): Name of the drug listing the interaction.
+        partner_name (Optional[str]): Name of the interacting drug.
+
+    Returns:
+        The description as a `str.format` template with `{drug}` and `{partner}` placeholders.
+    """
+    template = (description or "").replace("{", "{{").replace("}", "}}")
+    names = [(name, placeholder) for name, placeholder in ((drug_name, "{drug}"), (partner_name, "{partner}")) if name]
+    # Replace the longer name first so that a name which is a prefix of the other does not clobber it
+    for name, placeholder in sorted(names, key=lambda x: len(x[0]), reverse=True):
+        template = template.replace(name.replace("{", "{{").replace("}", "}}"), placeholder)
+    return template
+
+
+class InteractionIndex:
+    """
+    Compact drug-drug interaction index.
+
+    Interactions are stored as a sorted array of directed pair keys (`source * n + target`) over dense drug
+    indices, with descriptions reduced to ids into a dictionary of templates. As the keys are sorted by source,
+    the array doubles as a CSR adjacency whose row pointers are kept in `indptr`.
+    """
+
+    def __init__(
+        self,
+        drug_ids: List[str],
+        names: List[Optional[str]],
+        keys: np.ndarray,
+        template_ids: np.ndarray,
+        templates: List[str],
+        type_ids: np.ndarray,
+        types: List[Optional[str]],
+    ) -> None:
+        """
+        Args:
+            drug_ids (List[str]): DrugBank ids, position is the dense index of the drug.
+            names (List[Optional[str]]): Drug names aligned with `drug_ids`.
+            keys (np.ndarray): Sorted, unique int64 pair keys.
+            template_ids (np.ndarray): Template id of each pair.
+            templates (List[str]): Description templates.
+            type_ids (np.ndarray): Interaction type id of each pair.
+            types (List[Optional[str]]): Interaction types.
+        """
+        self.drug_ids = drug_ids
+        self.names = names
+        self.keys = keys
+        self.template_ids = template_ids
+        self.templates = templates
+        self.type_ids = type_ids
+        self.types = types
+        self.index = {drug_id: i for i, drug_id in enumerate(drug_ids)}
+
+        n = len(drug_ids)
+        self.indptr = np.searchsorted(keys, np.arange(n + 1, dtype=np.int64) * n)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[str, str, Optional[str], Optional[str]]],
+        names: Dict[str, Optional[str]],
+    ) -> "InteractionIndex":
+        """
+        Builds the index from interaction rows.
+
+        Rows are consumed one at a time, each description is reduced to its template id as it arrives and only the
+        pair, template and type ids are kept, so the rows may be a stream over the DrugBank file. The names of the
+        two drugs of a row have to be in `names` when the row is consumed, and must not change afterwards since
+        descriptions are rebuilt from the templates with them.
+
+        Args:
+            rows (Iterable[Tuple[str, str, Optional[str], Optional[str]]]): (drug, partner, description, type) rows.
+            names (Dict[str, Optional[str]]): Mapping of DrugBank ids to drug names, possibly filled while the rows
+                are consumed.
+
+        Returns:
+            The interaction index.
+        """
+        index: Dict[str, int] = {}
+        template_index: Dict[str, int] = {}
+        type_index: Dict[Optional[str], int] = {}
+        sources = array("q")
+        targets = array("q")
+        template_ids = array("i")
+        type_ids = array("h")
+
+        for drug_id, partner_id, description, interaction_type in rows:
+            source = index.setdefault(drug_id, len(index))
+            target = index.setdefault(partner_id, len(index))
+            template = _templatize(description, names.get(drug_id), names.get(partner_id))
+            sources.append(source)
+            targets.append(target)
+            template_ids.append(template_index.setdefault(template, len(template_index)))
+            type_ids.append(type_index.setdefault(interaction_type, len(type_index)))
+
+        n = len(index)
+        keys = np.frombuffer(sources, dtype=np.int64) * n + np.frombuffer(targets, dtype=np.int64)
+        # A pair listed more than once keeps its first description
+        keys, first = np.unique(keys, return_index=True)
+
+        drug_ids = list(index)
+        return cls(
+            drug_ids=drug_ids,
+            names=[names.get(drug_id) for drug_id in drug_ids],
+            keys=keys,
+            template_ids=np.frombuffer(template_ids, dtype=np.int32)[first],
+            templates=list(template_index),
+            type_ids=np.frombuffer(type_ids, dtype=np.int16)[first],
+            types=list(type_index),
+        )
+
+    @classmethod
+    def from_graph(cls, G: nx.DiGraph) -> "InteractionIndex":
+        """
+        Builds the index from the `interaction` edges of a DrugBank graph.
+
+        Args:
+            G (nx.DiGraph): The NetworkX graph built by `load_drugbank`.
+
+        Returns:
+            The interaction index.
+        """
+        names = {node: data.get("name") for node, data in G.nodes(data=True) if data.get("type") == "drug"}
+        rows = (
+            (u, v, data.get("description"), data.get("interaction_type"))
+            for u, v, data in G.edges(data=True)
+            if data.get("type") == "interaction"
+        )
+        return cls.from_rows(rows, names)
+
+    def _record(self, position: int) -> Dict[str, Optional[str]]:
+        n = len(self.drug_ids)
+        source, target = divmod(int(self.keys[position]), n)
+        return {
+            "drug": self.drug_ids[source],
+            "partner": self.drug_ids[target],
+            "description": self.templates[self.template_ids[position]].format(
+                drug=self.names[source], partner=self.names[target]
+            ),
+            "interaction_type": self.types[self.type_ids[position]],
+        }
+
+    def partners(self, drug_id: str) -> List[str]:
+        """
+        Lists the drugs that a drug interacts with.
+
+        Args:
+            drug_id (str): The DrugBank id.
+
+        Returns:
+            DrugBank ids of the interacting drugs.
+        """
+        i = self.index.get(drug_id)
+        if i is None:
+            return []
+        n = len(self.drug_ids)
+        targets = self.keys[self.indptr[i] : self.indptr[i + 1]] - i * n
+        return [self.drug_ids[j] for j in targets]
+
+    def interactions(self, drug_id: str) -> List[Dict[str, Optional[str]]]:
+        """
+        Lists all interactions of a drug.
+
+        Args:
+            drug_id (str): The DrugBank id.
+
+        Returns:
+            List of interaction records.
+        """
+        i = self.index.get(drug_id)
+        if i is None:
+            return []
+        return [self._record(position) for position in range(self.indptr[i], self.indptr[i + 1])]
+
+    def check_interactions(self, drug_ids: List[str]) -> List[Dict[str, Optional[str]]]:
+        """
+        Finds all pairwise interactions among a list of drugs.
+
+        All candidate pairs are looked up in a single `np.searchsorted` over the pair keys. Each unordered pair is
+        reported once, preferring the direction in which the drugs appear in `drug_ids`.
+
+        Args:
+            drug_ids (List[str]): DrugBank ids of the drugs, e.g. a patient's medication list.
+
+        Returns:
+            List of interaction records with `drug`, `partner`, `description` and `interaction_type`.
+        """
+        n = len(self.drug_ids)
+        indices = [self.index[drug_id] for drug_id in dict.fromkeys(drug_ids) if drug_id in self.index]
+        if len(indices) < 2 or len(self.keys) == 0:
+            return []
+
+        indices = np.array(indices, dtype=np.int64)
+        i, j = np.triu_indices(len(indices), k=1)
+        a, b = indices[i], indices[j]
+        queries = np.concatenate([a * n + b, b * n + a])
+
+        positions = np.minimum(np.searchsorted(self.keys, queries), len(self.keys) - 1)
+        found = self.keys[positions] == queries
+
+        pairs = len(a)
+        forward, reverse = found[:pairs], found[pairs:]
+        hits = np.where(forward, positions[:pairs], np.where(reverse, positions[pairs:], -1))
+        return [self._record(position) for position in hits[hits >= 0]]
+
+
+def _interaction_rows(
+    drugbank_file: str, names: Dict[str, Optional[str]]
+) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+    """
+    Streams the (drug, partner, description, type) interaction rows of a DrugBank file, recording the names of both
+    drugs in `names` before their rows. A drug keeps the first name seen, from its own record or from an interaction
+    listing it, so that its descriptions are templatized and rebuilt with the same name.
+    """
+    for drug in iter_elements_by_tag(drugbank_file, "drug"):
+        drugbank_id = drug.findtext("drugbank-id[@primary='true']")
+        if not drugbank_id:
+            continue
+        names.setdefault(drugbank_id, drug.findtext("name"))
+        interactions = drug.find("drug-interactions")
+        if interactions is None:
+            continue
+        for interaction in interactions.findall("drug-interaction"):
+            try:
+                partner_id = interaction.findtext("drugbank-id")
+                if not partner_id:
+                    continue
+                names.setdefault(partner_id, interaction.findtext("name"))
+                row = (drugbank_id, partner_id, interaction.findtext("description"), interaction.findtext("type"))
+            except Exception as e:
+                log.error(f"Error processing interaction for drug {drugbank_id}: {e}")
+                continue
+            yield row
+
+
+def build_interaction_index(drugbank_file: str) -> InteractionIndex:
+    """
+    Streams the DrugBank drug interactions into an `InteractionIndex`, templatizing every description as it is read
+    so that at most one drug record and no description is held beyond its row.
+
+    Args:
+        drugbank_file (str): Path to the DrugBank XML file.
+
+    Returns:
+        The interaction index.
+    """
+    log.info(f"Loading interaction index from {drugbank_file}")
+
+    names: Dict[str, Optional[str]] = {}
+    index = InteractionIndex.from_rows(_interaction_rows(drugbank_file, names), names)
+    log.info(f"Indexed {len(index)} interactions with {len(index.templates)} description templates.")
+    return index
@@ -15,7 +15,7 @@
 
 import logging
 import xml.etree.ElementTree as ET
-from typing import List
+from typing import Iterator, List
 
 log = logging.getLogger(__name__)
 
@@ -50,3 +50,31 @@ def get_elements_by_tag(tree: ET.ElementTree, tag: str) -> List[ET.Element]:
         List of elements with the specified tag.
     """
     return tree.findall(f".//{tag}")
+
+
+def iter_elements_by_tag(file_path: str, tag: str) -> Iterator[ET.Element]:
+    """
+    Streams the top-level records with the given tag from an XML file.
+
+    Each element is cleared after it has been consumed, so only one record is held in memory at a time.
+
+    Args:
+        file_path (str): Path to the XML file.
+        tag (str): The tag of the records to stream, e.g. "drug".
+
+    Returns:
+        Iterator over the record elements.
+    """
+    depth = 0
+    try:
+        for event, element in ET.iterparse(file_path, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and element.tag == tag:
+                yield element
+                element.clear()
+    except ET.ParseError as e:
+        log.error(f"Error reading XML file {file_path}: {e}")
+        raise ValueError(f"Error reading XML file {file_path}: {e}")
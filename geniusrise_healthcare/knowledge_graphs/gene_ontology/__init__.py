@@ -17,3 +17,7 @@ from .base import load_gene_ontology
 from .terms import process_terms
 from .relationships import process_relationships
 from .attributes import process_attributes
+from .utils import build_closure, extract_ontology_records, load_ontology_records
+from .similarity import SemanticSimilarity, information_content
+from .annotations import GeneAnnotations, ancestor_matrix, iter_annotation_rows, load_annotations
+from .enrichment import EnrichmentAnalysis
@@ -0,0 +1,256 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gzip
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+import numpy as np
+from scipy import sparse
+
+from ..closure import ClosureIndex
+
+log = logging.getLogger(__name__)
+
+
+def _open(file_path: str) -> TextIO:
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", encoding="utf-8")  # type: ignore
+    return open(file_path, "r", encoding="utf-8")
+
+
+def detect_annotation_format(file_path: str) -> str:
+    """
+    Detects the format of a GO annotation file from its version header.
+
+    Args:
+        file_path (str): Path to the GAF or GPAD file, plain or gzipped.
+
+    Returns:
+        "gaf", "gpad1" or "gpad2".
+    """
+    with _open(file_path) as f:
+        for line in f:
+            if not line.startswith("!"):
+                break
+            header = line[1:].strip().lower()
+            if header.startswith("gaf-version"):
+                return "gaf"
+            if header.startswith(("gpa-version", "gpad-version")):
+                return "gpad2" if header.split(":", 1)[1].strip().startswith("2") else "gpad1"
+    return "gaf"
+
+
+def iter_annotation_rows(file_path: str, format: str = "auto") -> Iterator[Dict[str, str]]:
+    """
+    Streams the annotations of a GAF 2.x or GPAD 1.1/2.0 file.
+
+    Args:
+        file_path (str): Path to the annotation file, plain or gzipped.
+        format (str): "gaf", "gpad1", "gpad2", or "auto" to detect from the header (default is "auto").
+
+    Returns:
+        Iterator over dictionaries with the `gene`, `term`, `evidence`, `negated` and, for GAF, `aspect` and
+        `symbol` of each annotation.
+    """
+    if format == "auto":
+        format = detect_annotation_format(file_path)
+    if format not in ("gaf", "gpad1", "gpad2"):
+        raise ValueError(f"Unknown annotation format {format}")
+
+    with _open(file_path) as f:
+        for line in f:
+            if line.startswith("!") or not line.strip():
+                continue
+            row = line.rstrip("\n").split("\t")
+            try:
+                if format == "gaf":
+                    yield {
+                        "gene": f"{row[0]}:{row[1]}",
+                        "symbol": row[2],
+                        "negated": "NOT" in row[3].split("|"),
+                        "term": row[4],
+                        "evidence": row[6],
+                        "aspect": row[8],
+                    }
+                elif format == "gpad1":
+                    yield {
+                        "gene": f"{row[0]}:{row[1]}",
+                        "negated": "NOT" in row[2].split("|"),
+                        "term": row[3],
+                        "evidence": row[5],
+                    }
+                else:
+                    yield {"gene": row[0], "negated": row[1] == "NOT", "term": row[3], "evidence": row[5]}
+            except IndexError:
+                log.error(f"Error processing annotation {row}")
+                raise ValueError(f"Error processing annotation {row}")
+
+
+def ancestor_matrix(closure: ClosureIndex) -> sparse.csr_matrix:
+    """
+    Builds the sparse term by term matrix with a one for every term and each of its ancestors, itself included.
+
+    Args:
+        closure (ClosureIndex): Closure of the GO hierarchy.
+
+    Returns:
+        Boolean CSR matrix of shape (terms, terms).
+    """
+    n = len(closure)
+    ancestors = sparse.csr_matrix(
+        (np.ones(len(closure.indices), dtype=bool), closure.indices, closure.indptr), shape=(n, n)
+    )
+    return (ancestors + sparse.identity(n, dtype=bool, format="csr")).tocsr()
+
+
+class GeneAnnotations:
+    """
+    GO annotations of gene products as sparse gene by term matrices.
+
+    Term columns are aligned with `closure.nodes`, so the matrices line up with `SemanticSimilarity` and
+    `enrichment` built on the same closure. `direct` holds the annotations as loaded, and `propagated` adds every
+    ancestor of the annotated terms (the true path rule), computed as a single sparse product with the ancestor
+    matrix.
+    """
+
+    def __init__(self, genes: List[str], closure: ClosureIndex, direct: sparse.csr_matrix) -> None:
+        """
+        Args:
+            genes (List[str]): Gene product ids, position is the matrix row.
+            closure (ClosureIndex): Closure of the GO hierarchy.
+            direct (sparse.csr_matrix): Boolean gene by term matrix of direct annotations.
+        """
+        self.genes = genes
+        self.gene_index = {gene: i for i, gene in enumerate(genes)}
+        self.closure = closure
+        self.direct = direct
+        self.propagated = (direct.astype(np.int32) @ ancestor_matrix(closure).astype(np.int32)).astype(bool).tocsr()
+
+    def __len__(self) -> int:
+        return len(self.genes)
+
+    def terms(self, gene: str, propagated: bool = True) -> List[str]:
+        """
+        Lists the terms annotated to a gene product.
+
+        Args:
+            gene (str): The gene product id, e.g. "UniProtKB:P12345".
+            propagated (bool): Include the ancestors of the annotated terms (default is True).
+
+        Returns:
+            List of GO term ids.
+        """
+        i = self.gene_index.get(gene)
+        if i is None:
+            return []
+        matrix = self.propagated if propagated else self.direct
+        return [self.closure.nodes[j] for j in matrix.indices[matrix.indptr[i] : matrix.indptr[i + 1]]]
+
+    def genes_for(self, term: str, propagated: bool = True) -> List[str]:
+        """
+        Lists the gene products annotated to a term.
+
+        Args:
+            term (str): The GO term id.
+            propagated (bool): Include genes annotated to descendants of the term (default is True).
+
+        Returns:
+            List of gene product ids.
+        """
+        j = self.closure.index.get(term)
+        if j is None:
+            return []
+        matrix = self.propagated if propagated else self.direct
+        return [self.genes[i] for i in matrix[:, j].nonzero()[0]]
+
+    def term_counts(self, propagated: bool = False) -> Dict[str, float]:
+        """
+        Counts the gene products annotated to each term, e.g. for the information content of `SemanticSimilarity`.
+
+        Args:
+            propagated (bool): Count propagated instead of direct annotations (default is False).
+
+        Returns:
+            Dictionary of term ids to counts.
+        """
+        matrix = self.propagated if propagated else self.direct
+        counts = np.asarray(matrix.sum(axis=0)).ravel()
+        return {self.closure.nodes[j]: float(counts[j]) for j in np.flatnonzero(counts)}
+
+
+def load_annotations(
+    annotation_file: str,
+    closure: ClosureIndex,
+    evidence_codes: Optional[Iterable[str]] = None,
+    exclude_evidence_codes: Optional[Iterable[str]] = None,
+    aspects: Optional[Iterable[str]] = None,
+    format: str = "auto",
+) -> GeneAnnotations:
+    """
+    Streams a GAF or GPAD file into sparse gene by term annotation matrices.
+
+    Negated (NOT) annotations are skipped, as are annotations to terms missing from the closure, e.g. obsolete
+    terms.
+
+    Args:
+        annotation_file (str): Path to the GAF or GPAD file, plain or gzipped.
+        closure (ClosureIndex): Closure of the GO hierarchy, see `build_closure`.
+        evidence_codes (Optional[Iterable[str]]): Only keep annotations with these evidence codes, e.g. {"EXP", "IDA"}
+            for GAF or ECO ids for GPAD.
+        exclude_evidence_codes (Optional[Iterable[str]]): Drop annotations with these evidence codes, e.g. {"IEA"}.
+        aspects (Optional[Iterable[str]]): Only keep these GAF aspects ("P", "F", "C").
+        format (str): "gaf", "gpad1", "gpad2", or "auto" to detect from the header (default is "auto").
+
+    Returns:
+        The gene annotations.
+    """
+    log.info(f"Loading annotations from {annotation_file}")
+
+    include = set(evidence_codes) if evidence_codes is not None else None
+    exclude = set(exclude_evidence_codes or [])
+    aspect_filter = set(aspects) if aspects is not None else None
+
+    gene_index: Dict[str, int] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    skipped = 0
+
+    for annotation in iter_annotation_rows(annotation_file, format=format):
+        evidence = annotation["evidence"]
+        if annotation["negated"] or evidence in exclude or (include is not None and evidence not in include):
+            continue
+        if aspect_filter is not None and annotation.get("aspect") not in aspect_filter:
+            continue
+        term = closure.index.get(annotation["term"])
+        if term is None:
+            skipped += 1
+            continue
+        rows.append(gene_index.setdefault(annotation["gene"], len(gene_index)))
+        columns.append(term)
+
+    if skipped:
+        log.warning(f"Skipped {skipped} annotations to terms missing from the ontology.")
+
+    direct = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=bool), (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64))),
+        shape=(len(gene_index), len(closure)),
+        dtype=bool,
+    )
+    direct.sum_duplicates()
+    annotations = GeneAnnotations(list(gene_index), closure, direct)
+    log.info(f"Loaded {direct.nnz} annotations of {len(annotations)} gene products.")
+    return annotations
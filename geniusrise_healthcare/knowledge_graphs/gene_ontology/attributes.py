@@ -14,32 +14,34 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 import networkx as nx
-from .utils import read_ontology_file
+from .utils import load_ontology_records
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_attributes(ontology_file: str, G: nx.DiGraph) -> None:
+def process_attributes(ontology_file: str, G: nx.DiGraph, records: Optional[Dict[str, List[Any]]] = None) -> None:
     """
     Processes the Gene Ontology attributes data and adds it to the graph.
 
     Args:
         ontology_file (str): Path to the Gene Ontology OBO or OWL file.
         G (nx.DiGraph): The NetworkX graph to which the attributes data will be added.
+        records (Optional[Dict[str, List[Any]]]): Records already extracted from `ontology_file` by
+            `load_ontology_records`, parsed from the file if not given.
 
     Returns:
         None
     """
     log.info(f"Loading attributes from {ontology_file}")
 
-    ontology = read_ontology_file(ontology_file)
-    for term in ontology.terms():
+    if records is None:
+        records = load_ontology_records(ontology_file)
+    for term_id, _, _, synonyms, xrefs in track(records["terms"]):
         try:
-            if term.id.startswith("GO:"):
-                synonyms = [synonym.description for synonym in term.synonyms]
-                xrefs = [xref.id for xref in term.xrefs]
-                G.nodes[term.id].update({"synonyms": synonyms, "xrefs": xrefs})
+            G.nodes[term_id].update({"synonyms": synonyms, "xrefs": xrefs})
         except Exception as e:
-            log.error(f"Error processing attributes for {term}: {e}")
-            raise ValueError(f"Error processing attributes for {term}: {e}")
+            log.error(f"Error processing attributes for {term_id}: {e}")
+            raise ValueError(f"Error processing attributes for {term_id}: {e}")
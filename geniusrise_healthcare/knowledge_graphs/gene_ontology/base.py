@@ -15,29 +15,47 @@
 
 # base.py
 import logging
+from typing import Optional
 import networkx as nx
 from .terms import process_terms
 from .relationships import process_relationships
 from .attributes import process_attributes
+from .utils import load_ontology_records
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
-def load_gene_ontology(G: nx.DiGraph, ontology_file: str) -> nx.DiGraph:
+@instrumented("gene_ontology")
+def load_gene_ontology(
+    G: nx.DiGraph, ontology_file: str, cache_dir: Optional[str] = None, parser: str = "auto"
+) -> nx.DiGraph:
     """
     Loads Gene Ontology data into a NetworkX graph.
 
     Args:
         G: (nx.DiGraph): The networkx graph.
         ontology_file (str): Path to the Gene Ontology OWL file.
+        cache_dir (Optional[str]): Directory in which the extracted terms and edges are cached, so that
+            repeat builds from the same file skip parsing it (default is None, no caching).
+        parser (str): "obo" for the native OBO parser, "pronto", or "auto" to pick by file extension
+            (default is "auto").
 
     Returns:
         The NetworkX graph containing Gene Ontology data.
     """
-
-    process_terms(ontology_file, G)
-    process_relationships(ontology_file, G)
-    process_attributes(ontology_file, G)
+    # Parse the ontology once and share the records across the processors, which work in memory. The records
+    # stage reads one row per term stanza
+    with stage("gene_ontology.records", G, ontology_file) as current:
+        records = load_ontology_records(ontology_file, cache_dir=cache_dir, parser=parser)
+        current.rows_read = len(records["terms"])
+
+    with stage("gene_ontology.terms", G):
+        process_terms(ontology_file, G, records=records)
+    with stage("gene_ontology.relationships", G):
+        process_relationships(ontology_file, G, records=records)
+    with stage("gene_ontology.attributes", G):
+        process_attributes(ontology_file, G, records=records)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
@@ -0,0 +1,148 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+from scipy.stats import hypergeom
+
+from .annotations import GeneAnnotations
+
+log = logging.getLogger(__name__)
+
+CORRECTIONS = ("fdr_bh", "bonferroni", "none")
+
+
+def _segment_cummin_reversed(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Running minimum from the end of each row segment, for values in [0, 1] sorted by row.
+    """
+    # Offsetting every row by twice its index keeps the minimum from leaking across segments
+    shifted = values + 2.0 * rows
+    return np.minimum.accumulate(shifted[::-1])[::-1] - 2.0 * rows
+
+
+class EnrichmentAnalysis:
+    """
+    GO term over-representation analysis of many gene sets at once.
+
+    The propagated annotation counts of the population are computed once. Each call then builds a sparse
+    set by gene matrix, gets the overlap of every set with every term from one sparse product, and evaluates the
+    hypergeometric upper tail and the multiple testing correction for all (set, term) pairs with NumPy.
+    """
+
+    def __init__(
+        self, annotations: GeneAnnotations, population: Optional[Iterable[str]] = None, min_term_size: int = 1
+    ) -> None:
+        """
+        Args:
+            annotations (GeneAnnotations): Annotations of the gene products.
+            population (Optional[Iterable[str]]): Background gene products, all annotated genes if not given.
+            min_term_size (int): Terms annotated to fewer population genes are not tested (default is 1).
+        """
+        self.annotations = annotations
+        if population is None:
+            rows = np.arange(len(annotations))
+        else:
+            rows = np.array(
+                sorted({annotations.gene_index[gene] for gene in population if gene in annotations.gene_index}),
+                dtype=np.int64,
+            )
+        self.population = np.zeros(len(annotations), dtype=bool)
+        self.population[rows] = True
+
+        self.matrix = annotations.propagated[rows].astype(np.int32).tocsr()
+        self.population_genes = rows
+        self.population_size = len(rows)
+        self.term_sizes = np.asarray(self.matrix.sum(axis=0)).ravel()
+        self.tested = self.term_sizes >= max(min_term_size, 1)
+        self.tests = int(self.tested.sum())
+
+        # Position of every gene product within the population rows
+        self.population_position = np.full(len(annotations), -1, dtype=np.int64)
+        self.population_position[rows] = np.arange(len(rows))
+
+    def run(
+        self, gene_sets: List[Iterable[str]], correction: str = "fdr_bh", alpha: float = 0.05
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Tests every gene set for over-representation of every GO term.
+
+        Args:
+            gene_sets (List[Iterable[str]]): The gene sets, e.g. genes of interest per patient cohort. Genes outside
+                the population are ignored.
+            correction (str): "fdr_bh" (Benjamini-Hochberg), "bonferroni" or "none" (default is "fdr_bh").
+            alpha (float): Only terms with an adjusted p-value at or below this are reported (default is 0.05).
+
+        Returns:
+            For every gene set, the enriched terms sorted by p-value, with `term`, `count`, `set_size`, `term_size`,
+            `population_size`, `fold_enrichment`, `p_value` and `adjusted_p_value`.
+        """
+        if correction not in CORRECTIONS:
+            raise ValueError(f"Unknown correction {correction}, expected one of {CORRECTIONS}")
+
+        set_rows: List[int] = []
+        set_columns: List[int] = []
+        for i, genes in enumerate(gene_sets):
+            index = self.annotations.gene_index
+            positions = {self.population_position[index[gene]] for gene in genes if gene in index}
+            positions.discard(-1)
+            set_rows.extend([i] * len(positions))
+            set_columns.extend(positions)
+
+        k = len(gene_sets)
+        study = sparse.csr_matrix(
+            (np.ones(len(set_rows), dtype=np.int32), (set_rows, set_columns)), shape=(k, self.population_size)
+        )
+        set_sizes = np.asarray(study.sum(axis=1)).ravel()
+
+        overlap = (study @ self.matrix).tocoo()
+        keep = self.tested[overlap.col]
+        rows, terms, counts = overlap.row[keep], overlap.col[keep], overlap.data[keep]
+
+        p_values = hypergeom.sf(counts - 1, self.population_size, self.term_sizes[terms], set_sizes[rows])
+
+        order = np.lexsort((p_values, rows))
+        rows, terms, counts, p_values = rows[order], terms[order], counts[order], p_values[order]
+
+        if correction == "bonferroni":
+            adjusted = np.minimum(p_values * self.tests, 1.0)
+        elif correction == "fdr_bh":
+            starts = np.searchsorted(rows, np.arange(k))
+            ranks = np.arange(len(rows)) - starts[rows] + 1
+            adjusted = _segment_cummin_reversed(np.minimum(p_values * self.tests / ranks, 1.0), rows)
+        else:
+            adjusted = p_values
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(k)]
+        significant = np.flatnonzero(adjusted <= alpha)
+        fold = (counts / np.maximum(set_sizes[rows], 1)) / (self.term_sizes[terms] / max(self.population_size, 1))
+        for j in significant:
+            results[rows[j]].append(
+                {
+                    "term": self.annotations.closure.nodes[terms[j]],
+                    "count": int(counts[j]),
+                    "set_size": int(set_sizes[rows[j]]),
+                    "term_size": int(self.term_sizes[terms[j]]),
+                    "population_size": self.population_size,
+                    "fold_enrichment": float(fold[j]),
+                    "p_value": float(p_values[j]),
+                    "adjusted_p_value": float(adjusted[j]),
+                }
+            )
+        return results
@@ -14,45 +14,34 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 import networkx as nx
-from .utils import read_ontology_file
+from .utils import load_ontology_records
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_relationships(ontology_file: str, G: nx.DiGraph) -> None:
+def process_relationships(ontology_file: str, G: nx.DiGraph, records: Optional[Dict[str, List[Any]]] = None) -> None:
     """
     Processes the Gene Ontology relationships data and adds it to the graph.
 
     Args:
         ontology_file (str): Path to the Gene Ontology OBO or OWL file.
         G (nx.DiGraph): The NetworkX graph to which the relationships data will be added.
+        records (Optional[Dict[str, List[Any]]]): Records already extracted from `ontology_file` by
+            `load_ontology_records`, parsed from the file if not given.
 
     Returns:
         None
     """
     log.info(f"Loading relationships from {ontology_file}")
 
-    ontology = read_ontology_file(ontology_file)
-    for term in ontology.terms():
+    if records is None:
+        records = load_ontology_records(ontology_file)
+    for term_id, related_id, relationship in track(records["edges"]):
         try:
-            if term.id.startswith("GO:"):
-                # Process parents
-                if hasattr(term, "parents") and term.parents:
-                    for parent in term.parents:
-                        if parent.id.startswith("GO:"):
-                            G.add_edge(term.id, parent.id, type="is_a")
-                else:
-                    log.warning(f"Term {term.id} has no parents attribute or parents list is empty.")
-
-                # Process relations
-                if hasattr(term, "relationships") and term.relationships:
-                    for relationship, related_terms in term.relationships.items():
-                        for related_term in related_terms:
-                            if related_term.id.startswith("GO:"):
-                                G.add_edge(term.id, related_term.id, type=relationship)
-                else:
-                    log.warning(f"Term {term.id} has no relationships attribute or relationships dictionary is empty.")
+            G.add_edge(term_id, related_id, type=relationship)
         except Exception as e:
-            log.error(f"Error processing relationships for {term.id}: {e}")
-            raise ValueError(f"Error processing relationships for {term.id}: {e}")
+            log.error(f"Error processing relationships for {term_id}: {e}")
+            raise ValueError(f"Error processing relationships for {term_id}: {e}")
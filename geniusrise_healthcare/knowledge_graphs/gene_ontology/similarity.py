@@ -0,0 +1,266 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+from ..closure import ClosureIndex
+from .utils import build_closure
+
+log = logging.getLogger(__name__)
+
+# Number of leading zero bits of every byte value, to find the first set bit of a packed row
+_LEADING_ZEROS = np.array([8] + [7 - int(np.log2(value)) for value in range(1, 256)], dtype=np.int64)
+
+METHODS = ("resnik", "lin", "jiang_conrath")
+
+
+class SemanticSimilarity:
+    """
+    Information content based similarity of Gene Ontology terms and gene products.
+
+    The ancestors of every term are stored as a packed bitset whose bit positions are ranks by decreasing
+    information content. The most informative common ancestor (MICA) of a pair of terms is then the first set
+    bit of the AND of their bitsets, which is found for thousands of pairs at once with NumPy. Only terms which
+    have descendants can be common ancestors of two different terms, so only they get a bit.
+    """
+
+    def __init__(self, closure: ClosureIndex, information_content: np.ndarray, chunk_bytes: int = 1 << 26) -> None:
+        """
+        Args:
+            closure (ClosureIndex): Closure of the GO hierarchy.
+            information_content (np.ndarray): Information content of every term, aligned with `closure.nodes`.
+            chunk_bytes (int): Upper bound on the size of the bitset AND computed at once (default is 64 MiB).
+        """
+        self.closure = closure
+        self.information_content = information_content.astype(np.float64)
+        self.chunk_bytes = chunk_bytes
+
+        n = len(closure)
+        has_descendants = np.diff(closure.descendant_indptr) > 0
+        columns = np.flatnonzero(has_descendants)
+        columns = columns[np.argsort(-self.information_content[columns], kind="stable")]
+        self.column_ic = self.information_content[columns]
+
+        rank = np.full(n, -1, dtype=np.int64)
+        rank[columns] = np.arange(len(columns))
+
+        # Set the bits of every ancestor with descendants, and of the term itself, directly in packed form
+        rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(closure.indptr))
+        rows = np.concatenate([rows, columns])
+        positions = np.concatenate([rank[closure.indices], rank[columns]])
+        keep = positions >= 0
+        rows, positions = rows[keep], positions[keep]
+        self.bitsets = np.zeros((n, max((len(columns) + 7) // 8, 1)), dtype=np.uint8)
+        np.bitwise_or.at(self.bitsets, (rows, positions // 8), (128 >> (positions % 8)).astype(np.uint8))
+
+        log.info(f"Built ancestor bitsets of {n} terms over {len(columns)} candidate ancestors.")
+
+    @classmethod
+    def from_graph(
+        cls,
+        G: nx.DiGraph,
+        relationships: Iterable[str] = ("is_a", "part_of"),
+        term_counts: Optional[Dict[str, float]] = None,
+    ) -> "SemanticSimilarity":
+        """
+        Builds the engine from the graph built by `load_gene_ontology`.
+
+        With `term_counts`, the information content of a term is `-log p(t)`, where `p(t)` is the share of
+        annotations to the term or its descendants within its namespace root, and unannotated terms inherit the
+        information content of their most specific annotated ancestor. Without, the intrinsic information
+        content `1 - log(descendants + 1) / log(terms)` is used.
+
+        Args:
+            G (nx.DiGraph): The NetworkX graph containing Gene Ontology data.
+            relationships (Iterable[str]): Edge types forming the hierarchy (default is ("is_a", "part_of")).
+            term_counts (Optional[Dict[str, float]]): Number of direct annotations of each term.
+
+        Returns:
+            The similarity engine.
+        """
+        closure = build_closure(G, relationships)
+        return cls(closure, information_content(closure, term_counts))
+
+    def _indices(self, terms: Iterable[str]) -> np.ndarray:
+        return np.array([self.closure.index.get(term, -1) for term in terms], dtype=np.int64)
+
+    def _mica(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Information content of the most informative common ancestor of aligned pairs of term indices.
+        """
+        mica = np.zeros(len(a), dtype=np.float64)
+        step = max(1, self.chunk_bytes // self.bitsets.shape[1])
+        for start in range(0, len(a), step):
+            common = self.bitsets[a[start : start + step]] & self.bitsets[b[start : start + step]]
+            nonzero = common != 0
+            found = nonzero.any(axis=1)
+            first_byte = nonzero.argmax(axis=1)
+            first_bit = first_byte * 8 + _LEADING_ZEROS[common[np.arange(len(common)), first_byte]]
+            first_bit = np.minimum(first_bit, len(self.column_ic) - 1)
+            mica[start : start + step] = np.where(found, self.column_ic[first_bit], 0)
+        return mica
+
+    def _score(self, a: np.ndarray, b: np.ndarray, method: str) -> np.ndarray:
+        if method not in METHODS:
+            raise ValueError(f"Unknown similarity method {method}, expected one of {METHODS}")
+
+        known = (a >= 0) & (b >= 0)
+        scores = np.full(len(a), np.nan)
+        a, b = a[known], b[known]
+        mica = self._mica(a, b)
+        # A term is its own most informative common ancestor, which the bitsets miss for leaves
+        same = a == b
+        mica[same] = self.information_content[a[same]]
+
+        ic_a, ic_b = self.information_content[a], self.information_content[b]
+        if method == "resnik":
+            scores[known] = mica
+        elif method == "lin":
+            total = ic_a + ic_b
+            scores[known] = np.where(total > 0, 2 * mica / np.where(total > 0, total, 1), same.astype(np.float64))
+        else:
+            scores[known] = 1 / (1 + np.maximum(ic_a + ic_b - 2 * mica, 0))
+        return scores
+
+    def term_similarity(self, terms_a: List[str], terms_b: List[str], method: str = "resnik") -> np.ndarray:
+        """
+        Computes the similarity of aligned pairs of terms.
+
+        Args:
+            terms_a (List[str]): First term of every pair.
+            terms_b (List[str]): Second term of every pair.
+            method (str): "resnik", "lin" or "jiang_conrath" (default is "resnik").
+
+        Returns:
+            Array of similarities, NaN for pairs with a term missing from the ontology.
+        """
+        if len(terms_a) != len(terms_b):
+            raise ValueError("terms_a and terms_b must have the same length")
+        return self._score(self._indices(terms_a), self._indices(terms_b), method)
+
+    def similarity_matrix(self, terms_a: List[str], terms_b: List[str], method: str = "resnik") -> np.ndarray:
+        """
+        Computes the similarity of every term in `terms_a` with every term in `terms_b`.
+
+        Args:
+            terms_a (List[str]): Row terms.
+            terms_b (List[str]): Column terms.
+            method (str): "resnik", "lin" or "jiang_conrath" (default is "resnik").
+
+        Returns:
+            Matrix of shape (len(terms_a), len(terms_b)).
+        """
+        a, b = self._indices(terms_a), self._indices(terms_b)
+        return self._score(np.repeat(a, len(b)), np.tile(b, len(a)), method).reshape(len(a), len(b))
+
+    def gene_similarity(self, gene_pairs: List[Tuple[List[str], List[str]]], method: str = "resnik") -> np.ndarray:
+        """
+        Computes the best-match average similarity of pairs of gene products given as lists of GO terms.
+
+        The term pairs of all gene pairs are scored in one pass, and the row and column maxima are reduced per
+        gene pair with `np.maximum.reduceat`.
+
+        Args:
+            gene_pairs (List[Tuple[List[str], List[str]]]): Pairs of annotation term lists.
+            method (str): "resnik", "lin" or "jiang_conrath" (default is "resnik").
+
+        Returns:
+            Array of gene pair similarities, NaN where a gene has no term in the ontology.
+        """
+        a_parts, b_parts, row_sizes, col_sizes = [], [], [], []
+        for terms_a, terms_b in gene_pairs:
+            a, b = self._indices(terms_a), self._indices(terms_b)
+            a_parts.append(a[a >= 0])
+            b_parts.append(b[b >= 0])
+            row_sizes.append(len(a_parts[-1]))
+            col_sizes.append(len(b_parts[-1]))
+
+        rows, cols = np.array(row_sizes, dtype=np.int64), np.array(col_sizes, dtype=np.int64)
+        valid = (rows > 0) & (cols > 0)
+        result = np.full(len(gene_pairs), np.nan)
+        if not valid.any():
+            return result
+
+        pairs = [(a, b) for a, b, keep in zip(a_parts, b_parts, valid) if keep]
+        rows, cols = rows[valid], cols[valid]
+
+        # Row-major blocks for the row maxima, column-major blocks for the column maxima
+        left = np.concatenate([np.repeat(a, len(b)) for a, b in pairs])
+        right = np.concatenate([np.tile(b, len(a)) for a, b in pairs])
+        scores = self._score(left, right, method)
+        transposed = np.concatenate(
+            [np.arange(len(a) * len(b)).reshape(len(a), len(b)).T.ravel() for a, b in pairs]
+        ) + np.repeat(np.concatenate([[0], np.cumsum(rows * cols)[:-1]]), rows * cols)
+
+        row_max = np.maximum.reduceat(scores, _segment_starts(np.repeat(cols, rows)))
+        col_max = np.maximum.reduceat(scores[transposed], _segment_starts(np.repeat(rows, cols)))
+
+        row_mean = np.add.reduceat(row_max, _segment_starts(rows)) / rows
+        col_mean = np.add.reduceat(col_max, _segment_starts(cols)) / cols
+        result[valid] = (row_mean + col_mean) / 2
+        return result
+
+
+def _segment_starts(sizes: np.ndarray) -> np.ndarray:
+    """
+    Start offsets of consecutive segments with the given (non-zero) sizes.
+    """
+    return np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+
+
+def information_content(closure: ClosureIndex, term_counts: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    Computes the information content of every term of a hierarchy.
+
+    Args:
+        closure (ClosureIndex): Closure of the hierarchy.
+        term_counts (Optional[Dict[str, float]]): Number of direct annotations of each term. If not given, the
+            intrinsic information content based on the number of descendants is returned.
+
+    Returns:
+        Array of information content aligned with `closure.nodes`.
+    """
+    n = len(closure)
+    descendant_rows = np.repeat(np.arange(n), np.diff(closure.descendant_indptr))
+
+    if term_counts is None:
+        descendants = np.diff(closure.descendant_indptr)
+        return 1 - np.log(descendants + 1) / np.log(max(n, 2))
+
+    counts = np.array([term_counts.get(term, 0) for term in closure.nodes], dtype=np.float64)
+    propagated = counts + np.bincount(descendant_rows, weights=counts[closure.descendant_indices], minlength=n)
+
+    # Normalise by the count of the root of each term's namespace
+    roots = np.diff(closure.indptr) == 0
+    totals = np.where(roots, propagated, 0)
+    ancestor_rows = np.repeat(np.arange(n), np.diff(closure.indptr))
+    root_ancestors = roots[closure.indices]
+    np.maximum.at(totals, ancestor_rows[root_ancestors], propagated[closure.indices[root_ancestors]])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probability = np.where(totals > 0, propagated / np.where(totals > 0, totals, 1), 0)
+        ic = np.where(probability > 0, -np.log(probability), 0)
+
+    # Terms without annotations get the information content of their most specific annotated ancestor, so that a
+    # term is never less informative than its ancestors and is always its own most informative common ancestor
+    unannotated = probability[ancestor_rows] == 0
+    annotated_ancestors = unannotated & (probability[closure.indices] > 0)
+    np.maximum.at(ic, ancestor_rows[annotated_ancestors], ic[closure.indices[annotated_ancestors]])
+    return ic
@@ -14,30 +14,34 @@
 # limitations under the License.
 
 import logging
+from typing import Any, Dict, List, Optional
 import networkx as nx
-from .utils import read_ontology_file
+from .utils import load_ontology_records
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_terms(ontology_file: str, G: nx.DiGraph) -> None:
+def process_terms(ontology_file: str, G: nx.DiGraph, records: Optional[Dict[str, List[Any]]] = None) -> None:
     """
     Processes the Gene Ontology terms data and adds it to the graph.
 
     Args:
         ontology_file (str): Path to the Gene Ontology OBO or OWL file.
         G (nx.DiGraph): The NetworkX graph to which the terms data will be added.
+        records (Optional[Dict[str, List[Any]]]): Records already extracted from `ontology_file` by
+            `load_ontology_records`, parsed from the file if not given.
 
     Returns:
         None
     """
     log.info(f"Loading terms from {ontology_file}")
 
-    ontology = read_ontology_file(ontology_file)
-    for term in ontology.terms():
+    if records is None:
+        records = load_ontology_records(ontology_file)
+    for term_id, name, definition, _, _ in track(records["terms"]):
         try:
-            if term.id.startswith("GO:"):
-                G.add_node(term.id, name=term.name, definition=term.definition, type="term")
+            G.add_node(term_id, name=name, definition=definition, type="term")
         except Exception as e:
-            log.error(f"Error processing term {term}: {e}")
-            raise ValueError(f"Error processing term {term}: {e}")
+            log.error(f"Error processing term {term_id}: {e}")
+            raise ValueError(f"Error processing term {term_id}: {e}")
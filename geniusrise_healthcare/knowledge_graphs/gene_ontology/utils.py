@@ -15,10 +15,17 @@
 
 # utils.py
 import logging
+from typing import Any, Dict, Iterable, List, Optional
+import networkx as nx
 from pronto import Ontology
+from ..closure import ClosureIndex
+from .. import obo
 
 log = logging.getLogger(__name__)
 
+# Bumped whenever the extracted records change, to invalidate cached records
+RECORDS_VERSION = "1"
+
 
 def read_ontology_file(file_path: str) -> Ontology:
     """
@@ -36,3 +43,84 @@ def read_ontology_file(file_path: str) -> Ontology:
     except Exception as e:
         log.error(f"Error reading ontology file {file_path}: {e}")
         raise ValueError(f"Error reading ontology file {file_path}: {e}")
+
+
+def extract_ontology_records(ontology: Ontology) -> Dict[str, List[Any]]:
+    """
+    Extracts the Gene Ontology terms and edges from an Ontology object into plain Python records.
+
+    Args:
+        ontology (Ontology): The parsed ontology.
+
+    Returns:
+        Dictionary with `terms`, a list of (id, name, definition, synonyms, xrefs) tuples, and `edges`, a list of
+        (term, related term, type) tuples. `is_a` edges point to the direct parents of a term.
+    """
+    terms = []
+    edges = []
+    for term in ontology.terms():
+        try:
+            if not term.id.startswith("GO:"):
+                continue
+            terms.append(
+                (
+                    term.id,
+                    term.name,
+                    str(term.definition) if term.definition is not None else None,
+                    [synonym.description for synonym in term.synonyms],
+                    [xref.id for xref in term.xrefs],
+                )
+            )
+            for parent in term.superclasses(distance=1, with_self=False):
+                if parent.id.startswith("GO:"):
+                    edges.append((term.id, parent.id, "is_a"))
+            for relationship, related_terms in term.relationships.items():
+                for related_term in related_terms:
+                    if related_term.id.startswith("GO:"):
+                        edges.append((term.id, related_term.id, relationship.id))
+        except Exception as e:
+            log.error(f"Error extracting term {term}: {e}")
+            raise ValueError(f"Error extracting term {term}: {e}")
+    return {"terms": terms, "edges": edges}
+
+
+def load_ontology_records(
+    file_path: str, cache_dir: Optional[str] = None, parser: str = "auto"
+) -> Dict[str, List[Any]]:
+    """
+    Parses an ontology file once and returns its records, optionally through a persistent cache.
+
+    Args:
+        file_path (str): Path to the ontology file.
+        cache_dir (Optional[str]): Directory of the records cache (default is None, no caching).
+        parser (str): "obo", "pronto", or "auto" to pick by file extension (default is "auto").
+
+    Returns:
+        The records as returned by `extract_ontology_records`.
+    """
+    return obo.load_ontology_records(
+        file_path,
+        prefix="GO:",
+        extract=lambda path: extract_ontology_records(read_ontology_file(path)),
+        records_version=RECORDS_VERSION,
+        cache_dir=cache_dir,
+        parser=parser,
+    )
+
+
+def build_closure(G: nx.DiGraph, relationships: Iterable[str] = ("is_a", "part_of")) -> ClosureIndex:
+    """
+    Builds the closure of the GO hierarchy in a graph built by `load_gene_ontology`.
+
+    Args:
+        G (nx.DiGraph): The NetworkX graph containing Gene Ontology data.
+        relationships (Iterable[str]): Edge types forming the hierarchy (default is ("is_a", "part_of")).
+
+    Returns:
+        The closure index over all GO terms.
+    """
+    relationships = set(relationships)
+    return ClosureIndex.from_edges(
+        ((u, v) for u, v, edge_type in G.edges(data="type") if edge_type in relationships),
+        nodes=[node for node, node_type in G.nodes(data="type") if node_type == "term"],
+    )
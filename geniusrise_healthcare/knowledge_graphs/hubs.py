@@ -0,0 +1,110 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import weakref
+from typing import FrozenSet, Hashable, Iterator, Optional, Union
+
+import networkx as nx
+import numpy as np
+
+from .algorithms import pagerank
+from .cache import graph_cache
+from .csr import CSRGraph, csr_graph
+
+log = logging.getLogger(__name__)
+
+HUB_SCORES = ("degree", "in_degree", "pagerank")
+
+
+class HubIndex:
+    """
+    Marks the hub nodes of a graph, the most connected nodes where traversals stop, as a boolean array over CSR
+    positions and a frozen set of native ids. Checking a node is a set lookup, or an array lookup by position.
+    """
+
+    def __init__(
+        self, graph: CSRGraph, scores: np.ndarray, fraction: Optional[float] = 0.01, threshold: Optional[float] = None
+    ) -> None:
+        """
+        Args:
+            graph (CSRGraph): The graph.
+            scores (np.ndarray): Score of every node, by position.
+            fraction (Optional[float]): Mark this fraction of the nodes with the highest scores, rounded down. Ties
+                are broken by position, i.e. by graph order (default is 0.01).
+            threshold (Optional[float]): Mark instead every node scoring at least this much.
+        """
+        if (fraction is None) == (threshold is None):
+            raise ValueError("Exactly one of fraction and threshold is required")
+        # Held weakly, the index is cached under the graph and would otherwise keep its own cache key alive
+        self.graph: CSRGraph = weakref.proxy(graph)
+        self.scores = scores
+        self.is_hub = np.zeros(len(scores), dtype=bool)
+        if threshold is not None:
+            self.is_hub[scores >= threshold] = True
+        else:
+            count = int(len(scores) * fraction)  # type: ignore
+            self.is_hub[np.argsort(-scores, kind="stable")[:count]] = True
+        self.positions = np.flatnonzero(self.is_hub)
+        self.nodes: FrozenSet[Hashable] = frozenset(graph.nodes[self.positions].tolist())
+        log.debug(f"Marked {len(self.nodes)} of {len(scores)} nodes as hubs")
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.nodes)
+
+
+def _scores(G: Union[nx.DiGraph, CSRGraph], graph: CSRGraph, by: str) -> np.ndarray:
+    if by == "degree":
+        return graph.degree()
+    if by == "in_degree":
+        return graph.in_degree()
+    if isinstance(G, CSRGraph):
+        raise ValueError("PageRank hubs need the NetworkX graph")
+    ranks = pagerank(G)
+    return np.array([ranks[node] for node in G], dtype=np.float64)
+
+
+def hub_index(
+    G: Union[nx.DiGraph, CSRGraph],
+    by: str = "degree",
+    fraction: Optional[float] = 0.01,
+    threshold: Optional[float] = None,
+) -> HubIndex:
+    """
+    The hub nodes of a graph, computed once per graph version and cached until the graph changes. PageRank hubs
+    depend on edge weights, call `graph_cache.invalidate(G)` after editing them.
+
+    Args:
+        G (Union[nx.DiGraph, CSRGraph]): The graph.
+        by (str): Score nodes by "degree", "in_degree" or "pagerank" (default is "degree").
+        fraction (Optional[float]): Mark this fraction of the nodes with the highest scores (default is 0.01).
+        threshold (Optional[float]): Mark instead every node scoring at least this much.
+
+    Returns:
+        HubIndex: The hubs.
+    """
+    if by not in HUB_SCORES:
+        raise ValueError(f"Unknown hub score {by}, expected one of {HUB_SCORES}")
+    graph = csr_graph(G)
+    if threshold is not None:
+        fraction = None
+    key = ("hub_index", by, fraction, threshold)
+    return graph_cache.get(graph, key, lambda: HubIndex(graph, _scores(G, graph, by), fraction, threshold))
@@ -0,0 +1,151 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from array import array
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+class IdRegistry:
+    """
+    Registry of dense integer node ids for the combined knowledge graph.
+
+    Every `(source, native_id)` pair, e.g. `("snomed", 22298006)` or `("gene_ontology", "GO:0008150")`, gets the
+    next free integer, so ids never collide across sources and can index arrays directly. The reverse tables map
+    every dense id back to its source and native id.
+    """
+
+    def __init__(self) -> None:
+        self.sources: List[str] = []
+        self.source_index: Dict[str, int] = {}
+        self.forward: Dict[str, Dict[Hashable, int]] = {}
+        self.source_codes = array("H")
+        self.native_ids: List[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self.native_ids)
+
+    def __contains__(self, key: Tuple[str, Hashable]) -> bool:
+        source, native_id = key
+        return native_id in self.forward.get(source, {})
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        The smallest of int32 and int64 that holds every dense id.
+        """
+        return np.dtype(np.int32) if len(self) < np.iinfo(np.int32).max else np.dtype(np.int64)
+
+    def _source(self, source: str) -> Dict[Hashable, int]:
+        if source not in self.forward:
+            self.source_index[source] = len(self.sources)
+            self.sources.append(source)
+            self.forward[source] = {}
+        return self.forward[source]
+
+    def register(self, source: str, native_id: Hashable) -> int:
+        """
+        Returns the dense id of a node, assigning the next free id to a new one.
+
+        Args:
+            source (str): The source, e.g. "umls".
+            native_id (Hashable): The id of the node within its source.
+
+        Returns:
+            int: The dense id.
+        """
+        ids = self._source(source)
+        dense_id = ids.get(native_id)
+        if dense_id is None:
+            dense_id = ids[native_id] = len(self.native_ids)
+            self.source_codes.append(self.source_index[source])
+            self.native_ids.append(native_id)
+        return dense_id
+
+    def register_many(self, source: str, native_ids: Iterable[Hashable]) -> np.ndarray:
+        """
+        Returns the dense ids of many nodes of one source, assigning new ids as needed.
+
+        Args:
+            source (str): The source.
+            native_ids (Iterable[Hashable]): The ids of the nodes within the source.
+
+        Returns:
+            np.ndarray: The dense ids, in order.
+        """
+        ids = self._source(source)
+        code = self.source_index[source]
+        dense_ids = []
+        for native_id in native_ids:
+            dense_id = ids.get(native_id)
+            if dense_id is None:
+                dense_id = ids[native_id] = len(self.native_ids)
+                self.source_codes.append(code)
+                self.native_ids.append(native_id)
+            dense_ids.append(dense_id)
+        return np.array(dense_ids, dtype=self.dtype)
+
+    def lookup(self, source: str, native_id: Hashable) -> int:
+        """
+        Returns the dense id of a registered node.
+
+        Raises:
+            KeyError: If the node is not registered.
+        """
+        return self.forward[source][native_id]
+
+    def lookup_many(self, source: str, native_ids: Iterable[Hashable]) -> np.ndarray:
+        """
+        Returns the dense ids of many nodes of one source, -1 for nodes that are not registered.
+        """
+        get = self.forward.get(source, {}).get
+        return np.array([get(native_id, -1) for native_id in native_ids], dtype=self.dtype)
+
+    def native(self, dense_id: int) -> Tuple[str, Hashable]:
+        """
+        Returns the source and native id of a dense id.
+        """
+        return self.sources[self.source_codes[dense_id]], self.native_ids[dense_id]
+
+    def source_of(self, dense_ids: np.ndarray) -> np.ndarray:
+        """
+        Returns the source code, an index into `sources`, of every dense id.
+        """
+        return np.frombuffer(self.source_codes, dtype=np.uint16)[dense_ids]
+
+    def relabel(self, H: nx.DiGraph, source: str) -> nx.DiGraph:
+        """
+        Copies a single source graph with its nodes relabeled to dense ids.
+
+        Args:
+            H (nx.DiGraph): The graph of one source, keyed by native ids.
+            source (str): The source.
+
+        Returns:
+            nx.DiGraph: The graph keyed by dense ids. Graph level attributes are shared, not copied.
+        """
+        ids = self._source(source)
+        mapping = dict(zip(H, self.register_many(source, H).tolist()))
+        G = nx.DiGraph()
+        G.graph.update(H.graph)
+        G.add_nodes_from((mapping[node], data) for node, data in H.nodes(data=True))
+        G.add_edges_from((mapping[u], mapping[v], data) for u, v, data in H.edges(data=True))
+        log.info(f"Relabeled {len(mapping)} {source} nodes, {len(ids)} registered for {source}")
+        return G
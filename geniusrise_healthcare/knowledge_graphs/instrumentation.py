@@ -0,0 +1,326 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import json
+import logging
+import os
+import resource
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+import networkx as nx
+from tqdm import tqdm
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+F = TypeVar("F", bound=Callable[..., Any])
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+def _read_status() -> Dict[str, int]:
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                key, value = line.split(":", 1)
+                values[key] = int(value.split()[0]) * 1024
+    return values
+
+
+def memory_usage() -> Dict[str, int]:
+    """
+    Returns the resident set size and its peak, in bytes.
+
+    Read from /proc on Linux, else from psutil when installed, else only the peak from `getrusage`.
+    """
+    try:
+        status = _read_status()
+        return {"rss": status["VmRSS"], "peak_rss": status["VmHWM"]}
+    except (OSError, KeyError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    peak = peak if os.uname().sysname == "Darwin" else peak * 1024
+    try:
+        import psutil
+
+        return {"rss": psutil.Process().memory_info().rss, "peak_rss": peak}
+    except ImportError:
+        return {"rss": 0, "peak_rss": peak}
+
+
+class JSONLinesSink:
+    """
+    Appends every event to a JSON lines file.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        line = json.dumps(event, default=str)
+        with self._lock, open(self.file_path, "a") as f:
+            f.write(line + "\n")
+
+
+class LoggerSink:
+    """
+    Logs every finished stage as one line.
+    """
+
+    def __init__(self, logger: logging.Logger = log, level: int = logging.INFO) -> None:
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        if event["event"] != "stage":
+            return
+        self.logger.log(
+            self.level,
+            f"{event['stage']}: {event['rows_read']} rows ({event['rows_kept']} kept), {event['nodes_added']} nodes, "
+            f"{event['edges_added']} edges "
+            f"in {event['seconds']:.2f}s ({event['rows_per_second']:.0f} rows/s, "
+            f"{event['bytes_per_second'] / 2**20:.1f} MiB/s), RSS {event['rss_delta'] / 2**20:+.0f} MiB",
+        )
+
+
+class Instrumentation:
+    """
+    Settings shared by all stages: where events go, whether to trace allocations and whether to show progress bars.
+    """
+
+    def __init__(self) -> None:
+        self.sinks: List[Sink] = []
+        self.trace_allocations = False
+        self.top_allocations = 10
+        self.progress = False
+        self.local = threading.local()
+
+    @property
+    def stack(self) -> List["Stage"]:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                log.error(f"Instrumentation sink {sink} failed: {e}")
+
+
+instrumentation = Instrumentation()
+
+
+def configure(
+    sinks: Optional[Iterable[Sink]] = None,
+    trace_allocations: bool = False,
+    top_allocations: int = 10,
+    progress: bool = False,
+) -> None:
+    """
+    Configures loader instrumentation.
+
+    Args:
+        sinks (Optional[Iterable[Sink]]): Callables receiving every event as a dict, e.g. `JSONLinesSink(path)`,
+            `LoggerSink()` or any callback. No events are emitted without sinks.
+        trace_allocations (bool): Trace allocations with tracemalloc and report the top allocation sites of each
+            stage. This slows loading down noticeably (default is False).
+        top_allocations (int): Number of allocation sites reported per stage (default is 10).
+        progress (bool): Show tqdm progress bars over rows (default is False).
+
+    Returns:
+        None
+    """
+    instrumentation.sinks = list(sinks or [])
+    instrumentation.trace_allocations = trace_allocations
+    instrumentation.top_allocations = top_allocations
+    instrumentation.progress = progress
+
+
+class Stage:
+    """
+    A timed loader stage, used as a context manager around reading one file into the graph.
+
+    On exit, the stage emits an event with the rows read and kept, nodes and edges added, rows and bytes per second,
+    elapsed time, RSS delta and peak, and with tracemalloc enabled the top allocation sites. Rows kept are the rows
+    read minus those the loader reported with `skipped`. Stages nest, a stage opened
+    for a whole `load_*` call emits a summary of its child stages.
+    """
+
+    def __init__(self, name: str, G: Optional[nx.DiGraph] = None, file_path: Optional[str] = None) -> None:
+        """
+        Args:
+            name (str): The stage, e.g. "snomed.relationships".
+            G (Optional[nx.DiGraph]): The graph being built, to count the nodes and edges added.
+            file_path (Optional[str]): The file read, to compute bytes per second. Leave it out for stages working
+                on data already in memory.
+        """
+        self.name = name
+        self.G = G
+        self.file_path = file_path
+        self.rows_read = 0
+        self.rows_skipped = 0
+        self.children: List[Dict[str, Any]] = []
+        self.event: Dict[str, Any] = {}
+
+    def track(self, rows: Iterable[T]) -> Iterator[T]:
+        """
+        Counts the rows of an iterable as they are consumed.
+        """
+        count = 0
+        try:
+            for count, row in enumerate(rows, 1):  # noqa: B007
+                yield row
+        finally:
+            self.rows_read += count
+
+    def __enter__(self) -> "Stage":
+        self._nodes = self.G.number_of_nodes() if self.G is not None else 0
+        self._edges = self.G.number_of_edges() if self.G is not None else 0
+        self._memory = memory_usage()
+        self._started_tracing = False
+        if instrumentation.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._snapshot = tracemalloc.take_snapshot()
+        instrumentation.stack.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        seconds = time.perf_counter() - self._start
+        instrumentation.stack.pop()
+        memory = memory_usage()
+        size = os.path.getsize(self.file_path) if self.file_path and os.path.isfile(self.file_path) else 0
+        if self.children:
+            # A stage over a whole load reads what its child stages read
+            self.rows_read = sum(child["rows_read"] for child in self.children)
+            self.rows_skipped = sum(child["rows_read"] - child["rows_kept"] for child in self.children)
+            size = size or sum(child["bytes_read"] for child in self.children)
+        self.event = {
+            "event": "stage" if not self.children else "summary",
+            "stage": self.name,
+            "file": self.file_path,
+            "rows_read": self.rows_read,
+            "rows_kept": self.rows_read - self.rows_skipped,
+            "nodes_added": (self.G.number_of_nodes() - self._nodes) if self.G is not None else 0,
+            "edges_added": (self.G.number_of_edges() - self._edges) if self.G is not None else 0,
+            "bytes_read": size,
+            "seconds": seconds,
+            "rows_per_second": self.rows_read / seconds if seconds > 0 else 0.0,
+            "bytes_per_second": size / seconds if seconds > 0 else 0.0,
+            "rss_delta": memory["rss"] - self._memory["rss"],
+            "peak_rss": memory["peak_rss"],
+            "failed": exc[0] is not None,
+        }
+        if instrumentation.trace_allocations:
+            statistics = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+            self.event["top_allocations"] = [
+                {"location": str(stat.traceback), "size_delta": stat.size_diff, "count_delta": stat.count_diff}
+                for stat in statistics[: instrumentation.top_allocations]
+            ]
+            if self._started_tracing:
+                tracemalloc.stop()
+        if self.children:
+            self.event["stages"] = self.children
+        if instrumentation.stack:
+            instrumentation.stack[-1].children.append(self.event)
+        instrumentation.emit(self.event)
+        if self.children:
+            log.info(format_summary(self.event))
+
+
+def stage(name: str, G: Optional[nx.DiGraph] = None, file_path: Optional[str] = None) -> Stage:
+    """
+    Opens a loader stage, see `Stage`.
+    """
+    return Stage(name, G, file_path)
+
+
+def instrumented(name: str) -> Callable[[F], F]:
+    """
+    Decorates a `load_*` function to run it as a stage named after its source, which summarizes the stages
+    opened inside it. The graph and input path are taken from the first graph and string arguments, or the graph
+    from the return value.
+    """
+
+    def decorator(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            G = next((arg for arg in args if isinstance(arg, nx.DiGraph)), None)
+            file_path = next((arg for arg in args if isinstance(arg, str)), None)
+            with stage(name, G, file_path) as current:
+                result = function(*args, **kwargs)
+                if current.G is None and isinstance(result, nx.DiGraph):
+                    current.G = result
+            return result
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def track(rows: Iterable[T]) -> Iterable[T]:
+    """
+    Counts rows into the innermost open stage, with a progress bar if enabled.
+
+    Returns the iterable untouched when no stage is open and progress bars are off, so loaders called outside
+    of `load_*` pay nothing.
+    """
+    stack = instrumentation.stack
+    if instrumentation.progress:
+        rows = tqdm(rows)
+    if not stack:
+        return rows
+    return stack[-1].track(rows)
+
+
+def skipped(count: int = 1) -> None:
+    """
+    Counts rows a loader read but dropped, e.g. inactive SNOMED CT rows or relationships to unknown concepts, into
+    the innermost open stage.
+    """
+    stack = instrumentation.stack
+    if stack:
+        stack[-1].rows_skipped += count
+
+
+def format_summary(event: Dict[str, Any]) -> str:
+    """
+    Formats a summary event as a table of its stages, slowest first.
+    """
+    lines = [
+        f"{event['stage']}: {event['nodes_added']} nodes, {event['edges_added']} edges in {event['seconds']:.1f}s, "
+        f"peak RSS {event['peak_rss'] / 2**20:.0f} MiB",
+        f"{'stage':<40} {'seconds':>9} {'share':>6} {'rows':>12} {'kept':>12} {'rows/s':>10} {'MiB/s':>8} "
+        f"{'RSS MiB':>9}",
+    ]
+    total = event["seconds"] or 1.0
+    for child in sorted(event.get("stages", []), key=lambda child: child["seconds"], reverse=True):
+        lines.append(
+            f"{child['stage']:<40} {child['seconds']:>9.2f} {child['seconds'] / total:>6.1%} {child['rows_read']:>12} "
+            f"{child['rows_kept']:>12} {child['rows_per_second']:>10.0f} {child['bytes_per_second'] / 2**20:>8.1f} "
+            f"{child['rss_delta'] / 2**20:>+9.0f}"
+        )
+    return "\n".join(lines)
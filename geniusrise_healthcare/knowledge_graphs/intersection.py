@@ -0,0 +1,130 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from typing import Callable, Hashable, List, Sequence, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from .csr import CSRGraph
+
+log = logging.getLogger(__name__)
+
+Graph = Union[nx.DiGraph, CSRGraph]
+
+
+def intersect_sorted(arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Intersects sorted arrays of unique values, smallest first so that every step shrinks.
+    """
+    if not arrays:
+        return np.empty(0, dtype=np.int64)
+    arrays = sorted(arrays, key=len)
+    result = arrays[0]
+    for array in arrays[1:]:
+        if len(result) == 0:
+            break
+        result = np.intersect1d(result, array, assume_unique=True)
+    return result
+
+
+def _nodes(graph: Graph) -> List[Hashable]:
+    return graph.nodes.tolist() if isinstance(graph, CSRGraph) else list(graph)
+
+
+def _edges(graph: Graph, nodes: List[Hashable]) -> Tuple[List[Hashable], List[Hashable]]:
+    """
+    Sources and targets of the edges of a graph, at least all those leaving `nodes`.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.nodes[graph.edge_sources()].tolist(), graph.nodes[graph.indices].tolist()
+    adjacency = graph.adj
+    sources: List[Hashable] = []
+    targets: List[Hashable] = []
+    for node in nodes:
+        successors = list(adjacency[node])
+        sources.extend([node] * len(successors))
+        targets.extend(successors)
+    return sources, targets
+
+
+def _encoder(
+    node_lists: List[List[Hashable]],
+) -> Tuple[Callable[[List[Hashable]], np.ndarray], Callable[[np.ndarray], List[Hashable]]]:
+    """
+    Maps native ids to integers and back. When the nodes of every graph are integers they map to themselves,
+    otherwise ids of all graphs map to their position in the nodes of the first graph, -1 if absent from it, since
+    only nodes of every graph survive an intersection.
+    """
+    if all(
+        isinstance(node, (int, np.integer)) and not isinstance(node, bool) for nodes in node_lists for node in nodes
+    ):
+        return (lambda ids: np.fromiter(ids, dtype=np.int64, count=len(ids))), (lambda ids: ids.tolist())
+
+    nodes = node_lists[0]
+    index = {node: i for i, node in enumerate(nodes)}
+
+    def encode(ids: List[Hashable]) -> np.ndarray:
+        get = index.get
+        return np.fromiter((get(node, -1) for node in ids), dtype=np.int64, count=len(ids))
+
+    return encode, lambda ids: [nodes[i] for i in ids.tolist()]
+
+
+def intersect_subgraphs(subgraphs: Sequence[Graph]) -> nx.DiGraph:
+    """
+    Intersects directed graphs: the result has the nodes of every graph and the edges of every graph.
+
+    Node sets become sorted integer arrays and edges integer keys over the common nodes, `source_rank *
+    len(common) + target_rank`, which are intersected with `np.intersect1d`. Nodes and edges come out sorted by id.
+
+    Args:
+        subgraphs (Sequence[Graph]): NetworkX or CSR graphs, e.g. neighborhoods from `find_adjacent_nodes`.
+
+    Returns:
+        nx.DiGraph: The intersection, without attributes.
+    """
+    if not subgraphs:
+        raise ValueError("Nothing to intersect")
+    node_lists = [_nodes(graph) for graph in subgraphs]
+    encode, decode = _encoder(node_lists)
+
+    node_sets = []
+    for nodes in node_lists:
+        ids = encode(nodes)
+        node_sets.append(np.unique(ids[ids >= 0]))
+    common = intersect_sorted(node_sets)
+
+    # Only edges between common nodes can be common, gather those leaving common nodes
+    m = len(common)
+    common_nodes = decode(common)
+    edge_sets = []
+    for graph in subgraphs if m else []:
+        ranks = []
+        for ids in _edges(graph, common_nodes):
+            encoded = encode(ids)
+            rank = np.minimum(np.searchsorted(common, encoded), m - 1)
+            ranks.append(np.where(common[rank] == encoded, rank, -1))
+        keep = (ranks[0] >= 0) & (ranks[1] >= 0)
+        edge_sets.append(np.unique(ranks[0][keep] * m + ranks[1][keep]))
+    keys = intersect_sorted(edge_sets)
+
+    G = nx.DiGraph()
+    G.add_nodes_from(common_nodes)
+    if m:
+        G.add_edges_from(zip(decode(common[keys // m]), decode(common[keys % m])))
+    log.debug(f"Intersected {len(subgraphs)} graphs into {m} nodes and {len(keys)} edges")
+    return G
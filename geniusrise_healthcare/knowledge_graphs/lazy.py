@@ -0,0 +1,354 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from collections.abc import MutableMapping
+from functools import lru_cache
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional
+
+import networkx as nx
+import numpy as np
+
+from .csr import EDGE_TYPE_KEYS
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"GRATTR\x00\x00"
+ATTRIBUTE_STORE_VERSION = 1
+
+# Magic, format version, reserved, node count, edge count and offset of the pickled node ids
+_HEADER = struct.Struct("<8sIIQQQ")
+
+# Node attributes read by traversals and kept in memory, the rest is read from the attribute store on demand
+HOT_NODE_ATTRIBUTES = ("tag", "type", "semantic_types")
+
+_DELETED = object()
+
+
+def write_attribute_store(
+    G: nx.DiGraph,
+    file_path: str,
+    hot_node_attributes: Iterable[str] = HOT_NODE_ATTRIBUTES,
+    hot_edge_attributes: Iterable[str] = EDGE_TYPE_KEYS,
+) -> None:
+    """
+    Writes the cold node and edge attributes of a graph, every attribute but the hot ones, to an attribute store.
+
+    The file holds the node and edge offset tables, the edge endpoints as node positions, one pickled dict per node
+    and edge, and the pickled node ids. Nodes are stored in graph order and edges by source node in adjacency order.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        file_path (str): The attribute store file.
+        hot_node_attributes (Iterable[str]): Node attributes left out of the store (default is `HOT_NODE_ATTRIBUTES`).
+        hot_edge_attributes (Iterable[str]): Edge attributes left out of the store (default is the edge type keys).
+
+    Returns:
+        None
+    """
+    hot_nodes, hot_edges = frozenset(hot_node_attributes), frozenset(hot_edge_attributes)
+    nodes = list(G)
+    position = {node: i for i, node in enumerate(nodes)}
+    n, m = len(nodes), G.number_of_edges()
+    node_offsets = np.zeros(n + 1, dtype=np.int64)
+    edge_offsets = np.zeros(m + 1, dtype=np.int64)
+    edge_sources = np.zeros(m, dtype=np.int64)
+    edge_targets = np.zeros(m, dtype=np.int64)
+    start = _HEADER.size + 8 * (n + 3 * m + 2)
+
+    def dump(data: Dict[str, Any], hot: frozenset) -> bytes:
+        cold = {key: value for key, value in data.items() if key not in hot}
+        return pickle.dumps(cold, protocol=pickle.HIGHEST_PROTOCOL) if cold else b""
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.seek(start)
+            offset = start
+            for i, node in enumerate(nodes):
+                node_offsets[i] = offset
+                offset += f.write(dump(G._node[node], hot_nodes))  # type: ignore
+            node_offsets[n] = offset
+            e = 0
+            for i, node in enumerate(nodes):
+                for target, data in G._succ[node].items():  # type: ignore
+                    edge_offsets[e], edge_sources[e], edge_targets[e] = offset, i, position[target]
+                    offset += f.write(dump(data, hot_edges))
+                    e += 1
+            edge_offsets[m] = offset
+            ids_offset = offset
+            pickle.dump(nodes, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, ATTRIBUTE_STORE_VERSION, 0, n, m, ids_offset))
+            for array in (node_offsets, edge_offsets, edge_sources, edge_targets):
+                f.write(array.tobytes())
+        os.replace(tmp_path, file_path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    log.info(f"Wrote attributes of {n} nodes and {m} edges to {file_path}")
+
+
+class AttributeStore:
+    """
+    Read-only attribute store over a memory mapped file, see `write_attribute_store`. Decoded attribute dicts are
+    kept in an LRU cache, so repeatedly read nodes and edges are only unpickled once.
+
+    The cached dicts are shared: treat the values read through the store as read-only.
+    """
+
+    def __init__(self, file_path: str, cache_size: int = 65536) -> None:
+        """
+        Args:
+            file_path (str): The attribute store file.
+            cache_size (int): Number of node and of edge attribute dicts cached (default is 65536).
+        """
+        self.file_path = file_path
+        self.cache_size = cache_size
+        self._file = open(file_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, n, m, self._ids_offset = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{file_path} is not an attribute store")
+        if version != ATTRIBUTE_STORE_VERSION:
+            raise ValueError(f"{file_path} has attribute store version {version}, expected {ATTRIBUTE_STORE_VERSION}")
+        offset = _HEADER.size
+        arrays = []
+        for count in (n + 1, m + 1, m, m):
+            arrays.append(np.frombuffer(self._mmap, dtype=np.int64, count=count, offset=offset))
+            offset += 8 * count
+        self.node_offsets, self.edge_offsets, self.edge_sources, self.edge_targets = arrays
+        self.node = lru_cache(maxsize=cache_size)(self._read_node)
+        self.edge = lru_cache(maxsize=cache_size)(self._read_edge)
+
+    def _read(self, start: int, end: int) -> Dict[str, Any]:
+        return pickle.loads(self._mmap[start:end]) if end > start else {}
+
+    def _read_node(self, position: int) -> Dict[str, Any]:
+        return self._read(self.node_offsets[position], self.node_offsets[position + 1])
+
+    def _read_edge(self, position: int) -> Dict[str, Any]:
+        return self._read(self.edge_offsets[position], self.edge_offsets[position + 1])
+
+    @property
+    def nodes(self) -> List[Hashable]:
+        """
+        Node ids in store order.
+        """
+        return pickle.loads(self._mmap[self._ids_offset :])
+
+    def __len__(self) -> int:
+        return len(self.node_offsets) - 1
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Reopened from the file on unpickling, the mapping itself is not picklable
+        return {"file_path": self.file_path, "cache_size": self.cache_size}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["file_path"], state["cache_size"])  # type: ignore
+
+    def close(self) -> None:
+        """
+        Clears the caches and unmaps the file. Attributes cannot be read afterwards.
+        """
+        self.node.cache_clear()
+        self.edge.cache_clear()
+        del self.node_offsets, self.edge_offsets, self.edge_sources, self.edge_targets
+        self._mmap.close()
+        self._file.close()
+
+
+class LazyAttributes(MutableMapping):
+    """
+    Stands in for a node or edge attribute dict, as `G.nodes[n]` or `G.edges[u, v]`. Hot attributes and every
+    attribute written since loading are held in memory, the others are read from the attribute store on first
+    access.
+
+    Copying or pickling materializes a plain dict.
+    """
+
+    __slots__ = ("_hot", "_store", "_position", "_edge")
+
+    def __init__(self, hot: Optional[Dict[str, Any]], store: AttributeStore, position: int, edge: bool = False) -> None:
+        self._hot = hot or None
+        self._store = store
+        self._position = position
+        self._edge = edge
+
+    def _cold(self) -> Dict[str, Any]:
+        if self._position < 0:
+            return {}
+        return self._store.edge(self._position) if self._edge else self._store.node(self._position)
+
+    def __getitem__(self, key: str) -> Any:
+        hot = self._hot
+        if hot is not None and key in hot:
+            value = hot[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self._cold()[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        hot = self._hot
+        if hot is not None and key in hot:
+            value = hot[key]
+            return default if value is _DELETED else value
+        return self._cold().get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        hot = self._hot
+        if hot is not None and key in hot:
+            return hot[key] is not _DELETED
+        return key in self._cold()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._hot is None:
+            self._hot = {}
+        self._hot[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self._cold():
+            self[key] = _DELETED
+        else:
+            del self._hot[key]  # type: ignore
+
+    def __iter__(self) -> Iterator[str]:
+        hot = self._hot or {}
+        for key, value in hot.items():
+            if value is not _DELETED:
+                yield key
+        for key in self._cold():
+            if key not in hot:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self) -> Any:
+        return dict, (dict(self),)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def _check_store_ids(G: nx.DiGraph, store: AttributeStore, position: Dict[Hashable, int]) -> None:
+    """
+    Raises if nodes or edges of the graph are missing from the store it is attached to.
+    """
+    missing = [node for node in G if node not in position]
+    if missing:
+        raise ValueError(
+            f"{len(missing)} of {G.number_of_nodes()} nodes are missing from attribute store {store.file_path}, "
+            f"e.g. {missing[:5]!r}, the graph does not have the ids the store was written with"
+        )
+    n = len(position)
+    sources = np.fromiter((position[u] for u, v in G.edges), dtype=np.int64, count=G.number_of_edges())
+    targets = np.fromiter((position[v] for u, v in G.edges), dtype=np.int64, count=G.number_of_edges())
+    stored = store.edge_sources.astype(np.int64) * n + store.edge_targets.astype(np.int64)
+    absent = ~np.isin(sources * n + targets, stored)
+    if absent.any():
+        raise ValueError(
+            f"{int(absent.sum())} of {G.number_of_edges()} edges are missing from attribute store {store.file_path}"
+        )
+
+
+def attach_attribute_store(
+    G: nx.DiGraph,
+    store: AttributeStore,
+    hot_node_attributes: Iterable[str] = HOT_NODE_ATTRIBUTES,
+    hot_edge_attributes: Iterable[str] = EDGE_TYPE_KEYS,
+) -> nx.DiGraph:
+    """
+    Replaces the attribute dicts of a graph with `LazyAttributes` over an attribute store, in place. Only the hot
+    attributes of the current dicts are kept in memory, the graph may also hold nothing but topology and hot
+    columns, e.g. when loaded from a snapshot. Every node and edge of the graph must be in the store, with the
+    same ids: the store is keyed by node id, so a graph whose ids were relabeled or converted, e.g. 404684003 to
+    "404684003", would otherwise silently read no attributes.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        store (AttributeStore): The attribute store, written from this graph or one with the same nodes and edges.
+        hot_node_attributes (Iterable[str]): Node attributes kept in memory (default is `HOT_NODE_ATTRIBUTES`).
+        hot_edge_attributes (Iterable[str]): Edge attributes kept in memory (default is the edge type keys).
+
+    Returns:
+        nx.DiGraph: The graph, with the store under `G.graph["attribute_store"]`.
+
+    Raises:
+        ValueError: If nodes or edges of the graph are missing from the store, the graph is then left unchanged.
+    """
+    hot_nodes, hot_edges = frozenset(hot_node_attributes), frozenset(hot_edge_attributes)
+    position = {node: i for i, node in enumerate(store.nodes)}
+    _check_store_ids(G, store, position)
+    edge_rows = np.searchsorted(store.edge_sources, np.arange(len(position) + 1))
+    targets = store.edge_targets
+    for node, data in G._node.items():  # type: ignore
+        i = position.get(node, -1)
+        G._node[node] = LazyAttributes(  # type: ignore
+            {key: value for key, value in data.items() if key in hot_nodes}, store, i
+        )
+        row = (
+            {int(target): e for e, target in enumerate(targets[edge_rows[i] : edge_rows[i + 1]], edge_rows[i])}
+            if i >= 0
+            else {}
+        )
+        successors = G._succ[node]  # type: ignore
+        for target, data in successors.items():
+            e = row.get(position.get(target, -1), -1)
+            proxy = LazyAttributes({key: value for key, value in data.items() if key in hot_edges}, store, e, True)
+            # Successor and predecessor adjacency share the edge's dict
+            successors[target] = G._pred[target][node] = proxy  # type: ignore
+    G.graph["attribute_store"] = store
+    log.info(f"Attached attribute store {store.file_path} to {G.number_of_nodes()} nodes")
+    return G
+
+
+def make_lazy(
+    G: nx.DiGraph,
+    file_path: str,
+    hot_node_attributes: Iterable[str] = HOT_NODE_ATTRIBUTES,
+    hot_edge_attributes: Iterable[str] = EDGE_TYPE_KEYS,
+    cache_size: int = 65536,
+) -> nx.DiGraph:
+    """
+    Moves the cold attributes of a graph to an attribute store file and serves them from there lazily, leaving the
+    adjacency and hot attributes in memory.
+
+    Args:
+        G (nx.DiGraph): The graph, converted in place.
+        file_path (str): The attribute store file.
+        hot_node_attributes (Iterable[str]): Node attributes kept in memory (default is `HOT_NODE_ATTRIBUTES`).
+        hot_edge_attributes (Iterable[str]): Edge attributes kept in memory (default is the edge type keys).
+        cache_size (int): Number of node and of edge attribute dicts cached (default is 65536).
+
+    Returns:
+        nx.DiGraph: The graph.
+    """
+    write_attribute_store(G, file_path, hot_node_attributes, hot_edge_attributes)
+    return attach_attribute_store(G, AttributeStore(file_path, cache_size), hot_node_attributes, hot_edge_attributes)
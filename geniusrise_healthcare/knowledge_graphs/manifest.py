@@ -0,0 +1,228 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Set
+
+from .artifacts import file_digest
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def _digest_json(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def input_files(path: str) -> List[str]:
+    """
+    Lists the input files of a source, the path itself or every file below it.
+    """
+    if os.path.isfile(path):
+        return [path]
+    files = []
+    for root, directories, names in os.walk(path):
+        directories.sort()
+        files.extend(os.path.join(root, name) for name in sorted(names))
+    return files
+
+
+def _relative_imports(code: bytes, level: int) -> Set[str]:
+    """
+    Names of the modules imported relatively `level` packages up, by `from ..obo import x` or `from .. import obo`
+    with level 2.
+    """
+    modules = set()
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.ImportFrom) and node.level == level:
+            if node.module:
+                modules.add(node.module.split(".")[0])
+            else:
+                modules.update(alias.name for alias in node.names)
+    return modules
+
+
+def code_version(package_dir: str) -> str:
+    """
+    Hashes the code of a loader package and of the shared modules it imports (e.g. `obo.py`, `closure.py`), following
+    the imports of shared modules between themselves (e.g. `obo.py` importing `artifacts.py`).
+
+    Args:
+        package_dir (str): Directory of the loader package, e.g. `knowledge_graphs/snomed`.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    shared = set()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            with open(os.path.join(package_dir, name), "rb") as f:
+                code = f.read()
+            digest.update(name.encode("utf-8") + b"\0" + code)
+            shared.update(_relative_imports(code, 2))
+    parent = os.path.dirname(os.path.abspath(package_dir))
+    modules: Dict[str, bytes] = {}
+    pending = list(shared)
+    while pending:
+        module = pending.pop()
+        module_path = os.path.join(parent, f"{module}.py")
+        if module in modules or not os.path.exists(module_path):
+            continue
+        with open(module_path, "rb") as f:
+            modules[module] = f.read()
+        pending.extend(_relative_imports(modules[module], 1))
+    for module in sorted(modules):
+        digest.update(module.encode("utf-8") + b"\0" + modules[module])
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Record of what every cached per-source artifact was built from.
+
+    For each source, the manifest keeps the SHA-256 of every input file, the hash of the loader code and the build
+    options, combined into a fingerprint. An artifact is reused only while its fingerprint is unchanged. File
+    digests are remembered with the size and modification time of the file, so unchanged multi-gigabyte releases
+    are not hashed again on every build. Derived outputs (e.g. the combined snapshot) record the fingerprints of
+    the sources they depend on and are rebuilt when any of them changes.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Args:
+            file_path (str): The manifest file, created on `save` if missing.
+        """
+        self.file_path = file_path
+        self.data: Dict[str, Any] = {"version": MANIFEST_VERSION, "sources": {}, "derived": {}, "digests": {}}
+        if os.path.exists(file_path):
+            with open(file_path) as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                self.data = data
+            else:
+                log.warning(f"Ignoring manifest {file_path} of version {data.get('version')}")
+
+    def file_digest(self, file_path: str) -> str:
+        """
+        Returns the digest of a file, reusing the recorded one if its size and modification time are unchanged.
+        """
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        cached = self.data["digests"].get(key)
+        if cached is not None and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        log.info(f"Hashing {file_path}")
+        digest = file_digest(file_path)
+        self.data["digests"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def fingerprint(self, path: str, options: Dict[str, Any], code: str) -> Dict[str, Any]:
+        """
+        Fingerprints a source build.
+
+        Args:
+            path (str): The input file or directory of the source.
+            options (Dict[str, Any]): The options passed to the loader.
+            code (str): The loader code version, see `code_version`.
+
+        Returns:
+            Dict[str, Any]: The input digests, options, code version and their combined `fingerprint`.
+        """
+        inputs = {}
+        for file in input_files(path):
+            name = os.path.basename(path) if file == path else os.path.relpath(file, path)
+            inputs[name] = self.file_digest(file)
+        entry = {"inputs": inputs, "options": options, "code": code}
+        entry["fingerprint"] = _digest_json(entry)
+        return entry
+
+    def is_current(self, source: str, entry: Dict[str, Any]) -> bool:
+        """
+        Returns whether the recorded artifact of a source matches a fingerprint and still exists.
+        """
+        recorded = self.data["sources"].get(source)
+        return (
+            recorded is not None
+            and recorded["fingerprint"] == entry["fingerprint"]
+            and os.path.exists(recorded["artifact"])
+        )
+
+    def artifact(self, source: str) -> str:
+        return self.data["sources"][source]["artifact"]
+
+    def changes(self, source: str, entry: Dict[str, Any]) -> List[str]:
+        """
+        Describes what changed since the recorded build of a source, for logging.
+        """
+        recorded = self.data["sources"].get(source)
+        if recorded is None:
+            return ["not built before"]
+        inputs = recorded["inputs"]
+        changes = [f"input {name} changed" for name, digest in entry["inputs"].items() if inputs.get(name) != digest]
+        changes += [f"input {name} removed" for name in inputs if name not in entry["inputs"]]
+        if recorded["options"] != entry["options"]:
+            changes.append("options changed")
+        if recorded["code"] != entry["code"]:
+            changes.append("loader code changed")
+        return changes or ["artifact missing"]
+
+    def record(self, source: str, entry: Dict[str, Any], artifact: str) -> None:
+        """
+        Records the artifact built for a source, deleting the artifact it replaces.
+        """
+        previous = self.data["sources"].get(source)
+        if previous is not None and previous["artifact"] != artifact and os.path.exists(previous["artifact"]):
+            os.remove(previous["artifact"])
+        self.data["sources"][source] = dict(entry, artifact=artifact)
+
+    def derived_is_current(self, name: str, dependencies: Dict[str, str], file_path: Optional[str] = None) -> bool:
+        """
+        Returns whether a derived output was built from exactly these source fingerprints.
+
+        Args:
+            name (str): The derived output, e.g. "snapshot".
+            dependencies (Dict[str, str]): Source to fingerprint of every source it is built from.
+            file_path (Optional[str]): File of the output, which must exist to be current.
+        """
+        recorded = self.data["derived"].get(name)
+        return (
+            recorded is not None
+            and recorded["dependencies"] == dependencies
+            and (file_path is None or os.path.exists(file_path))
+        )
+
+    def record_derived(self, name: str, dependencies: Dict[str, str]) -> None:
+        """
+        Records the source fingerprints a derived output was built from.
+        """
+        self.data["derived"][name] = {"dependencies": dependencies}
+
+    def save(self) -> None:
+        """
+        Writes the manifest atomically.
+        """
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.file_path)
@@ -0,0 +1,234 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import random
+import re
+import sys
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+import networkx as nx
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+_PREFIX = re.compile(r"^[A-Za-z_]+")
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Approximate memory held by an object and everything it references, counting shared objects once.
+
+    Args:
+        obj (Any): The object.
+        seen (Optional[Set[int]]): Ids of objects already counted, shared across calls to attribute each object to
+            the first value reaching it.
+
+    Returns:
+        int: Size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool, type(None), np.ndarray)):
+            # Arrays owning their data include it in getsizeof, views share their base's
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, "__dict__"):
+                stack.append(item.__dict__)
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return size
+
+
+def node_namespace(G: nx.DiGraph) -> Callable[[Hashable], str]:
+    """
+    The namespace of the graph's nodes: the registered source with dense ids, else the id prefix ("GO", "DOID",
+    "C" for UMLS, "DB" for DrugBank), "int" for SNOMED ids and "numeric" for RxNorm's numeric strings.
+    """
+    registry = G.graph.get("id_registry")
+    if registry is not None:
+        return lambda node: registry.native(node)[0]
+
+    def namespace(node: Hashable) -> str:
+        if isinstance(node, (int, np.integer)):
+            return "int"
+        if isinstance(node, str):
+            if ":" in node:
+                return node.split(":", 1)[0]
+            match = _PREFIX.match(node)
+            return match.group(0) if match else "numeric"
+        return type(node).__name__
+
+    return namespace
+
+
+def graph_memory_report(
+    G: nx.DiGraph,
+    sample_nodes: int = 10000,
+    sample_edges: int = 10000,
+    namespace: Optional[Callable[[Hashable], str]] = None,
+    include_graph_attributes: bool = True,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Estimates where a graph's memory goes from a uniform sample of its nodes and edges: per node and edge attribute
+    key, per node namespace and per structure (node ids, attribute dicts, adjacency dicts and attribute values).
+
+    Sizes are deep sizes scaled up from the sample. Objects shared between values, such as interned strings, are
+    counted once, for the first value reaching them.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        sample_nodes (int): Nodes sampled (default is 10000).
+        sample_edges (int): Edges sampled (default is 10000).
+        namespace (Optional[Callable[[Hashable], str]]): Maps a node to its namespace (default is `node_namespace`).
+        include_graph_attributes (bool): Also size the indexes in `G.graph` fully, which can take a while on large
+            graphs (default is True).
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        Dict[str, Any]: The report, JSON serializable to diff between builds, see `format_memory_report`.
+    """
+    rng = random.Random(seed)
+    namespace = namespace or node_namespace(G)
+    seen: Set[int] = set()
+    n_nodes, n_edges = G.number_of_nodes(), G.number_of_edges()
+
+    nodes = list(G)
+    sampled = nodes if len(nodes) <= sample_nodes else rng.sample(nodes, sample_nodes)
+    node_scale = n_nodes / len(sampled) if sampled else 0.0
+
+    structures: Dict[str, float] = defaultdict(float)
+    node_keys: Dict[str, Dict[str, float]] = defaultdict(lambda: {"bytes": 0.0, "count": 0.0})
+    namespaces: Dict[str, Dict[str, float]] = defaultdict(lambda: {"nodes": 0.0, "bytes": 0.0})
+    # The outer dicts are sized exactly, the per node containers are sampled
+    structures["graph_dicts"] = sum(sys.getsizeof(d) for d in (G._node, G._succ, G._pred))  # type: ignore
+
+    for node in sampled:
+        data = G._node[node]  # type: ignore
+        id_size = deep_sizeof(node, seen)
+        dict_size = sys.getsizeof(data)
+        adjacency_size = sys.getsizeof(G._succ[node]) + sys.getsizeof(G._pred[node])  # type: ignore
+        value_size = 0
+        for key, value in data.items():
+            size = deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            node_keys[str(key)]["bytes"] += size * node_scale
+            node_keys[str(key)]["count"] += node_scale
+            value_size += size
+        structures["node_ids"] += id_size * node_scale
+        structures["node_dicts"] += dict_size * node_scale
+        structures["adjacency_dicts"] += adjacency_size * node_scale
+        structures["node_values"] += value_size * node_scale
+        entry = namespaces[namespace(node)]
+        entry["nodes"] += node_scale
+        entry["bytes"] += (id_size + dict_size + adjacency_size + value_size) * node_scale
+
+    edge_keys: Dict[str, Dict[str, float]] = defaultdict(lambda: {"bytes": 0.0, "count": 0.0})
+    if n_edges:
+        picked = sorted(rng.sample(range(n_edges), min(sample_edges, n_edges)))
+        edge_scale = n_edges / len(picked)
+        position = 0
+        for i, (u, v, data) in enumerate(G.edges(data=True)):
+            if i != picked[position]:
+                continue
+            dict_size = sys.getsizeof(data)
+            value_size = 0
+            for key, value in data.items():
+                size = deep_sizeof(key, seen) + deep_sizeof(value, seen)
+                edge_keys[str(key)]["bytes"] += size * edge_scale
+                edge_keys[str(key)]["count"] += edge_scale
+                value_size += size
+            structures["edge_dicts"] += dict_size * edge_scale
+            structures["edge_values"] += value_size * edge_scale
+            namespaces[namespace(u)]["bytes"] += (dict_size + value_size) * edge_scale
+            position += 1
+            if position == len(picked):
+                break
+
+    graph_attributes = {}
+    if include_graph_attributes:
+        for key, value in G.graph.items():
+            graph_attributes[str(key)] = deep_sizeof(value, seen)
+        structures["graph_attributes"] = sum(graph_attributes.values())
+
+    def ranked(entries: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        return {
+            key: {name: round(value) for name, value in entry.items()}
+            for key, entry in sorted(entries.items(), key=lambda item: item[1]["bytes"], reverse=True)
+        }
+
+    return {
+        "nodes": n_nodes,
+        "edges": n_edges,
+        "sampled_nodes": len(sampled),
+        "sampled_edges": min(sample_edges, n_edges),
+        "total_bytes": round(sum(structures.values())),
+        "structures": {key: round(value) for key, value in sorted(structures.items(), key=lambda item: -item[1])},
+        "node_attributes": ranked(node_keys),
+        "edge_attributes": ranked(edge_keys),
+        "namespaces": ranked(namespaces),
+        "graph_attributes": dict(sorted(graph_attributes.items(), key=lambda item: -item[1])),
+    }
+
+
+def format_memory_report(report: Dict[str, Any], top: int = 20) -> str:
+    """
+    Formats a memory report as ranked tables, largest first.
+
+    Args:
+        report (Dict[str, Any]): The report, from `graph_memory_report`.
+        top (int): Rows shown per table (default is 20).
+
+    Returns:
+        str: The tables.
+    """
+    total = report["total_bytes"] or 1
+    lines = [
+        f"{report['nodes']} nodes, {report['edges']} edges, ~{report['total_bytes'] / 2**20:.0f} MiB "
+        f"(sampled {report['sampled_nodes']} nodes, {report['sampled_edges']} edges)"
+    ]
+
+    def table(title: str, rows: Dict[str, Any], count: Optional[str] = None) -> None:
+        lines.append("")
+        lines.append(f"{title:<40} {'MiB':>10} {'share':>6}" + (f" {count:>12} {'B/item':>8}" if count else ""))
+        for key, value in list(rows.items())[:top]:
+            size = value["bytes"] if isinstance(value, dict) else value
+            line = f"{key[:40]:<40} {size / 2**20:>10.1f} {size / total:>6.1%}"
+            if count:
+                line += f" {value[count]:>12} {size / max(value[count], 1):>8.0f}"
+            lines.append(line)
+
+    table("structure", report["structures"])
+    table("node attribute", report["node_attributes"], "count")
+    table("edge attribute", report["edge_attributes"], "count")
+    table("namespace", report["namespaces"], "nodes")
+    if report["graph_attributes"]:
+        table("graph attribute", report["graph_attributes"])
+    return "\n".join(lines)
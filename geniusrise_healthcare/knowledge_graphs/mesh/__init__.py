@@ -14,6 +14,6 @@
 # limitations under the License.
 
 from .base import load_mesh
-from .descriptors import process_descriptors
+from .descriptors import parse_descriptor_record, process_descriptors
 from .qualifiers import process_qualifiers
 from .supplementary import process_supplementary
@@ -20,17 +20,21 @@ import networkx as nx
 from .descriptors import process_descriptors
 from .qualifiers import process_qualifiers
 from .supplementary import process_supplementary
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
-def load_mesh(G: nx.DiGraph, mesh_path: str) -> nx.DiGraph:
+@instrumented("mesh")
+def load_mesh(G: nx.DiGraph, mesh_path: str, lazy_details: bool = False) -> nx.DiGraph:
     """
     Loads MeSH data into a NetworkX graph.
 
     Args:
         G: (nx.DiGraph): The networkx graph.
         mesh_path (str): Path to the directory containing the MeSH XML files.
+        lazy_details (bool): Stream the descriptors and serve their scope notes and other details from
+            `G.graph["descriptor_records"].get_record(descriptor_ui)` (default is False).
 
     Returns:
         The NetworkX graph containing MeSH data.
@@ -40,9 +44,12 @@ def load_mesh(G: nx.DiGraph, mesh_path: str) -> nx.DiGraph:
     qualifiers_file = os.path.join(mesh_path, "qual2024.xml")
     supplementary_file = os.path.join(mesh_path, "supp2024.xml")
 
-    process_descriptors(descriptors_file, G)
-    process_qualifiers(qualifiers_file, G)
-    process_supplementary(supplementary_file, G)
+    with stage("mesh.descriptors", G, descriptors_file):
+        process_descriptors(descriptors_file, G, lazy=lazy_details)
+    with stage("mesh.qualifiers", G, qualifiers_file):
+        process_qualifiers(qualifiers_file, G)
+    with stage("mesh.supplementary", G, supplementary_file):
+        process_supplementary(supplementary_file, G)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
@@ -15,50 +15,99 @@
 
 # descriptors.py
 import logging
+import xml.etree.ElementTree as ET
+from typing import Any, Dict
 import networkx as nx
+from ..records import XMLRecordStore, iter_xml_records
 from .utils import read_xml_file, get_elements_by_tag
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
 
-def process_descriptors(descriptors_file: str, G: nx.DiGraph) -> None:
+def parse_descriptor_record(descriptor: ET.Element) -> Dict[str, Any]:
+    """
+    Extracts the details of a MeSH descriptor record.
+
+    Args:
+        descriptor (ET.Element): The DescriptorRecord element.
+
+    Returns:
+        Dictionary with the descriptor name, scope note, tree numbers, concepts and entry terms.
+    """
+    scope_note = descriptor.findtext("ConceptList/Concept[@PreferredConceptYN='Y']/ScopeNote")
+    return {
+        "name": descriptor.findtext("DescriptorName/String"),
+        "scope_note": scope_note.strip() if scope_note else None,
+        "annotation": descriptor.findtext("Annotation"),
+        "tree_numbers": [tree_number.text for tree_number in descriptor.findall("TreeNumberList/TreeNumber")],
+        "concepts": [
+            {"concept_ui": concept.findtext("ConceptUI"), "name": concept.findtext("ConceptName/String")}
+            for concept in descriptor.findall("ConceptList/Concept")
+        ],
+        "terms": [term.text for term in descriptor.findall("ConceptList/Concept/TermList/Term/String")],
+    }
+
+
+def _add_descriptor(descriptor: ET.Element, G: nx.DiGraph) -> None:
+    descriptor_ui = descriptor.findtext("DescriptorUI")
+    name = descriptor.findtext("DescriptorName/String")
+    if descriptor_ui:
+        G.add_node(descriptor_ui, name=name, type="descriptor")
+
+        # Process tree numbers
+        tree_numbers = descriptor.findall("TreeNumberList/TreeNumber")
+        for tree_number in tree_numbers:
+            G.add_node(tree_number.text, type="tree_number")
+            G.add_edge(descriptor_ui, tree_number.text, type="has_tree_number")
+
+        # Process concept relations
+        concepts = descriptor.findall("ConceptList/Concept")
+        for concept in concepts:
+            concept_ui = concept.findtext("ConceptUI")
+            concept_name = concept.findtext("ConceptName/String")
+            if concept_ui:
+                G.add_node(concept_ui, name=concept_name, type="concept")
+                G.add_edge(descriptor_ui, concept_ui, type="has_concept")
+
+
+def process_descriptors(descriptors_file: str, G: nx.DiGraph, lazy: bool = False) -> None:
     """
     Processes the MeSH descriptors data and adds it to the graph.
 
+    In lazy mode the file is streamed and the byte range of every record is kept in an `XMLRecordStore` under
+    `G.graph["descriptor_records"]`, which serves the scope notes and other details on demand.
+
     Args:
         descriptors_file (str): Path to the MeSH descriptors XML file.
         G (nx.DiGraph): The NetworkX graph to which the descriptors data will be added.
+        lazy (bool): Stream the file and index the records for on-demand access (default is False).
 
     Returns:
         None
     """
     log.info(f"Loading descriptors from {descriptors_file}")
 
+    if lazy:
+        store = XMLRecordStore(descriptors_file, parse_descriptor_record)
+        for descriptor, offset, length in track(iter_xml_records(descriptors_file, "DescriptorRecord")):
+            try:
+                _add_descriptor(descriptor, G)
+                descriptor_ui = descriptor.findtext("DescriptorUI")
+                if descriptor_ui:
+                    store.add(descriptor_ui, offset, length)
+            except Exception as e:
+                log.error(f"Error processing descriptor {descriptor}: {e}")
+                raise ValueError(f"Error processing descriptor {descriptor}: {e}")
+        G.graph["descriptor_records"] = store
+        return
+
     tree = read_xml_file(descriptors_file)
     descriptor_elements = get_elements_by_tag(tree, "DescriptorRecord")
 
-    for descriptor in descriptor_elements:
+    for descriptor in track(descriptor_elements):
         try:
-            descriptor_ui = descriptor.findtext("DescriptorUI")
-            name = descriptor.findtext("DescriptorName/String")
-            if descriptor_ui:
-                G.add_node(descriptor_ui, name=name, type="descriptor")
-
-                # Process tree numbers
-                tree_numbers = descriptor.findall("TreeNumberList/TreeNumber")
-                for tree_number in tree_numbers:
-                    G.add_node(tree_number.text, type="tree_number")
-                    G.add_edge(descriptor_ui, tree_number.text, type="has_tree_number")
-
-                # Process concept relations
-                concepts = descriptor.findall("ConceptList/Concept")
-                for concept in concepts:
-                    concept_ui = concept.findtext("ConceptUI")
-                    concept_name = concept.findtext("ConceptName/String")
-                    if concept_ui:
-                        G.add_node(concept_ui, name=concept_name, type="concept")
-                        G.add_edge(descriptor_ui, concept_ui, type="has_concept")
-
+            _add_descriptor(descriptor, G)
         except Exception as e:
             log.error(f"Error processing descriptor {descriptor}: {e}")
             raise ValueError(f"Error processing descriptor {descriptor}: {e}")
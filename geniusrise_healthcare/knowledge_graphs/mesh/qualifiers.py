@@ -16,6 +16,7 @@
 import logging
 import networkx as nx
 from .utils import read_xml_file, get_elements_by_tag
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ def process_qualifiers(qualifiers_file: str, G: nx.DiGraph) -> None:
     tree = read_xml_file(qualifiers_file)
     qualifier_elements = get_elements_by_tag(tree, "QualifierRecord")
 
-    for qualifier in qualifier_elements:
+    for qualifier in track(qualifier_elements):
         try:
             qualifier_ui = qualifier.findtext("QualifierUI")
             name = qualifier.findtext("QualifierName/String")
@@ -48,6 +49,8 @@ def process_qualifiers(qualifiers_file: str, G: nx.DiGraph) -> None:
                 for tree_number in tree_numbers:
                     G.add_node(tree_number.text, type="tree_number")
                     G.add_edge(qualifier_ui, tree_number.text, type="has_tree_number")
+            else:
+                skipped()
 
         except Exception as e:
             log.error(f"Error processing qualifier {qualifier}: {e}")
@@ -16,6 +16,7 @@
 import logging
 import networkx as nx
 from .utils import read_xml_file, get_elements_by_tag
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ def process_supplementary(supplementary_file: str, G: nx.DiGraph) -> None:
     tree = read_xml_file(supplementary_file)
     supplementary_elements = get_elements_by_tag(tree, "SupplementalRecord")
 
-    for supplementary in supplementary_elements:
+    for supplementary in track(supplementary_elements):
         try:
             supplementary_ui = supplementary.findtext("SupplementalRecordUI")
             name = supplementary.findtext("SupplementalRecordName/String")
@@ -51,6 +52,8 @@ def process_supplementary(supplementary_file: str, G: nx.DiGraph) -> None:
                     if concept_ui:
                         G.add_node(concept_ui, name=concept_name, type="concept")
                         G.add_edge(supplementary_ui, concept_ui, type="has_concept")
+            else:
+                skipped()
 
         except Exception as e:
             log.error(f"Error processing supplementary concept record {supplementary}: {e}")
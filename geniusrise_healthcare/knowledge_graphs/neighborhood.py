@@ -0,0 +1,200 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import weakref
+from typing import Hashable, List, Optional, Union
+
+import networkx as nx
+import numpy as np
+
+from .cache import graph_cache
+from .csr import CSRGraph, _gather, csr_graph
+
+log = logging.getLogger(__name__)
+
+
+def _isin_sorted(values: np.ndarray, sorted_array: np.ndarray) -> np.ndarray:
+    """
+    Membership of `values` in a sorted array, by binary search.
+    """
+    if len(sorted_array) == 0:
+        return np.zeros(len(values), dtype=bool)
+    i = np.minimum(np.searchsorted(sorted_array, values), len(sorted_array) - 1)
+    return sorted_array[i] == values
+
+
+class NeighborhoodEngine:
+    """
+    k-hop neighborhoods over the CSR copy of a graph.
+
+    Neighborhoods are expanded hop by hop from the frontier with NumPy, tracking visited nodes in a sorted array
+    instead of a mask over the whole graph, so a query costs time in the size of the neighborhood, not of the
+    graph. Global degrees are computed once for ranking.
+    """
+
+    def __init__(self, graph: CSRGraph) -> None:
+        """
+        Args:
+            graph (CSRGraph): The graph.
+        """
+        # Held weakly, the engine is cached under the graph and would otherwise keep its own cache key alive
+        self.graph: CSRGraph = weakref.proxy(graph)
+        self.degree = graph.degree()
+
+    def k_hop_positions(
+        self, source: int, k: int = 1, direction: str = "in", max_nodes: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Returns the positions of the nodes within k hops of a source, in breadth first order, the source first.
+
+        Args:
+            source (int): Position of the source.
+            k (int): The number of hops (default is 1).
+            direction (str): Follow "out" edges, "in" edges or "both" (default is "in").
+            max_nodes (Optional[int]): Stop expanding once this many nodes are reached. The last hop then keeps
+                its highest degree nodes (default is unbounded).
+
+        Returns:
+            np.ndarray: Positions of the reached nodes.
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction {direction}, expected out, in or both")
+        graph = self.graph
+        adjacencies = []
+        if direction in ("out", "both"):
+            adjacencies.append((graph.indptr, graph.indices))
+        if direction in ("in", "both"):
+            adjacencies.append((graph.in_indptr, graph.in_indices))
+
+        frontier = np.array([source], dtype=np.int64)
+        visited = frontier
+        levels = [frontier]
+        for _ in range(k):
+            reached = np.unique(np.concatenate([indices[_gather(indptr, frontier)] for indptr, indices in adjacencies]))
+            frontier = reached[~_isin_sorted(reached, visited)]
+            if len(frontier) == 0:
+                break
+            if max_nodes is not None and len(visited) + len(frontier) > max_nodes:
+                keep = max(max_nodes - len(visited), 0)
+                frontier = np.sort(frontier[np.argsort(-self.degree[frontier], kind="stable")[:keep]])
+                levels.append(frontier)
+                break
+            levels.append(frontier)
+            visited = np.union1d(visited, frontier)
+        return np.concatenate(levels)
+
+    def subgraph_degree(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Returns the degree of every node within the subgraph induced by `positions`.
+        """
+        graph = self.graph
+        members = np.sort(positions)
+        degree = np.zeros(len(positions), dtype=np.int64)
+        for indptr, indices in ((graph.indptr, graph.indices), (graph.in_indptr, graph.in_indices)):
+            entries = _gather(indptr, positions)
+            inside = _isin_sorted(indices[entries], members)
+            rows = np.repeat(np.arange(len(positions)), indptr[positions + 1] - indptr[positions])
+            degree += np.bincount(rows[inside], minlength=len(positions))
+        return degree
+
+    def top_n(self, positions: np.ndarray, n: int, by: str = "subgraph") -> np.ndarray:
+        """
+        Returns the n highest degree positions, ties kept in their given order.
+
+        Args:
+            positions (np.ndarray): Candidate positions.
+            n (int): Number of positions kept.
+            by (str): Rank by the degree within the subgraph induced by the candidates, or by the precomputed
+                "global" degree (default is "subgraph").
+
+        Returns:
+            np.ndarray: The kept positions, highest degree first.
+        """
+        if by not in ("subgraph", "global"):
+            raise ValueError(f"Unknown ranking {by}, expected subgraph or global")
+        degree = self.subgraph_degree(positions) if by == "subgraph" else self.degree[positions]
+        return positions[np.argsort(-degree, kind="stable")[:n]]
+
+    def k_hop(
+        self,
+        source: Hashable,
+        k: int = 1,
+        direction: str = "in",
+        top_n: int = 0,
+        rank_by: str = "subgraph",
+        max_nodes: Optional[int] = None,
+    ) -> List[Hashable]:
+        """
+        Returns the nodes within k hops of a source, optionally only the top n by degree plus the source.
+
+        Args:
+            source (Hashable): The source node.
+            k (int): The number of hops (default is 1).
+            direction (str): Follow "out" edges, "in" edges or "both" (default is "in").
+            top_n (int): Keep only this many nodes by degree, and the source, if positive (default is 0).
+            rank_by (str): "subgraph" or "global" degree, see `top_n` (default is "subgraph").
+            max_nodes (Optional[int]): Bound on the nodes reached, see `k_hop_positions`.
+
+        Returns:
+            List[Hashable]: The nodes, in breadth first order or by decreasing degree with `top_n`.
+        """
+        i = self.graph.position(source)
+        if i < 0:
+            raise ValueError(f"Source node {source} not found in the graph.")
+        positions = self.k_hop_positions(i, k, direction, max_nodes)
+        if top_n > 0:
+            top = self.top_n(positions, top_n, rank_by)
+            positions = top if i in top else np.append(top, i)
+        return self.graph.nodes[positions].tolist()
+
+
+def neighborhood_engine(G: Union[nx.DiGraph, CSRGraph]) -> NeighborhoodEngine:
+    """
+    The neighborhood engine of a graph, built once and cached until the graph's nodes or edges change.
+    """
+    graph = csr_graph(G)
+    return graph_cache.get(graph, "neighborhood_engine", lambda: NeighborhoodEngine(graph))
+
+
+def k_hop_subgraph(
+    G: nx.DiGraph,
+    source: Hashable,
+    k: int = 1,
+    direction: str = "in",
+    top_n: int = 0,
+    rank_by: str = "subgraph",
+    max_nodes: Optional[int] = None,
+    reverse: bool = False,
+) -> nx.DiGraph:
+    """
+    Returns the subgraph induced by the k-hop neighborhood of a source as a read-only view of the graph, without
+    copying it. See `NeighborhoodEngine.k_hop`.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        source (Hashable): The source node.
+        k (int): The number of hops (default is 1).
+        direction (str): Follow "out" edges, "in" edges or "both" (default is "in").
+        top_n (int): Keep only this many nodes by degree, and the source, if positive (default is 0).
+        rank_by (str): "subgraph" or "global" degree (default is "subgraph").
+        max_nodes (Optional[int]): Bound on the nodes reached.
+        reverse (bool): View the subgraph with its edges reversed (default is False).
+
+    Returns:
+        nx.DiGraph: The subgraph view.
+    """
+    nodes = neighborhood_engine(G).k_hop(source, k, direction, top_n, rank_by, max_nodes)
+    return (nx.reverse_view(G) if reverse else G).subgraph(nodes)
@@ -0,0 +1,232 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gzip
+import logging
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pronto
+
+from .artifacts import file_digest, load_artifact, save_artifact
+
+log = logging.getLogger(__name__)
+
+# Bumped whenever the records produced by the parser change, to invalidate cached records
+OBO_PARSER_VERSION = "1"
+
+_ESCAPES = {"n": "\n", "t": "\t", "W": " "}
+
+
+def _parse_quoted(value: str) -> Tuple[str, str]:
+    """
+    Splits a value starting with an OBO quoted string into the unescaped string and the rest of the value.
+
+    Args:
+        value (str): The tag value, e.g. `"A definition." [GOC:x]`.
+
+    Returns:
+        Tuple of the unescaped string and the remainder after the closing quote.
+    """
+    chars = []
+    i = 1
+    while i < len(value):
+        char = value[i]
+        if char == "\\" and i + 1 < len(value):
+            chars.append(_ESCAPES.get(value[i + 1], value[i + 1]))
+            i += 2
+            continue
+        if char == '"':
+            return "".join(chars), value[i + 1 :]
+        chars.append(char)
+        i += 1
+    raise ValueError(f"Unterminated quoted string in {value}")
+
+
+def _strip_comment(value: str) -> str:
+    """
+    Removes trailing `! comments` and `{modifiers}` from an unquoted tag value.
+
+    Args:
+        value (str): The tag value.
+
+    Returns:
+        The bare value.
+    """
+    for marker in (" !", "{"):
+        position = value.find(marker)
+        if position >= 0:
+            value = value[:position]
+    return value.strip()
+
+
+def iter_obo_stanzas(file_path: str) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Streams the stanzas of an OBO file, plain or gzipped.
+
+    Args:
+        file_path (str): Path to the OBO file.
+
+    Returns:
+        Iterator over (stanza type, list of (tag, value) pairs) tuples, e.g. ("Term", [("id", "GO:0000001"), ...]).
+        The header frame is skipped.
+    """
+    opener = gzip.open if file_path.endswith(".gz") else open
+    stanza: Optional[str] = None
+    tags: List[Tuple[str, str]] = []
+    with opener(file_path, "rt", encoding="utf-8") as f:  # type: ignore
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("!"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                if stanza is not None:
+                    yield stanza, tags
+                stanza, tags = line[1:-1], []
+                continue
+            if stanza is None:
+                continue
+            tag, _, value = line.partition(":")
+            tags.append((tag.strip(), value.strip()))
+    if stanza is not None:
+        yield stanza, tags
+
+
+def parse_obo_term(tags: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Parses the tags of a `[Term]` stanza.
+
+    Args:
+        tags (List[Tuple[str, str]]): The (tag, value) pairs of the stanza.
+
+    Returns:
+        Dictionary with the term `id`, `name`, `definition`, `synonyms`, `xrefs`, `is_a` parents and
+        `relationships` as (relationship, target) pairs.
+    """
+    term: Dict[str, Any] = {
+        "id": None,
+        "name": None,
+        "definition": None,
+        "synonyms": [],
+        "xrefs": [],
+        "is_a": [],
+        "relationships": [],
+    }
+    for tag, value in tags:
+        if tag == "id":
+            term["id"] = _strip_comment(value)
+        elif tag == "name":
+            term["name"] = value
+        elif tag == "def":
+            term["definition"] = _parse_quoted(value)[0]
+        elif tag == "synonym":
+            term["synonyms"].append(_parse_quoted(value)[0])
+        elif tag == "xref":
+            term["xrefs"].append(value.split()[0])
+        elif tag == "is_a":
+            term["is_a"].append(_strip_comment(value))
+        elif tag == "relationship":
+            relationship, target = _strip_comment(value).split()[:2]
+            term["relationships"].append((relationship, target))
+    return term
+
+
+def read_obo_records(file_path: str, prefix: str) -> Dict[str, List[Any]]:
+    """
+    Reads the terms of an OBO file into the records consumed by the ontology processors.
+
+    Args:
+        file_path (str): Path to the OBO file.
+        prefix (str): Only terms and edge targets with ids starting with this prefix are kept, e.g. "GO:".
+
+    Returns:
+        Dictionary with `terms`, a list of (id, name, definition, synonyms, xrefs) tuples, and `edges`, a list of
+        (term, related term, type) tuples with `is_a` edges to the direct parents.
+    """
+    log.info(f"Parsing OBO file {file_path}")
+
+    terms = []
+    edges = []
+    for stanza, tags in iter_obo_stanzas(file_path):
+        if stanza != "Term":
+            continue
+        try:
+            term = parse_obo_term(tags)
+        except Exception as e:
+            log.error(f"Error parsing term {tags}: {e}")
+            raise ValueError(f"Error parsing term {tags}: {e}")
+        if not term["id"] or not term["id"].startswith(prefix):
+            continue
+        terms.append((term["id"], term["name"], term["definition"], term["synonyms"], term["xrefs"]))
+        edges.extend((term["id"], parent, "is_a") for parent in term["is_a"] if parent.startswith(prefix))
+        edges.extend(
+            (term["id"], target, relationship)
+            for relationship, target in term["relationships"]
+            if target.startswith(prefix)
+        )
+    return {"terms": terms, "edges": edges}
+
+
+def load_ontology_records(
+    file_path: str,
+    prefix: str,
+    extract: Callable[[str], Dict[str, List[Any]]],
+    records_version: str,
+    cache_dir: Optional[str] = None,
+    parser: str = "auto",
+) -> Dict[str, List[Any]]:
+    """
+    Parses an ontology file once and returns its records, optionally through a persistent cache.
+
+    OBO files are read with `read_obo_records`, other formats such as OWL fall back to `extract`, the pronto
+    based extraction of the ontology package. Cached records are keyed by the SHA-256 of the ontology file, the
+    parser version and `records_version`, so a changed file, parser or extraction is never served stale records.
+
+    Args:
+        file_path (str): Path to the ontology file.
+        prefix (str): Id prefix of the ontology, e.g. "GO:".
+        extract (Callable[[str], Dict[str, List[Any]]]): Reads the records of a file with pronto.
+        records_version (str): Version of the extracted records, bumped by the ontology package when they change.
+        cache_dir (Optional[str]): Directory of the records cache (default is None, no caching).
+        parser (str): "obo", "pronto", or "auto" to pick by file extension (default is "auto").
+
+    Returns:
+        The records, as returned by `read_obo_records`.
+    """
+    if parser == "auto":
+        parser = "obo" if file_path.endswith((".obo", ".obo.gz")) else "pronto"
+    if parser not in ("obo", "pronto"):
+        raise ValueError(f"Unknown ontology parser {parser}")
+    version = OBO_PARSER_VERSION if parser == "obo" else pronto.__version__
+
+    cache_file = None
+    if cache_dir:
+        digest = file_digest(file_path)
+        cache_file = os.path.join(
+            cache_dir, f"{os.path.basename(file_path)}.{digest[:16]}.{parser}-{version}.v{records_version}.records"
+        )
+        if os.path.exists(cache_file):
+            return load_artifact(cache_file)
+
+    if parser == "obo":
+        records = read_obo_records(file_path, prefix=prefix)
+    else:
+        log.info(f"Parsing ontology file {file_path}")
+        records = extract(file_path)
+
+    if cache_file:
+        save_artifact(records, cache_file)
+    return records
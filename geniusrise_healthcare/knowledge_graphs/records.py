@@ -0,0 +1,180 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import logging
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+log = logging.getLogger(__name__)
+
+
+def iter_xml_records(file_path: str, tag: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[ET.Element, int, int]]:
+    """
+    Streams the top-level records with the given tag from an XML file along with their byte ranges.
+
+    Records are built one at a time with an expat parser, whose byte index gives the exact position of each
+    record in the file, so that it can later be re-read on its own with `XMLRecordStore`. A record ends at the `>`
+    closing its end tag, which may hold whitespace (`</drug >`) and a non-ASCII name.
+
+    Args:
+        file_path (str): Path to the XML file.
+        tag (str): The tag of the records, e.g. "drug" or "DescriptorRecord".
+        chunk_size (int): Number of bytes fed to the parser at a time (default is 1 MiB).
+
+    Returns:
+        Iterator over (element, offset, length) tuples.
+    """
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    ready: List[Tuple[ET.Element, int, int]] = []
+    # The bytes fed since the start of the open record, or of the last top-level element, with their file offset, to
+    # find end tags in. Expat may report a token a few chunks after it was fed, but never before an earlier event
+    state: Dict[str, Any] = {"depth": 0, "builder": None, "offset": 0, "position": 0, "window": b"", "window_start": 0}
+
+    def on_start(name: str, attrs: Dict[str, str]) -> None:
+        state["depth"] += 1
+        if state["depth"] == 2 and name == tag:
+            state["builder"] = ET.TreeBuilder()
+            state["offset"] = parser.CurrentByteIndex
+        if state["builder"] is not None:
+            state["builder"].start(name, attrs)
+
+    def on_end(name: str) -> None:
+        builder = state["builder"]
+        if builder is not None:
+            builder.end(name)
+        if state["depth"] == 2:
+            index = parser.CurrentByteIndex
+            state["position"] = index
+            if builder is not None:
+                element = builder.close()
+                window, i = state["window"], index - state["window_start"]
+                if len(element) == 0 and element.text is None and window[i - 2 : i] == b"/>":
+                    # An empty element tag, whose end is reported after it
+                    end = index
+                else:
+                    end = index + window.index(b">", i) - i + 1
+                ready.append((element, state["offset"], end - state["offset"]))
+                state["builder"] = None
+        state["depth"] -= 1
+
+    def on_data(data: str) -> None:
+        if state["builder"] is not None:
+            state["builder"].data(data)
+
+    parser.StartElementHandler = on_start
+    parser.EndElementHandler = on_end
+    parser.CharacterDataHandler = on_data
+
+    try:
+        with open(file_path, "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                state["window"] += chunk
+                parser.Parse(chunk, not chunk)
+                start = state["offset"] if state["builder"] is not None else state["position"]
+                start = max(start, state["window_start"])
+                state["window"] = state["window"][start - state["window_start"] :]
+                state["window_start"] = start
+                yield from ready
+                ready.clear()
+                if not chunk:
+                    break
+    except expat.ExpatError as e:
+        log.error(f"Error reading XML file {file_path}: {e}")
+        raise ValueError(f"Error reading XML file {file_path}: {e}")
+
+
+class XMLRecordStore:
+    """
+    Byte-offset index over the records of an XML file.
+
+    Only the offset and length of each record are kept in memory. `get_record` seeks to a record, parses just
+    that record and converts it with `parse_record`, keeping the most recently used results in an LRU cache.
+    The store pickles without its cache, so it can be saved along with the graph it belongs to.
+    """
+
+    def __init__(
+        self, file_path: str, parse_record: Callable[[ET.Element], Dict[str, Any]], cache_size: int = 1024
+    ) -> None:
+        """
+        Args:
+            file_path (str): Path to the XML file.
+            parse_record (Callable[[ET.Element], Dict[str, Any]]): Converts a record element into a dictionary.
+                Must be a module level function for the store to be picklable.
+            cache_size (int): Number of parsed records kept in the LRU cache (default is 1024).
+        """
+        self.file_path = file_path
+        self.parse_record = parse_record
+        self.cache_size = cache_size
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self._get = lru_cache(maxsize=cache_size)(self._read_record)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self.offsets
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_get"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._get = lru_cache(maxsize=self.cache_size)(self._read_record)
+
+    def add(self, record_id: str, offset: int, length: int) -> None:
+        """
+        Records the byte range of a record.
+
+        Args:
+            record_id (str): The record id.
+            offset (int): Byte offset of the record in the file.
+            length (int): Length of the record in bytes.
+
+        Returns:
+            None
+        """
+        self.offsets[record_id] = (offset, length)
+
+    def _read_record(self, record_id: str) -> Dict[str, Any]:
+        offset, length = self.offsets[record_id]
+        try:
+            with open(self.file_path, "rb") as f:
+                f.seek(offset)
+                element = ET.fromstring(f.read(length))
+        except Exception as e:
+            log.error(f"Error reading record {record_id} from {self.file_path}: {e}")
+            raise ValueError(f"Error reading record {record_id} from {self.file_path}: {e}")
+        return self.parse_record(element)
+
+    def get_record(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Reads and parses a single record.
+
+        Args:
+            record_id (str): The record id.
+
+        Returns:
+            The parsed record, or None if the id is not in the store.
+        """
+        if record_id not in self.offsets:
+            return None
+        return self._get(record_id)
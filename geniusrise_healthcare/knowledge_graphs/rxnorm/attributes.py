@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ def process_attributes_file(attributes_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading attributes from {attributes_file}")
 
     rows = read_rrf_file(attributes_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             rxcui, lui, sui, rxaui, stype, code, atui, satui, atn, sab, atv, suppress, cvf = (
                 row[0],
@@ -71,6 +71,8 @@ def process_attributes_file(attributes_file: str, G: nx.DiGraph) -> None:
                         "cvf": cvf,
                     }
                 )
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing attribute {row}: {e}")
             raise ValueError(f"Error processing attribute {row}: {e}")
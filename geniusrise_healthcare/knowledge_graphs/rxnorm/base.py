@@ -22,10 +22,12 @@ from .relationships import process_relationships_file
 from .attributes import process_attributes_file
 from .sources import process_sources_file
 from .semantic_types import process_semantic_types_file
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
+@instrumented("rxnorm")
 def load_rxnorm(G: nx.DiGraph, rxnorm_path: str) -> Tuple[nx.DiGraph, Dict[str, Dict]]:
     """
     Loads RxNorm data into a NetworkX graph.
@@ -46,11 +48,15 @@ def load_rxnorm(G: nx.DiGraph, rxnorm_path: str) -> Tuple[nx.DiGraph, Dict[str,
     semantic_types_file = os.path.join(rxnorm_path, "RXNSTY.RRF")
     os.path.join(rxnorm_path, "RXNSAB.RRF")
 
-    process_concepts_file(concepts_file, G)
-    process_relationships_file(relationships_file, G)
-    process_attributes_file(attributes_file, G)
+    with stage("rxnorm.concepts", G, concepts_file):
+        process_concepts_file(concepts_file, G)
+    with stage("rxnorm.relationships", G, relationships_file):
+        process_relationships_file(relationships_file, G)
+    with stage("rxnorm.attributes", G, attributes_file):
+        process_attributes_file(attributes_file, G)
     # process_sources_file(sources_file, source_to_info)
-    process_semantic_types_file(semantic_types_file, G)
+    with stage("rxnorm.semantic_types", G, semantic_types_file):
+        process_semantic_types_file(semantic_types_file, G)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
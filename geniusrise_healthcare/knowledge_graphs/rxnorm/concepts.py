@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +36,7 @@ def process_concepts_file(concepts_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading concepts from {concepts_file}")
 
     rows = read_rrf_file(concepts_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             rxcui, rxaui, tty, sab, code, language, term, source = (
                 row[0],
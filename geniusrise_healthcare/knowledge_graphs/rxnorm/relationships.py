@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ def process_relationships_file(relationships_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading relationships from {relationships_file}")
 
     rows = read_rrf_file(relationships_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             rxcui1, rxaui1, stype1, rel, rxcui2, rxaui2, stype2, rela, rui, sab, suppress = (
                 row[0],
@@ -64,6 +64,8 @@ def process_relationships_file(relationships_file: str, G: nx.DiGraph) -> None:
                     sab=sab,
                     suppress=suppress,
                 )
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing relationship {row}: {e}")
             raise ValueError(f"Error processing relationship {row}: {e}")
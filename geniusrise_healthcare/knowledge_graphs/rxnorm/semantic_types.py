@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ def process_semantic_types_file(semantic_types_file: str, G: nx.DiGraph) -> None
     log.info(f"Loading semantic types from {semantic_types_file}")
 
     rows = read_rrf_file(semantic_types_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             rxcui, tui, stn, sty, atui, cvf = row[0], row[1], row[2], row[3], row[4], row[5]
             if rxcui in G:
@@ -50,6 +50,8 @@ def process_semantic_types_file(semantic_types_file: str, G: nx.DiGraph) -> None
                         "cvf": cvf,
                     }
                 )
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing semantic type {row}: {e}")
             raise ValueError(f"Error processing semantic type {row}: {e}")
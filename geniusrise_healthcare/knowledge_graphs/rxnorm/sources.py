@@ -15,8 +15,8 @@
 
 import logging
 from typing import Dict
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
@@ -35,7 +35,7 @@ def process_sources_file(sources_file: str, source_to_info: Dict[str, Dict]) ->
     log.info(f"Loading sources from {sources_file}")
 
     rows = read_rrf_file(sources_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             vcui, rcui, vsab, sver, rsab, son, sf, sver_date, scit, tcit = (
                 row[0],
@@ -0,0 +1,273 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Set
+
+import networkx as nx
+import numpy as np
+
+from .artifacts import save_artifact
+from .closure import ClosureIndex
+from .csr import EDGE_TYPE_KEYS
+from .memory import node_namespace
+from .snapshot import save_snapshot
+
+log = logging.getLogger(__name__)
+
+try:
+    import faiss
+
+    HAS_FAISS = True
+except ImportError:  # pragma: no cover
+    faiss = None
+    HAS_FAISS = False
+
+# Hierarchy relationships, pointing from child to parent: SNOMED is-a, OBO is_a and UMLS semantic network isa
+HIERARCHY_TYPES = frozenset({"116680003", "is_a", "isa"})
+
+# UMLS and RxNorm relationship edges go from CUI1 to CUI2, and their `rela` is the relation of CUI2 to CUI1. Edges
+# pointing from child to parent are the PAR rows, with rela inverse_isa, while rela isa (CHD rows) points to a child
+HIERARCHY_RELAS = frozenset({"inverse_isa"})
+
+
+def _edge_type(data: Dict[str, Any], keys: Sequence[str] = EDGE_TYPE_KEYS) -> Any:
+    for key in keys:
+        if key in data:
+            return data[key]
+    return None
+
+
+def _is_hierarchy(data: Dict[str, Any], spec: "SliceSpec") -> bool:
+    # UMLS and RxNorm edges are typed by their broad `rel` (PAR, RB, ...) and carry the hierarchy in `rela`
+    return _edge_type(data) in spec.hierarchy_types or data.get("rela") in spec.hierarchy_relas
+
+
+class SliceSpec:
+    """
+    Selects the part of the knowledge graph a deployment needs. A node is selected when it passes every filter set,
+    and a slice holds the selected nodes, their ancestors and the edges between them.
+    """
+
+    def __init__(
+        self,
+        tags: Optional[Iterable[str]] = None,
+        roots: Optional[Iterable[Hashable]] = None,
+        relationship_types: Optional[Iterable[str]] = None,
+        sources: Optional[Iterable[str]] = None,
+        hierarchy_types: Iterable[str] = HIERARCHY_TYPES,
+        hierarchy_relas: Iterable[str] = HIERARCHY_RELAS,
+        ancestors: bool = True,
+    ) -> None:
+        """
+        Args:
+            tags (Optional[Iterable[str]]): SNOMED semantic tags to select, from `SEMANTIC_TAGS`, e.g. "finding" and
+                "disorder".
+            roots (Optional[Iterable[Hashable]]): Select only these nodes and their descendants in the hierarchy,
+                e.g. 404684003 for clinical findings.
+            relationship_types (Optional[Iterable[str]]): Edge types kept besides the hierarchy (default is all).
+            sources (Optional[Iterable[str]]): Node namespaces to select, as given by `memory.node_namespace`,
+                e.g. "int" for SNOMED ids or the source names of a graph with dense ids.
+            hierarchy_types (Iterable[str]): Edge types forming the child to parent hierarchy (default is
+                `HIERARCHY_TYPES`).
+            hierarchy_relas (Iterable[str]): UMLS and RxNorm `rela` values of the edges pointing from child to parent
+                (default is `HIERARCHY_RELAS`).
+            ancestors (bool): Close the slice under ancestors, so hierarchy walks never leave it (default is True).
+        """
+        self.tags = frozenset(tags) if tags is not None else None
+        self.roots = list(roots) if roots is not None else None
+        self.relationship_types = frozenset(relationship_types) if relationship_types is not None else None
+        self.sources = frozenset(sources) if sources is not None else None
+        self.hierarchy_types = frozenset(hierarchy_types)
+        self.hierarchy_relas = frozenset(hierarchy_relas)
+        self.ancestors = ancestors
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        The spec as JSON serializable metadata.
+        """
+        return {
+            "tags": sorted(self.tags) if self.tags is not None else None,
+            "roots": [str(root) for root in self.roots] if self.roots is not None else None,
+            "relationship_types": sorted(self.relationship_types) if self.relationship_types is not None else None,
+            "sources": sorted(self.sources) if self.sources is not None else None,
+            "hierarchy_types": sorted(self.hierarchy_types),
+            "hierarchy_relas": sorted(self.hierarchy_relas),
+            "ancestors": self.ancestors,
+        }
+
+
+def _walk(G: nx.DiGraph, start: Iterable[Hashable], spec: SliceSpec, up: bool) -> Set[Hashable]:
+    """
+    Nodes reachable from the start nodes through hierarchy edges, towards parents when `up`, else children.
+    """
+    adjacency = G._succ if up else G._pred  # type: ignore
+    seen = {node for node in start if node in G}
+    queue = deque(seen)
+    while queue:
+        node = queue.popleft()
+        for neighbor, data in adjacency[node].items():
+            if neighbor not in seen and _is_hierarchy(data, spec):
+                seen.add(neighbor)
+                queue.append(neighbor)
+    return seen
+
+
+def select_nodes(G: nx.DiGraph, spec: SliceSpec) -> Set[Hashable]:
+    """
+    Selects the nodes of a slice.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        spec (SliceSpec): The slice.
+
+    Returns:
+        Set[Hashable]: The selected nodes and, unless disabled, all their ancestors.
+    """
+    candidates: Iterable[Hashable] = _walk(G, spec.roots, spec, up=False) if spec.roots is not None else G
+    namespace = node_namespace(G)
+    selected = {
+        node
+        for node in candidates
+        if (spec.tags is None or G._node[node].get("tag") in spec.tags)  # type: ignore
+        and (spec.sources is None or namespace(node) in spec.sources)
+    }
+    if spec.ancestors:
+        selected = _walk(G, selected, spec, up=True)
+    log.info(f"Selected {len(selected)} of {G.number_of_nodes()} nodes")
+    return selected
+
+
+def extract_slice(G: nx.DiGraph, spec: SliceSpec, nodes: Optional[Set[Hashable]] = None) -> nx.DiGraph:
+    """
+    Extracts a slice as a new graph, independent of the full graph so that the full graph can be freed. Node and
+    edge attribute dicts are copied shallowly, their values are shared.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        spec (SliceSpec): The slice.
+        nodes (Optional[Set[Hashable]]): The selected nodes, if already computed with `select_nodes`.
+
+    Returns:
+        nx.DiGraph: The slice.
+    """
+    if nodes is None:
+        nodes = select_nodes(G, spec)
+    H = nx.DiGraph()
+    H.add_nodes_from((node, dict(data)) for node, data in G.nodes(data=True) if node in nodes)
+    kept_types = spec.relationship_types
+    H.add_edges_from(
+        (u, v, dict(data))
+        for u in H
+        for v, data in G._succ[u].items()  # type: ignore
+        if v in nodes and (kept_types is None or _edge_type(data) in kept_types or _is_hierarchy(data, spec))
+    )
+    H.graph["slice"] = spec.as_dict()
+    log.info(f"Extracted slice of {H.number_of_nodes()} nodes and {H.number_of_edges()} edges")
+    return H
+
+
+def slice_mapping(mapping: Dict[Any, Any], nodes: Set[Hashable], by_value: bool = False) -> Dict[Any, Any]:
+    """
+    Keeps the entries of a concept dictionary belonging to the slice, e.g. `concept_id_to_concept` by key or
+    `description_id_to_concept` by value. Ids are compared as strings, the dictionaries key SNOMED ids as strings
+    while the graph uses integers.
+
+    Args:
+        mapping (Dict[Any, Any]): The dictionary.
+        nodes (Set[Hashable]): The nodes of the slice.
+        by_value (bool): Match the values against the nodes instead of the keys (default is False).
+
+    Returns:
+        Dict[Any, Any]: The entries of the slice.
+    """
+    names = {str(node) for node in nodes}
+    if by_value:
+        return {key: value for key, value in mapping.items() if str(value) in names}
+    return {key: value for key, value in mapping.items() if str(key) in names}
+
+
+def slice_faiss_index(index: Any, ids: Iterable[Any]) -> Any:
+    """
+    Copies a FAISS `IndexIDMap` keeping only the vectors with the given ids.
+
+    Args:
+        index (faiss.IndexIDMap): The index.
+        ids (Iterable[Any]): Ids of the vectors to keep, e.g. the description ids of the slice.
+
+    Returns:
+        faiss.IndexIDMap: The sliced index.
+    """
+    if not HAS_FAISS:
+        raise ImportError("Slicing FAISS indexes requires faiss, install faiss-cpu or faiss-gpu")
+    existing = faiss.vector_to_array(index.id_map)
+    keep = np.fromiter((int(i) for i in ids), dtype=np.int64)
+    sliced = faiss.clone_index(index)
+    sliced.remove_ids(existing[~np.isin(existing, keep)])
+    log.info(f"Kept {sliced.ntotal} of {index.ntotal} vectors")
+    return sliced
+
+
+def write_slice(
+    G: nx.DiGraph,
+    spec: SliceSpec,
+    directory: str,
+    concept_dicts: Optional[Dict[str, Dict[Any, Any]]] = None,
+    faiss_index: Any = None,
+    faiss_id_to_node: Optional[Dict[Any, Any]] = None,
+    closures: Optional[Dict[str, ClosureIndex]] = None,
+) -> nx.DiGraph:
+    """
+    Extracts a slice and writes it with its accompanying indexes to a directory: the graph as `graph.snapshot`
+    (see `snapshot.save_snapshot`), each concept dictionary and closure as a pickled artifact and the FAISS index as
+    `faiss.index`.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        spec (SliceSpec): The slice.
+        directory (str): Output directory.
+        concept_dicts (Optional[Dict[str, Dict[Any, Any]]]): Concept dictionaries by name. Dictionaries whose name
+            starts with "description_id" are matched by value, the others by key.
+        faiss_index (Any): FAISS `IndexIDMap` to slice.
+        faiss_id_to_node (Optional[Dict[Any, Any]]): Maps FAISS ids to nodes, typically `description_id_to_concept`.
+            Required with `faiss_index`.
+        closures (Optional[Dict[str, ClosureIndex]]): Closure indexes by name, restricted to the slice.
+
+    Returns:
+        nx.DiGraph: The slice.
+    """
+    os.makedirs(directory, exist_ok=True)
+    nodes = select_nodes(G, spec)
+    H = extract_slice(G, spec, nodes)
+    save_snapshot(H, os.path.join(directory, "graph.snapshot"), metadata={"slice": spec.as_dict()})
+
+    for name, mapping in (concept_dicts or {}).items():
+        sliced = slice_mapping(mapping, nodes, by_value=name.startswith("description_id"))
+        save_artifact(sliced, os.path.join(directory, f"{name}.pickle"))
+        log.info(f"Kept {len(sliced)} of {len(mapping)} entries of {name}")
+
+    if faiss_index is not None:
+        if faiss_id_to_node is None:
+            raise ValueError("faiss_id_to_node is required to slice a FAISS index")
+        ids = slice_mapping(faiss_id_to_node, nodes, by_value=True).keys()
+        faiss.write_index(slice_faiss_index(faiss_index, ids), os.path.join(directory, "faiss.index"))
+
+    for name, closure in (closures or {}).items():
+        save_artifact(closure.restrict(nodes), os.path.join(directory, f"{name}.closure"))
+
+    log.info(f"Wrote slice of {H.number_of_nodes()} nodes and {H.number_of_edges()} edges to {directory}")
+    return H
@@ -0,0 +1,566 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from .csr import EDGE_TYPE_KEYS, CSRGraph
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"GRSNAP\x00\x00"
+SNAPSHOT_VERSION = 2
+ALIGNMENT = 64
+
+# Kinds of node ids in the typed id table of graphs whose ids are not all integers
+_STR_ID, _INT_ID, _PICKLED_ID = 0, 1, 2
+
+# Edge type key code of edges whose relationship is not restored from the relationship codes
+_NO_TYPE_KEY = 255
+
+# Magic, format version and header length
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _jsonable(value: Any) -> Any:
+    return value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+
+
+def _same(decoded: Any, value: Any) -> bool:
+    # Whether a value comes back unchanged from its JSON header encoding, e.g. not a tuple or NumPy scalar
+    return type(decoded) is type(value) and decoded == value
+
+
+def _encode_ids(nodes: List[Any]) -> Tuple[np.ndarray, "StringColumn"]:
+    """
+    Encodes node ids of mixed types: strings as UTF-8, integers as decimal digits, anything else pickled.
+
+    Returns:
+        The kind of every id and the encoded ids.
+    """
+    kinds = np.empty(len(nodes), dtype=np.uint8)
+    encoded = []
+    for i, node in enumerate(nodes):
+        if type(node) is str:
+            kinds[i] = _STR_ID
+            encoded.append(node.encode("utf-8"))
+        elif type(node) is int:
+            kinds[i] = _INT_ID
+            encoded.append(str(node).encode("ascii"))
+        else:
+            kinds[i] = _PICKLED_ID
+            encoded.append(pickle.dumps(node, protocol=pickle.HIGHEST_PROTOCOL))
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return kinds, StringColumn(offsets, b"".join(encoded))
+
+
+def _decode_ids(kinds: np.ndarray, column: "StringColumn") -> List[Any]:
+    if not kinds.any():
+        return column.tolist()
+    blob = bytes(column.blob)
+    offsets = column.offsets.tolist()
+    nodes: List[Any] = []
+    for i, kind in enumerate(kinds.tolist()):
+        value = blob[offsets[i] : offsets[i + 1]]
+        if kind == _STR_ID:
+            nodes.append(value.decode("utf-8"))
+        elif kind == _INT_ID:
+            nodes.append(int(value))
+        else:
+            nodes.append(pickle.loads(value))
+    return nodes
+
+
+def is_snapshot(file_path: str) -> bool:
+    """
+    Returns whether a file is a graph snapshot, as opposed to e.g. a legacy pickle.
+    """
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class StringColumn:
+    """
+    Strings stored as UTF-8 in one blob with int64 offsets, decoded one at a time on access.
+    """
+
+    def __init__(self, offsets: np.ndarray, blob: Union[np.ndarray, memoryview, bytes]) -> None:
+        self.offsets = offsets
+        self.blob = memoryview(blob).cast("B") if not isinstance(blob, bytes) else memoryview(blob)
+
+    @classmethod
+    def encode(cls, values: Iterable[Optional[str]]) -> "StringColumn":
+        """
+        Encodes strings into a column, None is stored as the empty string.
+        """
+        encoded = [b"" if value is None else str(value).encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(offsets, b"".join(encoded))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return bytes(self.blob[self.offsets[i] : self.offsets[i + 1]]).decode("utf-8")
+
+    def tolist(self) -> List[str]:
+        blob = bytes(self.blob)
+        offsets = self.offsets.tolist()
+        return [blob[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(len(self))]
+
+
+class _Writer:
+    """
+    Collects the sections of a snapshot and writes them after the header, each aligned to 64 bytes.
+    """
+
+    def __init__(self) -> None:
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.buffers: List[Tuple[int, bytes]] = []
+        self.size = 0
+
+    def add(self, name: str, array: np.ndarray) -> None:
+        array = np.ascontiguousarray(array)
+        offset = _aligned(self.size)
+        self.sections[name] = {"offset": offset, "dtype": array.dtype.str, "count": int(array.size)}
+        self.buffers.append((offset, array.tobytes()))
+        self.size = offset + array.nbytes
+
+    def add_strings(self, name: str, column: StringColumn) -> None:
+        self.add(f"{name}.offsets", column.offsets)
+        self.add(f"{name}.blob", np.frombuffer(bytes(column.blob), dtype=np.uint8))
+
+    def add_pickle(self, name: str, obj: Any) -> None:
+        self.add(name, np.frombuffer(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8))
+
+    def write(self, file_path: str, header: Dict[str, Any]) -> None:
+        header = dict(header, sections=self.sections)
+        encoded = json.dumps(header).encode("utf-8")
+        data_start = _aligned(_PREAMBLE.size + len(encoded))
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, len(encoded)))
+                f.write(encoded)
+                for offset, buffer in self.buffers:
+                    f.seek(data_start + offset)
+                    f.write(buffer)
+                f.truncate(data_start + self.size)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+
+def _remaining_node_attributes(
+    G: nx.DiGraph, graph: CSRGraph, categories: Dict[str, List[Any]], strings: Dict[str, List[Optional[str]]]
+) -> Dict[str, Tuple[np.ndarray, List[Any]]]:
+    """
+    Collects the node attributes that the categorical and string columns do not bring back unchanged: lists,
+    dicts, numbers too diverse to be categorical, empty strings, None values and the like.
+
+    Returns:
+        Attribute name to the positions of the nodes holding it and their values.
+    """
+    codes = {key: graph.columns[key][0].tolist() for key in categories}
+    remaining: Dict[str, Tuple[List[int], List[Any]]] = {}
+    for i, (_, data) in enumerate(G.nodes(data=True)):
+        for key, value in data.items():
+            if key in codes:
+                code = codes[key][i]
+                if code >= 0 and _same(categories[key][code], value):
+                    continue
+            elif key in strings:
+                if type(value) is str and value and strings[key][i] == value:
+                    continue
+            positions, values = remaining.setdefault(key, ([], []))
+            positions.append(i)
+            values.append(value)
+    return {key: (np.array(positions, dtype=np.int64), values) for key, (positions, values) in remaining.items()}
+
+
+def _edge_attributes(
+    G: nx.DiGraph, graph: CSRGraph, edge_type_names: List[Any]
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Tuple[np.ndarray, List[Any]]]]:
+    """
+    Collects what the relationship codes do not hold about the edges.
+
+    Returns:
+        The position in `EDGE_TYPE_KEYS` of the attribute holding the relationship of every out-edge
+        (`_NO_TYPE_KEY` if it is not restored from the codes), the out-edge position of every edge in the order of
+        `G.edges()`, and the remaining edge attributes as attribute name to out-edge positions and values.
+    """
+    position = {node: i for i, node in enumerate(G)}
+    sources = np.fromiter((position[u] for u, _ in G.edges()), dtype=np.int64, count=graph.number_of_edges())
+    targets = np.fromiter((position[v] for _, v in G.edges()), dtype=np.int64, count=graph.number_of_edges())
+    # Out-edges are sorted by source then target, as in `CSRGraph.from_arrays`
+    order = np.empty(len(sources), dtype=np.int64)
+    order[np.lexsort((targets, sources))] = np.arange(len(sources))
+
+    type_keys = np.full(len(sources), _NO_TYPE_KEY, dtype=np.uint8)
+    edge_types = graph.edge_types.tolist()
+    remaining: Dict[str, Tuple[List[int], List[Any]]] = {}
+    for k, (_, _, data) in zip(order.tolist(), G.edges(data=True)):
+        type_key = next((key for key in EDGE_TYPE_KEYS if key in data), None)
+        for key, value in data.items():
+            if key == type_key and _same(edge_type_names[edge_types[k]], value):
+                type_keys[k] = EDGE_TYPE_KEYS.index(key)
+                continue
+            positions, values = remaining.setdefault(key, ([], []))
+            positions.append(k)
+            values.append(value)
+    return (
+        type_keys,
+        order,
+        {key: (np.array(positions, dtype=np.int64), values) for key, (positions, values) in remaining.items()},
+    )
+
+
+def save_snapshot(
+    G: Union[nx.DiGraph, CSRGraph],
+    file_path: str,
+    string_columns: Optional[Dict[str, List[Optional[str]]]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Writes a graph snapshot.
+
+    The snapshot holds the node ids, the CSR out- and in-adjacency with relationship codes, the categorical node
+    columns and, as string blobs, free text node attributes such as names. When given a NetworkX graph, every string
+    attribute too diverse to be categorical is stored as a string column, and everything else the graph holds is
+    pickled per attribute: other node and edge attributes, the attribute each relationship came from, the edge
+    order and `G.graph`. `GraphSnapshot.to_networkx` then gives back the same graph. Node ids keep their types.
+
+    Args:
+        G (Union[nx.DiGraph, CSRGraph]): The graph.
+        file_path (str): The snapshot file.
+        string_columns (Optional[Dict[str, List[Optional[str]]]]): Attribute name to the value of every node, in
+            node order. Overrides the string columns taken from a NetworkX graph.
+        metadata (Optional[Dict[str, Any]]): JSON serializable metadata kept in the header.
+
+    Returns:
+        None
+    """
+    columns = dict(string_columns or {})
+    if isinstance(G, nx.DiGraph):
+        graph = CSRGraph.from_networkx(G)
+        if string_columns is None:
+            candidates: Dict[str, bool] = {}
+            for _, data in G.nodes(data=True):
+                for key, value in data.items():
+                    if key not in graph.columns:
+                        candidates[key] = candidates.get(key, True) and (value is None or isinstance(value, str))
+            for key in (key for key, is_string in candidates.items() if is_string):
+                columns[key] = [data.get(key) for _, data in G.nodes(data=True)]
+    else:
+        graph = G
+
+    writer = _Writer()
+    if graph.integer_ids:
+        writer.add("nodes", graph.nodes.astype(np.int64))
+        writer.add("sorter", graph.sorter)
+    else:
+        kinds, ids = _encode_ids(graph.nodes.tolist())
+        writer.add("nodes.kinds", kinds)
+        writer.add_strings("nodes", ids)
+    writer.add("indptr", graph.indptr)
+    writer.add("indices", graph.indices)
+    writer.add("edge_types", graph.edge_types)
+    writer.add("in_indptr", graph.in_indptr)
+    writer.add("in_indices", graph.in_indices)
+    writer.add("in_edge_types", graph.in_edge_types)
+
+    categories = {}
+    for key, (codes, values) in graph.columns.items():
+        writer.add(f"column.{key}", codes)
+        categories[key] = [_jsonable(value) for value in values.tolist()]
+    for key, values in columns.items():
+        writer.add_strings(f"strings.{key}", StringColumn.encode(values))
+    edge_type_names = [_jsonable(name) for name in graph.edge_type_names]
+
+    node_attributes: Dict[str, Tuple[np.ndarray, List[Any]]] = {}
+    edge_attributes: Dict[str, Tuple[np.ndarray, List[Any]]] = {}
+    if isinstance(G, nx.DiGraph):
+        # Compare with the values as read back from the header, e.g. NumPy floats come back as floats
+        decoded = json.loads(json.dumps({"columns": categories, "edge_type_names": edge_type_names}))
+        node_attributes = _remaining_node_attributes(G, graph, decoded["columns"], columns)
+        type_keys, order, edge_attributes = _edge_attributes(G, graph, decoded["edge_type_names"])
+        writer.add("edge_type_keys", type_keys)
+        writer.add("edge_order", order)
+        writer.add_pickle("pickled.graph", G.graph)
+    for key, value in node_attributes.items():
+        writer.add_pickle(f"pickled.node.{key}", value)
+    for key, value in edge_attributes.items():
+        writer.add_pickle(f"pickled.edge.{key}", value)
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "number_of_nodes": graph.number_of_nodes(),
+        "number_of_edges": graph.number_of_edges(),
+        "integer_ids": graph.integer_ids,
+        "edge_type_names": edge_type_names,
+        "edge_type_keys": list(EDGE_TYPE_KEYS),
+        "columns": categories,
+        "string_columns": sorted(columns),
+        "node_attributes": sorted(node_attributes),
+        "edge_attributes": sorted(edge_attributes),
+        "metadata": metadata or {},
+    }
+    writer.write(file_path, header)
+    log.info(f"Saved snapshot of {graph.number_of_nodes()} nodes and {graph.number_of_edges()} edges to {file_path}")
+
+
+class GraphSnapshot:
+    """
+    A graph snapshot opened with `mmap`.
+
+    Opening reads only the header. Sections are mapped as NumPy arrays on first access and backed by the OS page
+    cache, so processes opening the same snapshot share its pages and only touched pages are read.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Args:
+            file_path (str): The snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot or has an unsupported version.
+        """
+        self.file_path = file_path
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.file_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.file_path} is not a graph snapshot")
+        if version > SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} in {self.file_path}")
+        self.header: Dict[str, Any] = json.loads(self._mmap[_PREAMBLE.size : _PREAMBLE.size + header_length])
+        self._data_start = _aligned(_PREAMBLE.size + header_length)
+        self._sections: Dict[str, np.ndarray] = {}
+        self._pickled: Dict[str, Any] = {}
+        self._graph: Optional[CSRGraph] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"file_path": self.file_path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.file_path = state["file_path"]
+        self._open()
+
+    @property
+    def version(self) -> int:
+        return self.header["version"]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self.header["metadata"]
+
+    def __len__(self) -> int:
+        return self.header["number_of_nodes"]
+
+    def section(self, name: str) -> np.ndarray:
+        """
+        Returns a section as a read-only array over the mapped file.
+        """
+        array = self._sections.get(name)
+        if array is None:
+            spec = self.header["sections"][name]
+            offset = self._data_start + spec["offset"]
+            array = np.frombuffer(self._mmap, dtype=np.dtype(spec["dtype"]), count=spec["count"], offset=offset)
+            self._sections[name] = array
+        return array
+
+    def pickled(self, name: str) -> Any:
+        """
+        Returns a pickled section, e.g. "node.synonyms", unpickled on first access.
+        """
+        if name not in self._pickled:
+            self._pickled[name] = pickle.loads(memoryview(self.section(f"pickled.{name}")))
+        return self._pickled[name]
+
+    def strings(self, name: str) -> StringColumn:
+        """
+        Returns a string column, e.g. "name", decoded lazily.
+        """
+        prefix = "nodes" if name == "nodes" else f"strings.{name}"
+        return StringColumn(self.section(f"{prefix}.offsets"), self.section(f"{prefix}.blob"))
+
+    @property
+    def nodes(self) -> np.ndarray:
+        """
+        Native node ids. String ids are decoded on first access.
+        """
+        if self.header["integer_ids"]:
+            return self.section("nodes")
+        nodes = np.empty(len(self), dtype=object)
+        if "nodes.kinds" in self.header["sections"]:
+            nodes[:] = _decode_ids(self.section("nodes.kinds"), self.strings("nodes"))
+        else:
+            nodes[:] = self.strings("nodes").tolist()
+        return nodes
+
+    @property
+    def graph(self) -> CSRGraph:
+        """
+        The CSR graph over the mapped sections, built on first access without copying the adjacency.
+        """
+        if self._graph is None:
+            columns = {}
+            for key, values in self.header["columns"].items():
+                categories = np.empty(len(values), dtype=object)
+                categories[:] = values
+                columns[key] = (self.section(f"column.{key}"), categories)
+            self._graph = CSRGraph(
+                self.nodes,
+                self.section("indptr"),
+                self.section("indices"),
+                self.section("edge_types"),
+                list(self.header["edge_type_names"]),
+                columns,
+                in_adjacency=(self.section("in_indptr"), self.section("in_indices"), self.section("in_edge_types")),
+                sorter=self.section("sorter") if self.header["integer_ids"] else None,
+            )
+        return self._graph
+
+    def node_attributes(self, node: Any) -> Dict[str, Any]:
+        """
+        Returns the attributes of a node.
+        """
+        graph = self.graph
+        i = graph.position(node)
+        if i < 0:
+            raise KeyError(f"Node {node} not found in the snapshot.")
+        attributes = {}
+        for key, (codes, categories) in graph.columns.items():
+            if codes[i] >= 0:
+                attributes[key] = categories[codes[i]]
+        for key in self.header["string_columns"]:
+            value = self.strings(key)[i]
+            if value:
+                attributes[key] = value
+        for key in self.header.get("node_attributes", []):
+            positions, values = self.pickled(f"node.{key}")
+            j = int(np.searchsorted(positions, i))
+            if j < len(positions) and positions[j] == i:
+                attributes[key] = values[j]
+        return attributes
+
+    def to_networkx(
+        self,
+        edge_type_key: str = "type",
+        node_keys: Optional[Iterable[str]] = None,
+        edge_keys: Optional[Iterable[str]] = None,
+    ) -> nx.DiGraph:
+        """
+        Materializes the snapshot as a NetworkX graph.
+
+        Snapshots of NetworkX graphs give back the saved graph, with its nodes, edges and attributes in their
+        original order. Snapshots of CSR graphs, and snapshots written before version 2, hold only the categorical
+        and string attributes, and relationships are set under `edge_type_key`.
+
+        Args:
+            edge_type_key (str): Key of the relationship of CSR and version 1 snapshots (default is "type").
+            node_keys (Optional[Iterable[str]]): Materialize only these node attributes, e.g. the hot ones of an
+                attribute store holding the others (default is all). The sections of the other attributes are not
+                read.
+            edge_keys (Optional[Iterable[str]]): Materialize only these edge attributes (default is all).
+
+        Returns:
+            nx.DiGraph: The graph.
+        """
+        if self.version < 2:
+            log.warning(f"{self.file_path} is a version {self.version} snapshot, only its column attributes are kept")
+        graph = self.graph
+        nodes = graph.nodes.tolist()
+        node_kept = (lambda key: True) if node_keys is None else frozenset(node_keys).__contains__
+        edge_kept = (lambda key: True) if edge_keys is None else frozenset(edge_keys).__contains__
+
+        node_data: List[Dict[str, Any]] = [{} for _ in nodes]
+        for key, (codes, categories) in graph.columns.items():
+            if not node_kept(key):
+                continue
+            values = categories.tolist()
+            for data, code in zip(node_data, codes.tolist()):
+                if code >= 0:
+                    data[key] = values[code]
+        for key in filter(node_kept, self.header["string_columns"]):
+            for data, value in zip(node_data, self.strings(key).tolist()):
+                if value:
+                    data[key] = value
+        for key in filter(node_kept, self.header.get("node_attributes", [])):
+            positions, values = self.pickled(f"node.{key}")
+            for i, value in zip(positions.tolist(), values):
+                node_data[i][key] = value
+
+        names = graph.edge_type_names
+        keys = self.header.get("edge_type_keys", [])
+        type_keys = self.section("edge_type_keys").tolist() if "edge_type_keys" in self.header["sections"] else None
+        edge_data: List[Dict[str, Any]] = []
+        for k, code in enumerate(graph.edge_types.tolist()):
+            data = {}
+            if type_keys is None:
+                if names[code] is not None and edge_kept(edge_type_key):
+                    data[edge_type_key] = names[code]
+            elif type_keys[k] != _NO_TYPE_KEY and edge_kept(keys[type_keys[k]]):
+                data[keys[type_keys[k]]] = names[code]
+            edge_data.append(data)
+        for key in filter(edge_kept, self.header.get("edge_attributes", [])):
+            positions, values = self.pickled(f"edge.{key}")
+            for k, value in zip(positions.tolist(), values):
+                edge_data[k][key] = value
+
+        sources, targets = graph.edge_sources().tolist(), graph.indices.tolist()
+        order = self.section("edge_order").tolist() if "edge_order" in self.header["sections"] else range(len(targets))
+        G = nx.DiGraph()
+        G.add_nodes_from(zip(nodes, node_data))
+        G.add_edges_from((nodes[sources[k]], nodes[targets[k]], edge_data[k]) for k in order)
+        if "pickled.graph" in self.header["sections"]:
+            G.graph.update(self.pickled("graph"))
+        G.graph.update(self.metadata)
+        return G
+
+
+def open_snapshot(file_path: str) -> GraphSnapshot:
+    """
+    Opens a graph snapshot.
+
+    Args:
+        file_path (str): The snapshot file.
+
+    Returns:
+        GraphSnapshot: The opened snapshot.
+    """
+    log.info(f"Opening graph snapshot {file_path}")
+    return GraphSnapshot(file_path)
@@ -24,10 +24,12 @@ from .refsets import process_refsets_file
 from .relationships import process_relationship_file
 from .stated_relationships import process_stated_relationship_file
 from .text_definitions import process_text_definition_file
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
+@instrumented("snomed")
 def load_snomed(
     G: nx.DiGraph,
     extract_path: str,
@@ -52,13 +54,19 @@ def load_snomed(
     text_definition_file = os.path.join(extract_path, f"sct2_TextDefinition_Snapshot-en_{version}.txt")
     refsets_file = os.path.join(extract_path, f"sct2_sRefset_OWLExpressionSnapshot_{version}.txt")
 
-    process_concept_file(concept_file=concept_file, G=G)
+    with stage("snomed.concepts", G, concept_file):
+        process_concept_file(concept_file=concept_file, G=G)
 
-    process_relationship_file(relationship_file, G=G)
-    process_concrete_values_file(concrete_values_file, G=G)
-    process_stated_relationship_file(stated_relationship_file, G=G)
-    process_text_definition_file(text_definition_file, G=G)
-    process_refsets_file(refsets_file, G=G)
+    with stage("snomed.relationships", G, relationship_file):
+        process_relationship_file(relationship_file, G=G)
+    with stage("snomed.concrete_values", G, concrete_values_file):
+        process_concrete_values_file(concrete_values_file, G=G)
+    with stage("snomed.stated_relationships", G, stated_relationship_file):
+        process_stated_relationship_file(stated_relationship_file, G=G)
+    with stage("snomed.text_definitions", G, text_definition_file):
+        process_text_definition_file(text_definition_file, G=G)
+    with stage("snomed.refsets", G, refsets_file):
+        process_refsets_file(refsets_file, G=G)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
     return G
@@ -20,9 +20,9 @@ from typing import List
 
 import networkx as nx
 import numpy as np
-from tqdm import tqdm
 
 from .util import extract_and_remove_semantic_tag
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -42,14 +42,11 @@ def process_concept_file(concept_file: str, G: nx.DiGraph) -> None:
 
     csv.field_size_limit(sys.maxsize)
 
-    with open(concept_file, "r", newline='') as f:
-        num_lines = sum(1 for _ in f)
-
     log.info(f"Loading concepts from {concept_file}")
     with open(concept_file, "r") as f:  # type: ignore
         reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)  # type: ignore
         next(reader)
-        for row in tqdm(reader, total=num_lines):
+        for row in track(reader):
             try:
                 (
                     description_id,
@@ -80,6 +77,8 @@ def process_concept_file(concept_file: str, G: nx.DiGraph) -> None:
                         definition_status=definition_status,
                         case_significance=case_significance,
                     )
+                else:
+                    skipped()
 
             except Exception as e:
                 log.error(f"Error processing node {row}: {e}")
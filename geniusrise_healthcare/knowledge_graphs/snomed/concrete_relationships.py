@@ -17,7 +17,7 @@ import csv
 import logging
 
 import networkx as nx
-from tqdm import tqdm
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -33,14 +33,11 @@ def process_concrete_values_file(concrete_values_file: str, G: nx.DiGraph) -> No
     Returns:
         None
     """
-    with open(concrete_values_file, "r", newline='') as f:
-        num_lines = sum(1 for _ in f)
-
     log.info(f"Loading concrete values from {concrete_values_file}")
     with open(concrete_values_file, "r") as f:  # type: ignore
         reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)  # type: ignore
         next(reader)
-        for row in tqdm(reader, total=num_lines):
+        for row in track(reader):
             try:
                 source_id, value, active, relationship_type, relationship_group, characteristic_type, refinability = (
                     row[4],
@@ -60,6 +57,8 @@ def process_concrete_values_file(concrete_values_file: str, G: nx.DiGraph) -> No
                         characteristic_type=characteristic_type,
                         refinability=refinability,
                     )
+                else:
+                    skipped()
             except Exception as e:
                 log.error(f"Error processing concrete value {row}: {e}")
                 raise ValueError(f"Error processing concrete value {row}: {e}")
@@ -19,7 +19,7 @@ from typing import List, Tuple
 
 import networkx as nx
 from pyparsing import Group, Literal, OneOrMore, Word, ZeroOrMore, nums
-from tqdm import tqdm
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -95,14 +95,11 @@ def process_refsets_file(owl_file: str, G: nx.DiGraph) -> None:
     Returns:
         None
     """
-    with open(owl_file, "r", newline='') as f:
-        num_lines = sum(1 for _ in f)
-
     log.info(f"Loading OWL expressions from {owl_file}")
     with open(owl_file, "r") as f:  # type: ignore
         reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)  # type: ignore
         next(reader)
-        for row in tqdm(reader, total=num_lines):
+        for row in track(reader):
             try:
                 owl_expression, referenced_component_id, refset_id, module_id = (
                     row[6],
@@ -113,6 +110,7 @@ def process_refsets_file(owl_file: str, G: nx.DiGraph) -> None:
                 try:
                     edges = parse_owl_functional(owl_expression, referenced_component_id)
                 except:
+                    skipped()
                     continue  # ignore OWL expression parsing failures (1 in 2024)
                 for source, target, relationship_type in edges:
                     G.add_edge(
@@ -17,7 +17,7 @@ import csv
 import logging
 
 import networkx as nx
-from tqdm import tqdm
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -33,14 +33,11 @@ def process_stated_relationship_file(stated_relationship_file: str, G: nx.DiGrap
     Returns:
         None
     """
-    with open(stated_relationship_file, "r", newline='') as f:
-        num_lines = sum(1 for _ in f)
-
     log.info(f"Loading stated relationships from {stated_relationship_file}")
     with open(stated_relationship_file, "r") as f:  # type: ignore
         reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)  # type: ignore
         next(reader)
-        for row in tqdm(reader, total=num_lines):
+        for row in track(reader):
             try:
                 source_id, dest_id, active, relationship_type, relationship_group, characteristic_type, refinability = (
                     row[4],
@@ -60,6 +57,8 @@ def process_stated_relationship_file(stated_relationship_file: str, G: nx.DiGrap
                         characteristic_type=characteristic_type,
                         refinability=refinability,
                     )
+                else:
+                    skipped()
             except Exception as e:
                 log.error(f"Error processing stated relationship {row}: {e}")
                 raise ValueError(f"Error processing stated relationship {row}: {e}")
@@ -15,8 +15,8 @@
 
 import csv
 import logging
-from tqdm import tqdm
 import networkx as nx
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -31,14 +31,11 @@ def process_text_definition_file(text_definition_file: str, G: nx.DiGraph) -> No
     Returns:
         None
     """
-    with open(text_definition_file, "r", newline='') as f:
-        num_lines = sum(1 for _ in f)
-
     log.info(f"Loading text definitions from {text_definition_file}")
     with open(text_definition_file, "r") as f:  # type: ignore
         reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)  # type: ignore
         next(reader)
-        for row in tqdm(reader, total=num_lines):
+        for row in track(reader):
             try:
                 concept_id, active, term, definition_type, case_significance = (
                     row[4],
@@ -56,6 +53,8 @@ def process_text_definition_file(text_definition_file: str, G: nx.DiGraph) -> No
                         }
                     }
                     nx.set_node_attributes(G, attrs)
+                else:
+                    skipped()
 
             except Exception as e:
                 log.error(f"Error processing text definition {row}: {e}")
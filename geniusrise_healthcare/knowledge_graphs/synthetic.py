@@ -0,0 +1,752 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from typing import Any, Dict, List, TextIO
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+SNOMED_ROOT = 138875005
+IS_A = "116680003"
+SNOMED_ATTRIBUTES = ["363698007", "116676008", "246075003", "370135005", "363714003", "47429007"]
+SNOMED_TAGS = ["disorder", "finding", "procedure", "body structure", "substance", "organism", "qualifier value"]
+SEMANTIC_TYPES = [
+    ("T047", "Disease or Syndrome", "B2.2.1.2.1"),
+    ("T184", "Sign or Symptom", "A2.2.2"),
+    ("T121", "Pharmacologic Substance", "A1.4.1.1.1"),
+    ("T061", "Therapeutic or Preventive Procedure", "B1.3.1.3"),
+    ("T023", "Body Part, Organ, or Organ Component", "A1.2.3.1"),
+    ("T109", "Organic Chemical", "A1.4.1.2.1"),
+]
+UMLS_RELATIONS = [
+    ("PAR", "inverse_isa"),
+    ("CHD", "isa"),
+    ("RO", "has_finding_site"),
+    ("RB", ""),
+    ("RN", ""),
+    ("SY", ""),
+]
+SOURCES = ["SNOMEDCT_US", "MSH", "RXNORM", "ICD10CM", "NCI", "MTH"]
+WORDS = (
+    "acute chronic primary secondary benign malignant lesion syndrome disease disorder infection inflammation "
+    "fracture deficiency neoplasm pain structure tissue cell blood heart lung liver kidney skin bone muscle nerve "
+    "artery vein gland tablet capsule oral injection solution hydrochloride sodium potassium extract"
+).split()
+
+
+def _rng(seed: int) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _popularity(rng: np.random.Generator, n: int, exponent: float = 1.2) -> np.ndarray:
+    """
+    Pareto distributed node popularity, giving the heavy tailed in-degrees of real ontologies.
+    """
+    weights = rng.pareto(exponent, n) + 1.0
+    return weights / weights.sum()
+
+
+def _out_degrees(rng: np.random.Generator, n: int, mean: float) -> np.ndarray:
+    """
+    Heavy tailed out-degrees with the given mean.
+    """
+    degrees = rng.pareto(2.0, n) + 1.0
+    return np.maximum(np.round(degrees * mean / degrees.mean()).astype(np.int64), 0)
+
+
+def _parents(rng: np.random.Generator, n: int, extra: float = 0.4) -> List[List[int]]:
+    """
+    Parents of every node of a random hierarchy rooted at node 0, skewed so that early nodes become hubs.
+    """
+    parents: List[List[int]] = [[]]
+    counts = 1 + rng.poisson(extra, n)
+    for i in range(1, n):
+        choices = np.floor(i * rng.random(counts[i]) ** 2).astype(np.int64)
+        parents.append(sorted(set(choices.tolist())))
+    return parents
+
+
+def _phrase(rng: np.random.Generator, i: int, words: int = 3) -> str:
+    picked = rng.integers(0, len(WORDS), words)
+    return " ".join(WORDS[j] for j in picked) + f" {i}"
+
+
+def _write_rows(f: TextIO, rows: List[List[Any]], delimiter: str, trailing: bool = False) -> None:
+    end = delimiter + "\n" if trailing else "\n"
+    f.writelines(delimiter.join(map(str, row)) + end for row in rows)
+
+
+def generate_snomed(directory: str, concepts: int, version: str = "INT_20230901", seed: int = 0) -> str:
+    """
+    Writes a synthetic SNOMED CT RF2 snapshot: descriptions, inferred and stated relationships, concrete values,
+    text definitions and the OWL expression refset.
+
+    Args:
+        directory (str): Output directory.
+        concepts (int): Number of concepts. Each has about 2.5 descriptions and 4 relationships.
+        version (str): Release version in the file names (default is "INT_20230901").
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The directory, as passed to `load_snomed`.
+    """
+    rng = _rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    ids = np.concatenate([[SNOMED_ROOT], 100000000 + np.arange(1, concepts, dtype=np.int64) * 10 + 5])
+    parents = _parents(rng, concepts)
+    tags = rng.integers(0, len(SNOMED_TAGS), concepts)
+    popularity = _popularity(rng, concepts)
+    module, effective = "900000000000207008", version.split("_")[-1]
+
+    header = "id\teffectiveTime\tactive\tmoduleId\tconceptId\tlanguageCode\ttypeId\tterm\tcaseSignificanceId\n"
+    with open(os.path.join(directory, f"sct2_Description_Snapshot-en_{version}.txt"), "w") as f:
+        f.write(header)
+        rows = []
+        for i, concept_id in enumerate(ids.tolist()):
+            name = _phrase(rng, i)
+            rows.append(
+                [
+                    concept_id * 100 + 11,
+                    effective,
+                    1,
+                    module,
+                    concept_id,
+                    "en",
+                    "900000000000003001",
+                    f"{name} ({SNOMED_TAGS[tags[i]]})",
+                    "900000000000448009",
+                ]
+            )
+            for k in range(int(rng.integers(0, 3))):
+                rows.append(
+                    [
+                        concept_id * 100 + 12 + k,
+                        effective,
+                        int(rng.random() > 0.05),
+                        module,
+                        concept_id,
+                        "en",
+                        "900000000000013009",
+                        f"{name} synonym {k}",
+                        "900000000000448009",
+                    ]
+                )
+        _write_rows(f, rows, "\t")
+
+    relationship_header = (
+        "id\teffectiveTime\tactive\tmoduleId\tsourceId\tdestinationId\trelationshipGroup\ttypeId"
+        "\tcharacteristicTypeId\tmodifierId\n"
+    )
+    attribute_degrees = _out_degrees(rng, concepts, 2.5)
+    attribute_targets = rng.choice(concepts, int(attribute_degrees.sum()), p=popularity)
+    attribute_offsets = np.concatenate([[0], np.cumsum(attribute_degrees)])
+    for file_name, characteristic in (
+        (f"sct2_Relationship_Snapshot_{version}.txt", "900000000000011006"),
+        (f"sct2_StatedRelationship_Snapshot_{version}.txt", "900000000000010007"),
+    ):
+        with open(os.path.join(directory, file_name), "w") as f:
+            f.write(relationship_header)
+            rows, row_id = [], 1
+            for i in range(concepts):
+                for parent in parents[i]:
+                    rows.append(
+                        [
+                            row_id,
+                            effective,
+                            1,
+                            module,
+                            ids[i],
+                            ids[parent],
+                            0,
+                            IS_A,
+                            characteristic,
+                            "900000000000451002",
+                        ]
+                    )
+                    row_id += 1
+                for k in range(attribute_degrees[i]):
+                    rows.append(
+                        [
+                            row_id,
+                            effective,
+                            int(rng.random() > 0.1),
+                            module,
+                            ids[i],
+                            ids[attribute_targets[attribute_offsets[i] + k]],
+                            1 + k // 2,
+                            SNOMED_ATTRIBUTES[k % 6],
+                            characteristic,
+                            "900000000000451002",
+                        ]
+                    )
+                    row_id += 1
+            _write_rows(f, rows, "\t")
+
+    with open(os.path.join(directory, f"sct2_RelationshipConcreteValues_Snapshot_{version}.txt"), "w") as f:
+        f.write(relationship_header.replace("destinationId", "value"))
+        substances = np.flatnonzero(rng.random(concepts) < 0.1)
+        _write_rows(
+            f,
+            [
+                [
+                    k + 1,
+                    effective,
+                    1,
+                    module,
+                    ids[i],
+                    f"#{int(rng.integers(1, 1000))}",
+                    1,
+                    "1142135004",
+                    "900000000000011006",
+                    "900000000000451002",
+                ]
+                for k, i in enumerate(substances.tolist())
+            ],
+            "\t",
+        )
+
+    with open(os.path.join(directory, f"sct2_TextDefinition_Snapshot-en_{version}.txt"), "w") as f:
+        f.write(header)
+        defined = np.flatnonzero(rng.random(concepts) < 0.05)
+        _write_rows(
+            f,
+            [
+                [
+                    ids[i] * 100 + 99,
+                    effective,
+                    1,
+                    module,
+                    ids[i],
+                    "en",
+                    "900000000000550004",
+                    f"A {_phrase(rng, i, 8)} that is defined synthetically.",
+                    "900000000000017005",
+                ]
+                for i in defined.tolist()
+            ],
+            "\t",
+        )
+
+    with open(os.path.join(directory, f"sct2_sRefset_OWLExpressionSnapshot_{version}.txt"), "w") as f:
+        f.write("id\teffectiveTime\tactive\tmoduleId\trefsetId\treferencedComponentId\towlExpression\n")
+        rows = []
+        for i in range(1, concepts):
+            parent = ids[parents[i][0]]
+            if attribute_degrees[i]:
+                target = ids[attribute_targets[attribute_offsets[i]]]
+                expression = (
+                    f"EquivalentClasses(:{ids[i]} ObjectIntersectionOf(:{parent} ObjectSomeValuesFrom(:609096000 "
+                    f"ObjectSomeValuesFrom(:{SNOMED_ATTRIBUTES[0]} :{target}))))"
+                )
+            else:
+                expression = f"SubClassOf(:{ids[i]} :{parent})"
+            rows.append([f"owl-{i}", effective, 1, module, "733073007", ids[i], expression])
+        _write_rows(f, rows, "\t")
+
+    log.info(f"Generated synthetic SNOMED CT release with {concepts} concepts in {directory}")
+    return directory
+
+
+def generate_umls(directory: str, concepts: int, seed: int = 0) -> str:
+    """
+    Writes a synthetic UMLS Metathesaurus subset in RRF: MRCONSO, MRDEF, MRREL, MRSTY, MRSAT, MRSAB and the
+    semantic network files SRDEF and SRSTR.
+
+    Args:
+        directory (str): Output directory.
+        concepts (int): Number of CUIs. Each has about 3 atoms, 5 relationships and 4 attributes.
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The directory, as passed to `load_umls`.
+    """
+    rng = _rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    cuis = [f"C{i:07d}" for i in range(concepts)]
+    popularity = _popularity(rng, concepts)
+
+    atoms = 1 + rng.poisson(2.0, concepts)
+    with open(os.path.join(directory, "MRCONSO.RRF"), "w") as f:
+        rows, aui = [], 0
+        for i, cui in enumerate(cuis):
+            name = _phrase(rng, i)
+            for k in range(atoms[i]):
+                aui += 1
+                sab = SOURCES[(i + k) % len(SOURCES)]
+                language = "ENG" if rng.random() > 0.15 else "SPA"
+                rows.append(
+                    [
+                        cui,
+                        language,
+                        "P" if k == 0 else "S",
+                        f"L{i:07d}",
+                        "PF",
+                        f"S{aui:07d}",
+                        "Y" if k == 0 else "N",
+                        f"A{aui:08d}",
+                        "",
+                        "",
+                        "",
+                        sab,
+                        "PT" if k == 0 else "SY",
+                        f"{sab[:3]}{i}",
+                        name if k == 0 else f"{name} {k}",
+                        0,
+                        "N",
+                        "",
+                    ]
+                )
+        _write_rows(f, rows, "|", trailing=True)
+
+    with open(os.path.join(directory, "MRDEF.RRF"), "w") as f:
+        defined = np.flatnonzero(rng.random(concepts) < 0.2)
+        _write_rows(
+            f,
+            [
+                [
+                    cuis[i],
+                    f"A{i:08d}",
+                    f"AT{i:08d}",
+                    "",
+                    SOURCES[i % 6],
+                    f"Definition of {_phrase(rng, i, 10)}.",
+                    "N",
+                    "",
+                ]
+                for i in defined.tolist()
+            ],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "MRREL.RRF"), "w") as f:
+        degrees = _out_degrees(rng, concepts, 5.0)
+        targets = rng.choice(concepts, int(degrees.sum()), p=popularity)
+        rows, position = [], 0
+        for i, cui in enumerate(cuis):
+            for k in range(degrees[i]):
+                rel, rela = UMLS_RELATIONS[int(rng.integers(0, len(UMLS_RELATIONS)))]
+                rows.append(
+                    [
+                        cui,
+                        "",
+                        "CUI",
+                        rel,
+                        cuis[targets[position + k]],
+                        "",
+                        "CUI",
+                        rela,
+                        f"R{position + k:08d}",
+                        "",
+                        SOURCES[k % 6],
+                        SOURCES[k % 6],
+                        "",
+                        "Y",
+                        "N",
+                        "",
+                    ]
+                )
+            position += degrees[i]
+        _write_rows(f, rows, "|", trailing=True)
+
+    with open(os.path.join(directory, "MRSTY.RRF"), "w") as f:
+        types = rng.integers(0, len(SEMANTIC_TYPES), concepts)
+        _write_rows(
+            f,
+            [[cui, *SEMANTIC_TYPES[types[i]], f"AT{i:08d}", ""] for i, cui in enumerate(cuis)],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "MRSAT.RRF"), "w") as f:
+        counts = rng.poisson(4.0, concepts)
+        _write_rows(
+            f,
+            [
+                [
+                    cui,
+                    "",
+                    "",
+                    f"A{i:08d}",
+                    "AUI",
+                    f"C{i}",
+                    f"AT{i:08d}{k}",
+                    "",
+                    ["SOS", "LT", "ST", "DA"][k % 4],
+                    SOURCES[k % 6],
+                    f"value {k}",
+                    "N",
+                    "",
+                ]
+                for i, cui in enumerate(cuis)
+                for k in range(counts[i])
+            ],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "MRSAB.RRF"), "w") as f:
+        _write_rows(
+            f,
+            [[f"C{k}", f"C{k}", sab, sab, f"{sab} source", sab] + [""] * 19 for k, sab in enumerate(SOURCES)],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "SRDEF"), "w") as f:
+        _write_rows(
+            f,
+            [
+                ["STY", tui, name, number, f"Definition of {name}.", "", "", "", "", ""]
+                for tui, name, number in SEMANTIC_TYPES
+            ],
+            "|",
+            trailing=True,
+        )
+    with open(os.path.join(directory, "SRSTR"), "w") as f:
+        _write_rows(
+            f,
+            [[SEMANTIC_TYPES[i][1], "isa", SEMANTIC_TYPES[(i + 1) % 6][1], "D"] for i in range(6)],
+            "|",
+            trailing=True,
+        )
+
+    log.info(f"Generated synthetic UMLS release with {concepts} concepts in {directory}")
+    return directory
+
+
+def generate_rxnorm(directory: str, concepts: int, seed: int = 0) -> str:
+    """
+    Writes a synthetic RxNorm release in RRF: RXNCONSO, RXNREL, RXNSAT, RXNSTY and RXNSAB.
+
+    Args:
+        directory (str): Output directory.
+        concepts (int): Number of RXCUIs. Each has about 2 atoms, 6 relationships and 6 attributes.
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The directory, as passed to `load_rxnorm`.
+    """
+    rng = _rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    rxcuis = [str(1000 + i) for i in range(concepts)]
+    popularity = _popularity(rng, concepts)
+    term_types = ["IN", "SCD", "SBD", "BN", "SCDC", "DF"]
+
+    with open(os.path.join(directory, "RXNCONSO.RRF"), "w") as f:
+        rows, aui = [], 0
+        for i, rxcui in enumerate(rxcuis):
+            for k in range(1 + int(rng.poisson(1.0))):
+                aui += 1
+                sab = "RXNORM" if k == 0 else ["MTHSPL", "VANDF", "MMSL"][k % 3]
+                rows.append(
+                    [
+                        rxcui,
+                        "ENG",
+                        "",
+                        "",
+                        "",
+                        "",
+                        "",
+                        str(aui),
+                        "",
+                        "",
+                        "",
+                        sab,
+                        term_types[i % 6],
+                        rxcui,
+                        f"{_phrase(rng, i, 2)} {10 * (k + 1)} MG Oral Tablet",
+                        "",
+                        "N",
+                        "4096",
+                    ]
+                )
+        _write_rows(f, rows, "|", trailing=True)
+
+    with open(os.path.join(directory, "RXNREL.RRF"), "w") as f:
+        degrees = _out_degrees(rng, concepts, 6.0)
+        targets = rng.choice(concepts, int(degrees.sum()), p=popularity)
+        relations = ["has_ingredient", "tradename_of", "consists_of", "has_dose_form", "isa", "constitutes"]
+        rows, position = [], 0
+        for i, rxcui in enumerate(rxcuis):
+            for k in range(degrees[i]):
+                rows.append(
+                    [
+                        rxcui,
+                        "",
+                        "CUI",
+                        "RO",
+                        rxcuis[targets[position + k]],
+                        "",
+                        "CUI",
+                        relations[k % 6],
+                        str(position + k),
+                        "",
+                        "RXNORM",
+                        "",
+                        "",
+                        "",
+                        "",
+                        "N",
+                        "4096",
+                    ]
+                )
+            position += degrees[i]
+        _write_rows(f, rows, "|", trailing=True)
+
+    with open(os.path.join(directory, "RXNSAT.RRF"), "w") as f:
+        counts = rng.poisson(6.0, concepts)
+        attributes = ["RXN_STRENGTH", "RXN_AVAILABLE_STRENGTH", "NDC", "DM_SPL_ID", "RXN_HUMAN_DRUG", "RXTERM_FORM"]
+        _write_rows(
+            f,
+            [
+                [rxcui, "", "", str(i), "CUI", rxcui, "", "", attributes[k % 6], "RXNORM", f"value {k}", "N", "4096"]
+                for i, rxcui in enumerate(rxcuis)
+                for k in range(counts[i])
+            ],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "RXNSTY.RRF"), "w") as f:
+        _write_rows(
+            f,
+            [
+                [rxcui, "T121", "A1.4.1.1.1", "Pharmacologic Substance", f"AT{i}", "4096"]
+                for i, rxcui in enumerate(rxcuis)
+            ],
+            "|",
+            trailing=True,
+        )
+
+    with open(os.path.join(directory, "RXNSAB.RRF"), "w") as f:
+        _write_rows(f, [["", "", "RXNORM", "RXNORM", "RxNorm"] + [""] * 20], "|", trailing=True)
+
+    log.info(f"Generated synthetic RxNorm release with {concepts} concepts in {directory}")
+    return directory
+
+
+def generate_mesh(directory: str, descriptors: int, seed: int = 0) -> str:
+    """
+    Writes synthetic MeSH descriptor, qualifier and supplementary concept XML files.
+
+    Args:
+        directory (str): Output directory.
+        descriptors (int): Number of descriptors. A tenth as many supplementary records are written.
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The directory, as passed to `load_mesh`.
+    """
+    rng = _rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    parents = _parents(rng, descriptors, extra=0.3)
+    tree_numbers: List[List[str]] = [["C01"]]
+    for i in range(1, descriptors):
+        tree_numbers.append([f"{tree_numbers[parent][0]}.{i % 1000:03d}" for parent in parents[i]])
+
+    with open(os.path.join(directory, "desc2024.xml"), "w") as f:
+        f.write('<?xml version="1.0"?>\n<DescriptorRecordSet LanguageCode="eng">\n')
+        for i in range(descriptors):
+            name = _phrase(rng, i)
+            trees = "".join(f"<TreeNumber>{number}</TreeNumber>" for number in tree_numbers[i])
+            concepts = "".join(
+                f'<Concept PreferredConceptYN="{"Y" if k == 0 else "N"}"><ConceptUI>M{i:07d}{k}</ConceptUI>'
+                f"<ConceptName><String>{name} {k}</String></ConceptName>"
+                + (f"<ScopeNote>{_phrase(rng, i, 12)}.</ScopeNote>" if k == 0 else "")
+                + f"<TermList><Term><String>{name} term {k}</String></Term></TermList></Concept>"
+                for k in range(1 + int(rng.poisson(0.8)))
+            )
+            f.write(
+                f'<DescriptorRecord DescriptorClass="1"><DescriptorUI>D{i:06d}</DescriptorUI>'
+                f"<DescriptorName><String>{name}</String></DescriptorName><Annotation>synthetic</Annotation>"
+                f"<TreeNumberList>{trees}</TreeNumberList><ConceptList>{concepts}</ConceptList></DescriptorRecord>\n"
+            )
+        f.write("</DescriptorRecordSet>\n")
+
+    with open(os.path.join(directory, "qual2024.xml"), "w") as f:
+        f.write('<?xml version="1.0"?>\n<QualifierRecordSet LanguageCode="eng">\n')
+        for i in range(80):
+            f.write(
+                f"<QualifierRecord><QualifierUI>Q{i:06d}</QualifierUI><QualifierName><String>qualifier {i}</String>"
+                f"</QualifierName><TreeNumberList><TreeNumber>Y{i:02d}</TreeNumber></TreeNumberList></QualifierRecord>\n"
+            )
+        f.write("</QualifierRecordSet>\n")
+
+    with open(os.path.join(directory, "supp2024.xml"), "w") as f:
+        f.write('<?xml version="1.0"?>\n<SupplementalRecordSet LanguageCode="eng">\n')
+        for i in range(max(descriptors // 10, 1)):
+            f.write(
+                f'<SupplementalRecord SCRClass="1"><SupplementalRecordUI>C{i:09d}</SupplementalRecordUI>'
+                f"<SupplementalRecordName><String>{_phrase(rng, i, 2)}</String></SupplementalRecordName>"
+                f'<ConceptList><Concept PreferredConceptYN="Y"><ConceptUI>M9{i:08d}</ConceptUI>'
+                f"<ConceptName><String>supplement {i}</String></ConceptName></Concept></ConceptList>"
+                f"</SupplementalRecord>\n"
+            )
+        f.write("</SupplementalRecordSet>\n")
+
+    log.info(f"Generated synthetic MeSH release with {descriptors} descriptors in {directory}")
+    return directory
+
+
+def generate_drugbank(directory: str, drugs: int, seed: int = 0) -> str:
+    """
+    Writes a synthetic DrugBank `drugbank.xml` with interactions, targets, enzymes, carriers and transporters.
+
+    Args:
+        directory (str): Output directory.
+        drugs (int): Number of drugs. Each interacts with about 30 others, skewed towards popular drugs.
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The directory, as passed to `load_drugbank`.
+    """
+    rng = _rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    popularity = _popularity(rng, drugs)
+    degrees = _out_degrees(rng, drugs, 30.0)
+    partners = rng.choice(drugs, int(degrees.sum()), p=popularity)
+    names = [f"Drug{_phrase(rng, i, 1).replace(' ', '')}" for i in range(drugs)]
+    templates = [
+        "The risk or severity of adverse effects can be increased when {a} is combined with {b}.",
+        "{a} may increase the anticoagulant activities of {b}.",
+        "The metabolism of {b} can be decreased when combined with {a}.",
+    ]
+    proteins = max(drugs // 5, 1)
+
+    def polypeptides(tag: str, prefix: str, count: int) -> str:
+        picked = rng.integers(0, proteins, count)
+        return "".join(
+            f"<{tag}><id>{prefix}{j:05d}</id><name>{prefix.lower()} protein {j}</name><organism>Humans</organism>"
+            f"<actions><action>inhibitor</action></actions></{tag}>"
+            for j in picked.tolist()
+        )
+
+    with open(os.path.join(directory, "drugbank.xml"), "w") as f:
+        f.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<drugbank xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+        )
+        position = 0
+        for i in range(drugs):
+            interactions = "".join(
+                f"<drug-interaction><drugbank-id>DB{j:05d}</drugbank-id><name>{names[j]}</name><description>"
+                f"{templates[(i + j) % 3].format(a=names[i], b=names[j])}</description></drug-interaction>"
+                for j in partners[position : position + degrees[i]].tolist()
+                if j != i
+            )
+            position += degrees[i]
+            f.write(
+                f'<drug type="small molecule"><drugbank-id primary="true">DB{i:05d}</drugbank-id>'
+                f"<name>{names[i]}</name><description>{_phrase(rng, i, 20)}.</description><type>small molecule</type>"
+                f"<synonyms><synonym>{names[i]} synonym</synonym></synonyms>"
+                f"<categories><category>{WORDS[i % len(WORDS)]} agents</category></categories>"
+                f"<drug-interactions>{interactions}</drug-interactions>"
+                f"<targets>{polypeptides('target', 'BE', 1 + int(rng.poisson(2)))}</targets>"
+                f"<enzymes>{polypeptides('enzyme', 'BEE', int(rng.poisson(1)))}</enzymes>"
+                f"<carriers>{polypeptides('carrier', 'BEC', int(rng.poisson(0.2)))}</carriers>"
+                f"<transporters>{polypeptides('transporter', 'BET', int(rng.poisson(0.5)))}</transporters>"
+                f"</drug>\n"
+            )
+        f.write("</drugbank>\n")
+
+    log.info(f"Generated synthetic DrugBank release with {drugs} drugs in {directory}")
+    return directory
+
+
+def generate_obo(file_path: str, terms: int, prefix: str = "GO", seed: int = 0) -> str:
+    """
+    Writes a synthetic OBO ontology shaped like GO or DO: `is_a` and `part_of` hierarchies, definitions, synonyms
+    and xrefs.
+
+    Args:
+        file_path (str): Output file, gzipped if it ends with ".gz".
+        terms (int): Number of terms.
+        prefix (str): Id prefix, "GO" or "DOID" (default is "GO").
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        str: The file, as passed to `load_gene_ontology` or `load_disease_ontology`.
+    """
+    import gzip
+
+    rng = _rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    parents = _parents(rng, terms)
+    namespaces = (
+        ["biological_process", "molecular_function", "cellular_component"] if prefix == "GO" else ["disease_ontology"]
+    )
+    xrefs = ["UMLS_CUI:C{:07d}", "MESH:D{:06d}", "ICD10CM:C{:02d}.{}", "OMIM:{:06d}"]
+
+    opener = gzip.open if file_path.endswith(".gz") else open
+    with opener(file_path, "wt", encoding="utf-8") as f:  # type: ignore
+        f.write(f"format-version: 1.2\nontology: {prefix.lower()}\n")
+        for i in range(terms):
+            term_id = f"{prefix}:{i:07d}"
+            lines = [
+                "",
+                "[Term]",
+                f"id: {term_id}",
+                f"name: {_phrase(rng, i)}",
+                f"namespace: {namespaces[i % len(namespaces)]}",
+                f'def: "{_phrase(rng, i, 10)}." [PMID:{1000 + i}]',
+                f'synonym: "{_phrase(rng, i, 2)}" EXACT []',
+            ]
+            if prefix != "GO":
+                xref = xrefs[i % len(xrefs)]
+                lines.append("xref: " + (xref.format(i % 100, i % 10) if "ICD" in xref else xref.format(i)))
+            for k, parent in enumerate(parents[i]):
+                relation = "is_a" if k == 0 or prefix != "GO" else "relationship: part_of"
+                if relation == "is_a":
+                    lines.append(f"is_a: {prefix}:{parent:07d} ! parent")
+                else:
+                    lines.append(f"{relation} {prefix}:{parent:07d} ! parent")
+            f.write("\n".join(lines) + "\n")
+        f.write("\n[Typedef]\nid: part_of\nname: part of\nis_transitive: true\n")
+
+    log.info(f"Generated synthetic {prefix} ontology with {terms} terms in {file_path}")
+    return file_path
+
+
+def generate_all(directory: str, rows: int = 10000, seed: int = 0) -> Dict[str, Any]:
+    """
+    Writes synthetic releases of every source sized so that the largest file of each has about `rows` rows.
+
+    Args:
+        directory (str): Output directory, one subdirectory per source.
+        rows (int): Approximate rows of the largest file of each source, e.g. 10k up to 10M (default is 10000).
+        seed (int): Random seed (default is 0).
+
+    Returns:
+        Dict[str, Any]: A config for `knowledge_graphs.base.load` building the generated sources.
+    """
+    sources = {
+        "snomed": {"path": generate_snomed(os.path.join(directory, "snomed"), max(rows // 4, 10), seed=seed)},
+        "umls": {"path": generate_umls(os.path.join(directory, "umls"), max(rows // 5, 10), seed=seed)},
+        "rxnorm": {"path": generate_rxnorm(os.path.join(directory, "rxnorm"), max(rows // 6, 10), seed=seed)},
+        "mesh": {"path": generate_mesh(os.path.join(directory, "mesh"), max(rows // 2, 10), seed=seed)},
+        "drugbank": {"path": generate_drugbank(os.path.join(directory, "drugbank"), max(rows // 30, 10), seed=seed)},
+        "gene_ontology": {
+            "path": generate_obo(os.path.join(directory, "gene_ontology", "go.obo"), max(rows // 2, 10), "GO", seed)
+        },
+        "disease_ontology": {
+            "path": generate_obo(
+                os.path.join(directory, "disease_ontology", "doid.obo"), max(rows // 5, 10), "DOID", seed
+            )
+        },
+    }
+    return {"sources": sources}
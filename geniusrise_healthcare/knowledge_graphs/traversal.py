@@ -0,0 +1,127 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections import deque
+from typing import Any, Container, FrozenSet, Hashable, Iterable, List, Optional, Set, Union
+
+import networkx as nx
+
+log = logging.getLogger(__name__)
+
+Tags = Union[None, str, List[str]]
+
+
+def _tag_set(tags: Tags) -> FrozenSet[Any]:
+    """
+    Tags given as one tag or a list, as a set. A single None matches untagged nodes, as in `recursive_search`.
+    """
+    return frozenset(tags if isinstance(tags, list) else [tags])
+
+
+def search_paths(
+    G: nx.DiGraph,
+    sources: Iterable[Hashable],
+    semantic_types: Tags = None,
+    stop_at_semantic_types: Tags = None,
+    max_depth: int = 3,
+    hubs: Container[Hashable] = frozenset(),
+    visited: Optional[Set[Hashable]] = None,
+    start_depth: int = 0,
+    prefix: Optional[List[Hashable]] = None,
+    order: str = "dfs",
+    max_nodes: Optional[int] = None,
+    max_edges: Optional[int] = None,
+) -> List[List[Hashable]]:
+    """
+    Searches the graph from each source in turn, following predecessors then successors, and collects the paths
+    from the source to every node of the wanted semantic types.
+
+    The search does not descend past nodes tagged with a stop type, hub nodes or `max_depth`, and the paths to stop
+    and hub nodes are collected as well. Every node is visited at most once over all sources. In "dfs" order the
+    paths and their order are those of the recursive `recursive_search`; the search is iterative, with an explicit
+    stack and parent pointers, so deep hierarchies cannot overflow the interpreter stack and paths are only built
+    when collected. In "bfs" order every node is reached by a shortest path instead.
+
+    Args:
+        G (nx.DiGraph): The graph.
+        sources (Iterable[Hashable]): The start nodes.
+        semantic_types (Tags): The semantic types to collect, all nodes if empty (default is None).
+        stop_at_semantic_types (Tags): The semantic types to stop at. Given as None, untagged nodes stop the search
+            (default is None).
+        max_depth (int): Maximum depth (default is 3).
+        hubs (Container[Hashable]): Nodes to stop at, e.g. a `HubIndex` (default is none).
+        visited (Optional[Set[Hashable]]): Nodes already visited, updated in place (default is a new set).
+        start_depth (int): Depth of the sources (default is 0).
+        prefix (Optional[List[Hashable]]): Path leading to the sources, prepended to every path.
+        order (str): "dfs" or "bfs" (default is "dfs").
+        max_nodes (Optional[int]): Stop after visiting this many nodes.
+        max_edges (Optional[int]): Stop after following this many edges.
+
+    Returns:
+        List[List[Hashable]]: The paths, in the order they are found.
+    """
+    if order not in ("dfs", "bfs"):
+        raise ValueError(f"Unknown order {order}, expected dfs or bfs")
+    collect = _tag_set(semantic_types) if semantic_types else None
+    stop = _tag_set(stop_at_semantic_types)
+    visited = set() if visited is None else visited
+    prefix = prefix or []
+    node_data, predecessors, successors = G._node, G._pred, G._succ  # type: ignore
+
+    # Visited nodes and the entry of their parent, paths are rebuilt from these when collected
+    entries: List[Hashable] = []
+    parents: List[int] = []
+
+    def path(entry: int) -> List[Hashable]:
+        nodes = []
+        while entry >= 0:
+            nodes.append(entries[entry])
+            entry = parents[entry]
+        return prefix + nodes[::-1]
+
+    paths: List[List[Hashable]] = []
+    edges = 0
+    for source in sources:
+        pending: Any = deque([(source, start_depth, -1)])
+        pop = pending.pop if order == "dfs" else pending.popleft
+        while pending:
+            node, depth, parent = pop()
+            if node in visited or depth > max_depth:
+                continue
+            if (max_nodes is not None and len(entries) >= max_nodes) or (max_edges is not None and edges >= max_edges):
+                log.warning(f"Search stopped after visiting {len(entries)} nodes and {edges} edges")
+                return paths
+            visited.add(node)
+            entry = len(entries)
+            entries.append(node)
+            parents.append(parent)
+
+            tag = node_data[node].get("tag")
+            if tag in stop or node in hubs:
+                paths.append(path(entry))
+                continue
+            if collect is None or tag in collect:
+                paths.append(path(entry))
+            if depth == max_depth:
+                continue
+
+            neighbors = list(predecessors[node])
+            neighbors.extend(successors[node])
+            edges += len(neighbors)
+            # Nodes visited by now stay visited, skip them early. Depth first pushes in reverse, to pop in order.
+            children = [(neighbor, depth + 1, entry) for neighbor in neighbors if neighbor not in visited]
+            pending.extend(reversed(children) if order == "dfs" else children)
+    return paths
@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,13 +35,15 @@ def process_attributes_file(attributes_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading attributes from {attributes_file}")
 
     rows = read_rrf_file(attributes_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui, atn, atv = row[0], row[4], row[5]
             if cui in G:
                 if "attributes" not in G.nodes[cui]:
                     G.nodes[cui]["attributes"] = {}
                 G.nodes[cui]["attributes"][atn] = atv
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing attribute {row}: {e}")
             raise ValueError(f"Error processing attribute {row}: {e}")
@@ -25,10 +25,12 @@ from .semantic_types import process_semantic_types_file
 from .attributes import process_attributes_file
 from .languages import process_languages_file
 from .sources import process_sources_file
+from ..instrumentation import instrumented, stage
 
 log = logging.getLogger(__name__)
 
 
+@instrumented("umls")
 def load_umls(G: nx.DiGraph, umls_path: str) -> nx.DiGraph:
     """
     Loads UMLS data into a NetworkX graph.
@@ -52,13 +54,20 @@ def load_umls(G: nx.DiGraph, umls_path: str) -> nx.DiGraph:
     attributes_file = os.path.join(umls_path, "MRSAT.RRF")
     os.path.join(umls_path, "MRSAB.RRF")
 
-    process_concepts_file(concepts_file, G, cui_to_concept)
-    process_definitions_file(definitions_file, G)
-    process_relationships_file(relationships_file, G)
-    process_semantic_types_file(semantic_types_file, G)
-    process_semantic_network_files(srdef_file, srstr_file, G)
-    process_attributes_file(attributes_file, G)
-    process_languages_file(concepts_file, G)
+    with stage("umls.concepts", G, concepts_file):
+        process_concepts_file(concepts_file, G, cui_to_concept)
+    with stage("umls.definitions", G, definitions_file):
+        process_definitions_file(definitions_file, G)
+    with stage("umls.relationships", G, relationships_file):
+        process_relationships_file(relationships_file, G)
+    with stage("umls.semantic_types", G, semantic_types_file):
+        process_semantic_types_file(semantic_types_file, G)
+    with stage("umls.semantic_network", G, srdef_file):
+        process_semantic_network_files(srdef_file, srstr_file, G)
+    with stage("umls.attributes", G, attributes_file):
+        process_attributes_file(attributes_file, G)
+    with stage("umls.languages", G, concepts_file):
+        process_languages_file(concepts_file, G)
     # process_sources_file(sources_file, source_to_info)
 
     log.info(f"Loaded {G.number_of_nodes()} nodes and {G.number_of_edges()} edges into the graph.")
@@ -16,8 +16,8 @@
 import logging
 from typing import Dict
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import track
 
 log = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ def process_concepts_file(concepts_file: str, G: nx.DiGraph, cui_to_concept: Dic
     log.info(f"Loading concepts from {concepts_file}")
 
     rows = read_rrf_file(concepts_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui, language, term, source, sab, tty = row[0], row[1], row[14], row[11], row[4], row[12]
             G.add_node(cui, term=term, language=language, source=source, sab=sab, tty=tty)
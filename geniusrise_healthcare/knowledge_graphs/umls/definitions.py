@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,13 +35,15 @@ def process_definitions_file(definitions_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading definitions from {definitions_file}")
 
     rows = read_rrf_file(definitions_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui, sab, defn = row[0], row[4], row[5]
             if cui in G:
                 if "definitions" not in G.nodes[cui]:
                     G.nodes[cui]["definitions"] = []
                 G.nodes[cui]["definitions"].append({"sab": sab, "defn": defn})
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing definition {row}: {e}")
             raise ValueError(f"Error processing definition {row}: {e}")
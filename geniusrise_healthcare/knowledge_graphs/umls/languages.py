@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,13 +35,15 @@ def process_languages_file(languages_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading languages from {languages_file}")
 
     rows = read_rrf_file(languages_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui, language = row[0], row[1]
             if cui in G:
                 if "languages" not in G.nodes[cui]:
                     G.nodes[cui]["languages"] = set()
                 G.nodes[cui]["languages"].add(language)
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing language {row}: {e}")
             raise ValueError(f"Error processing language {row}: {e}")
@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,11 +35,13 @@ def process_relationships_file(relationships_file: str, G: nx.DiGraph) -> None:
     log.info(f"Loading relationships from {relationships_file}")
 
     rows = read_rrf_file(relationships_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui1, rel, cui2, rela, sab = row[0], row[3], row[4], row[7], row[10]
             if cui1 in G and cui2 in G:
                 G.add_edge(cui1, cui2, rel=rel, rela=rela, sab=sab)
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing relationship {row}: {e}")
             raise ValueError(f"Error processing relationship {row}: {e}")
@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -36,7 +36,7 @@ def process_semantic_network_files(srdef_file: str, srstr_file: str, G: nx.DiGra
     log.info(f"Loading semantic type definitions from {srdef_file}")
 
     rows = read_rrf_file(srdef_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             tui, name, description = row[0], row[1], row[2]
             G.add_node(tui, name=name, description=description)
@@ -47,11 +47,13 @@ def process_semantic_network_files(srdef_file: str, srstr_file: str, G: nx.DiGra
     log.info(f"Loading semantic relationships from {srstr_file}")
 
     rows = read_rrf_file(srstr_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             tui1, rel, tui2 = row[0], row[1], row[2]
             if tui1 in G and tui2 in G:
                 G.add_edge(tui1, tui2, rel=rel)
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing semantic relationship {row}: {e}")
             raise ValueError(f"Error processing semantic relationship {row}: {e}")
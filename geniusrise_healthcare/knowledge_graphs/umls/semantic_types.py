@@ -15,8 +15,8 @@
 
 import logging
 import networkx as nx
-from tqdm import tqdm
 from .utils import read_rrf_file
+from ..instrumentation import skipped, track
 
 log = logging.getLogger(__name__)
 
@@ -35,13 +35,15 @@ def process_semantic_types_file(semantic_types_file: str, G: nx.DiGraph) -> None
     log.info(f"Loading semantic types from {semantic_types_file}")
 
     rows = read_rrf_file(semantic_types_file)
-    for row in tqdm(rows):
+    for row in track(rows):
         try:
             cui, tui = row[0], row[1]
             if cui in G:
                 if "semantic_types" not in G.nodes[cui]:
                     G.nodes[cui]["semantic_types"] = []
                 G.nodes[cui]["semantic_types"].append(tui)
+            else:
+                skipped()
         except Exception as e:
             log.error(f"Error processing semantic type {row}: {e}")
             raise ValueError(f"Error processing semantic type {row}: {e}")
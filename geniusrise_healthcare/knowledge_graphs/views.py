@@ -0,0 +1,140 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import weakref
+from typing import Any, Dict, FrozenSet, Iterable, Tuple, Union
+
+import networkx as nx
+import numpy as np
+
+from .cache import graph_cache
+from .csr import CSRGraph, csr_graph
+
+log = logging.getLogger(__name__)
+
+# SNOMED relationship types queried together
+IS_A = "116680003"
+FINDING_SITE = "363698007"
+CAUSATIVE_AGENT = "246075003"
+DUE_TO = "42752001"
+ASSOCIATED_WITH = "47429007"
+PATHOLOGICAL_PROCESS = "370135005"
+CAUSAL_TYPES = frozenset({IS_A, FINDING_SITE, CAUSATIVE_AGENT, DUE_TO, ASSOCIATED_WITH, PATHOLOGICAL_PROCESS})
+
+
+class EdgeTypeIndex:
+    """
+    The edges of a CSR graph grouped by relationship, so that the adjacency restricted to some relationships is
+    assembled from contiguous blocks instead of filtering every edge.
+
+    Out- and in-edges are stably sorted by relationship code, each relationship then owns one block whose edges are
+    still ordered by node and neighbor. Views are `CSRGraph`s over the same nodes, so positions, columns and every
+    traversal work on them unchanged.
+    """
+
+    def __init__(self, graph: CSRGraph) -> None:
+        """
+        Args:
+            graph (CSRGraph): The graph.
+        """
+        # Held weakly, the index is cached under the graph and would otherwise keep its own cache key alive
+        self.graph: CSRGraph = weakref.proxy(graph)
+        n_types = len(graph.edge_type_names)
+        self._out = self._blocks(graph.edge_sources(), graph.indices, graph.edge_types, n_types)
+        in_targets = np.repeat(np.arange(len(graph.nodes), dtype=graph.in_indices.dtype), np.diff(graph.in_indptr))
+        self._in = self._blocks(in_targets, graph.in_indices, graph.in_edge_types, n_types)
+        self._views: Dict[FrozenSet[int], CSRGraph] = {}
+
+    @staticmethod
+    def _blocks(
+        rows: np.ndarray, neighbors: np.ndarray, types: np.ndarray, n_types: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        permutation = np.argsort(types, kind="stable")
+        offsets = np.zeros(n_types + 1, dtype=np.int64)
+        np.cumsum(np.bincount(types, minlength=n_types), out=offsets[1:])
+        return rows[permutation], neighbors[permutation], offsets
+
+    @property
+    def edge_type_counts(self) -> Dict[Any, int]:
+        """
+        Number of edges of every relationship.
+        """
+        offsets = self._out[2]
+        return {name: int(offsets[code + 1] - offsets[code]) for code, name in enumerate(self.graph.edge_type_names)}
+
+    def _adjacency(
+        self, blocks: Tuple[np.ndarray, np.ndarray, np.ndarray], codes: Iterable[int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows, neighbors, offsets = blocks
+        codes = sorted(codes)
+        selected_rows = [rows[offsets[code] : offsets[code + 1]] for code in codes]
+        selected_neighbors = [neighbors[offsets[code] : offsets[code + 1]] for code in codes]
+        selected_types = [
+            np.full(offsets[code + 1] - offsets[code], code, dtype=self.graph.edge_types.dtype) for code in codes
+        ]
+        row = np.concatenate(selected_rows) if codes else np.empty(0, dtype=rows.dtype)
+        neighbor = np.concatenate(selected_neighbors) if codes else np.empty(0, dtype=neighbors.dtype)
+        types = np.concatenate(selected_types) if codes else np.empty(0, dtype=self.graph.edge_types.dtype)
+        if len(codes) > 1:
+            # Blocks are each ordered by row and neighbor, their union has to be reordered
+            order = np.lexsort((neighbor, row))
+            row, neighbor, types = row[order], neighbor[order], types[order]
+        indptr = np.zeros(len(self.graph.nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row, minlength=len(self.graph.nodes)), out=indptr[1:])
+        return indptr, neighbor, types
+
+    def view(self, edge_types: Iterable[Any]) -> CSRGraph:
+        """
+        Returns the graph restricted to the edges of some relationships, built once per set of relationships.
+
+        Args:
+            edge_types (Iterable[Any]): The relationships, e.g. `{IS_A, FINDING_SITE}`. Relationships absent from the
+                graph are ignored.
+
+        Returns:
+            CSRGraph: The view, sharing the nodes and positions of the graph.
+        """
+        codes = frozenset(self.graph.edge_type_codes[name] for name in edge_types if name in self.graph.edge_type_codes)
+        if codes not in self._views:
+            indptr, indices, types = self._adjacency(self._out, codes)
+            in_adjacency = self._adjacency(self._in, codes)
+            self._views[codes] = self.graph.with_adjacency(indptr, indices, types, in_adjacency)
+            log.debug(f"Built view of {len(indices)} edges over {len(codes)} relationships")
+        return self._views[codes]
+
+
+def edge_type_index(G: Union[nx.DiGraph, CSRGraph]) -> EdgeTypeIndex:
+    """
+    The edge type index of a graph, built once and cached until the graph changes. Call `graph_cache.invalidate(G)`
+    after editing edge types.
+    """
+    graph = csr_graph(G)
+    return graph_cache.get(graph, "edge_type_index", lambda: EdgeTypeIndex(graph))
+
+
+def edge_type_view(G: Union[nx.DiGraph, CSRGraph], edge_types: Iterable[Any]) -> CSRGraph:
+    """
+    The adjacency of a graph restricted to some relationships, e.g. `edge_type_view(G, {IS_A, FINDING_SITE})`, built
+    once per set of relationships and cached until the graph changes.
+
+    Args:
+        G (Union[nx.DiGraph, CSRGraph]): The graph, converted to CSR once if given as NetworkX.
+        edge_types (Iterable[Any]): The relationships.
+
+    Returns:
+        CSRGraph: The view, sharing the nodes and positions of the CSR graph.
+    """
+    return edge_type_index(G).view(edge_types)
@@ -0,0 +1,76 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.base import LOADERS, load
+from geniusrise_healthcare.knowledge_graphs.synthetic import generate_all
+
+SOURCES = ("mesh", "gene_ontology")
+
+
+@pytest.fixture(scope="module")
+def config(tmp_path_factory):
+    generated = generate_all(str(tmp_path_factory.mktemp("synthetic")), rows=200)
+    return {"sources": {source: generated["sources"][source] for source in SOURCES}}
+
+
+def report_counts(G):
+    report = G.graph["build_report"]["sources"]
+    return {source: (row["path"], row["nodes"], row["edges"], row["cached"]) for source, row in report.items()}
+
+
+@pytest.mark.parametrize("dense_ids", [False, True])
+def test_parallel_build_matches_sequential(config, dense_ids):
+    parallel = load(config, workers=2, dense_ids=dense_ids)
+    sequential = load(config, workers=1, dense_ids=dense_ids)
+
+    assert list(parallel.nodes(data=True)) == list(sequential.nodes(data=True))
+    assert list(parallel.edges(data=True)) == list(sequential.edges(data=True))
+    assert report_counts(parallel) == report_counts(sequential)
+    assert parallel.graph["build_report"]["workers"] == 2
+    assert set(parallel.graph) == set(sequential.graph)
+
+
+def test_merge_matches_source_graphs(config):
+    G = load(config, workers=2)
+
+    expected = nx.DiGraph()
+    for source in SOURCES:
+        H = LOADERS[source](config["sources"][source]["path"])
+        assert report_counts(G)[source][1:3] == (H.number_of_nodes(), H.number_of_edges())
+        for node, data in H.nodes(data=True):
+            expected.add_node(node, **data)
+        for u, v, data in H.edges(data=True):
+            expected.add_edge(u, v, **data)
+    assert dict(G.nodes(data=True)) == dict(expected.nodes(data=True))
+    assert {(u, v): data for u, v, data in G.edges(data=True)} == {
+        (u, v): data for u, v, data in expected.edges(data=True)
+    }
+
+
+def test_dense_ids_translate_back(config):
+    G = load(config, workers=2, dense_ids=True)
+    registry = G.graph["id_registry"]
+    native = load(config, workers=1)
+    assert all(isinstance(node, int) for node in G)
+    assert G.number_of_nodes() == native.number_of_nodes()
+    assert G.number_of_edges() == native.number_of_edges()
+    for source in SOURCES:
+        H = LOADERS[source](config["sources"][source]["path"])
+        for u, v in list(H.edges)[:50]:
+            assert G.has_edge(registry.lookup(source, u), registry.lookup(source, v))
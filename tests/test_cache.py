@@ -0,0 +1,104 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import gc
+import weakref
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.algorithms import pagerank
+from geniusrise_healthcare.knowledge_graphs.cache import graph_cache
+from geniusrise_healthcare.knowledge_graphs.csr import csr_graph
+from geniusrise_healthcare.knowledge_graphs.hubs import hub_index
+from geniusrise_healthcare.knowledge_graphs.neighborhood import neighborhood_engine
+from geniusrise_healthcare.knowledge_graphs.views import edge_type_index
+
+
+def test_rewiring_with_same_counts_invalidates():
+    G = nx.DiGraph([(1, 2), (2, 3), (3, 4)])
+    before = csr_graph(G)
+    assert csr_graph(G) is before
+
+    G.remove_edge(3, 4)
+    G.add_edge(4, 1)
+    after = csr_graph(G)
+    assert after is not before
+    assert sorted(after.to_networkx().edges()) == sorted(G.edges())
+
+
+def test_views_follow_their_graph():
+    G = nx.DiGraph([(1, 2), (1, 3), (4, 1)])
+    view = nx.reverse_view(G)
+    before = hub_index(view, fraction=0.25)
+
+    G.remove_edge(1, 2)
+    G.add_edge(3, 2)
+    assert hub_index(view, fraction=0.25) is not before
+
+
+def test_attribute_edits_need_invalidate():
+    G = nx.DiGraph()
+    G.add_edge(1, 2, type="is_a")
+    assert csr_graph(G).edge_type(1, 2) == "is_a"
+
+    G.edges[1, 2]["type"] = "part_of"
+    graph_cache.invalidate(G)
+    assert csr_graph(G).edge_type(1, 2) == "part_of"
+
+
+def test_pagerank_uses_weights_by_default():
+    G = nx.DiGraph()
+    G.add_edge("a", "b", weight=9.0)
+    G.add_edge("a", "c", weight=1.0)
+    G.add_edge("b", "a")
+    G.add_edge("c", "a")
+
+    expected = nx.pagerank(G)
+    ranks = pagerank(G)
+    assert ranks == pytest.approx(expected, abs=1e-4)
+    assert ranks["b"] > ranks["c"]
+    assert pagerank(G, weight=None)["b"] == pytest.approx(pagerank(G, weight=None)["c"])
+
+
+def assert_dropped_with_graph(build):
+    # A value cached under the CSR copy must not keep the copy, its own cache key, alive
+    G = nx.DiGraph()
+    G.add_edge(1, 2, type="116680003")
+    first = weakref.ref(csr_graph(G))
+    values = [weakref.ref(build(G))]
+    for i in range(5):
+        G.add_edge(i + 10, 1, type="363698007")
+        values.append(weakref.ref(build(G)))
+    gc.collect()
+    assert first() is None
+    assert all(value() is None for value in values[:-1])
+
+    del G
+    gc.collect()
+    assert values[-1]() is None
+
+
+def test_edge_type_index_dropped_with_graph():
+    assert_dropped_with_graph(edge_type_index)
+
+
+def test_neighborhood_engine_dropped_with_graph():
+    assert_dropped_with_graph(neighborhood_engine)
+
+
+def test_hub_index_dropped_with_graph():
+    assert_dropped_with_graph(hub_index)
@@ -0,0 +1,65 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.gene_ontology.similarity import SemanticSimilarity
+
+
+def random_ontology(n: int, seed: int) -> nx.DiGraph:
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    for i in range(n):
+        G.add_node(f"GO:{i}", type="term")
+        for parent in rng.sample(range(i), min(i, rng.randint(1, 3))):
+            G.add_edge(f"GO:{i}", f"GO:{parent}", type=rng.choice(("is_a", "part_of")))
+    return G
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_self_similarity_bounds_ancestor_similarity(seed):
+    G = random_ontology(300, seed)
+    rng = random.Random(seed)
+    # Most terms stay unannotated, as in real annotation sets
+    term_counts = {term: rng.randint(1, 20) for term in rng.sample(list(G), 60)}
+    engine = SemanticSimilarity.from_graph(G, term_counts=term_counts)
+
+    terms, ancestors = [], []
+    for term in G:
+        for ancestor in nx.descendants(G, term):
+            terms.append(term)
+            ancestors.append(ancestor)
+
+    self_similarity = engine.term_similarity(terms, terms, method="resnik")
+    ancestor_similarity = engine.term_similarity(terms, ancestors, method="resnik")
+    assert np.all(self_similarity >= ancestor_similarity)
+    assert np.all(engine.information_content >= 0)
+
+
+def test_information_content_of_unannotated_terms():
+    G = nx.DiGraph()
+    G.add_nodes_from(["GO:root", "GO:a", "GO:b", "GO:leaf"], type="term")
+    G.add_edges_from([("GO:a", "GO:root"), ("GO:b", "GO:root"), ("GO:leaf", "GO:a")], type="is_a")
+    engine = SemanticSimilarity.from_graph(G, term_counts={"GO:a": 1, "GO:b": 3})
+
+    ic = dict(zip(engine.closure.nodes, engine.information_content))
+    assert ic["GO:a"] == pytest.approx(np.log(4))
+    assert ic["GO:leaf"] == ic["GO:a"]
+    assert engine.term_similarity(["GO:leaf"], ["GO:leaf"])[0] == pytest.approx(np.log(4))
@@ -0,0 +1,70 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs import instrumentation
+from geniusrise_healthcare.knowledge_graphs.gene_ontology import load_gene_ontology
+from geniusrise_healthcare.knowledge_graphs.instrumentation import format_summary, skipped, stage, track
+
+
+@pytest.fixture
+def events():
+    collected = []
+    instrumentation.configure(sinks=[collected.append])
+    yield collected
+    instrumentation.configure()
+
+
+def test_rows_kept(events):
+    G = nx.DiGraph()
+    with stage("test.rows", G):
+        for row in track(range(10)):
+            if row % 3:
+                G.add_node(row)
+            else:
+                skipped()
+
+    (event,) = events
+    assert event["rows_read"] == 10
+    assert event["rows_kept"] == 6
+    assert event["nodes_added"] == 6
+    assert event["file"] is None and event["bytes_read"] == 0
+
+
+def test_skipped_outside_stage():
+    skipped()
+    assert list(track([1, 2])) == [1, 2]
+
+
+def test_in_memory_stages_report_no_file(events, fixtures_dir):
+    ontology_file = os.path.join(fixtures_dir, "go.obo")
+    load_gene_ontology(nx.DiGraph(), ontology_file)
+
+    stages = {event["stage"]: event for event in events}
+    assert stages["gene_ontology.records"]["file"] == ontology_file
+    assert stages["gene_ontology.records"]["bytes_read"] == os.path.getsize(ontology_file)
+    for name in ("gene_ontology.terms", "gene_ontology.relationships", "gene_ontology.attributes"):
+        assert stages[name]["file"] is None
+        assert stages[name]["bytes_per_second"] == 0
+    assert stages["gene_ontology.terms"]["rows_kept"] == 8
+
+    summary = stages["gene_ontology"]
+    assert summary["rows_kept"] == sum(child["rows_kept"] for child in summary["stages"])
+    assert "kept" in format_summary(summary)
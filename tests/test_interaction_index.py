@@ -0,0 +1,109 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.drugbank.base import load_drugbank
+from geniusrise_healthcare.knowledge_graphs.drugbank.interaction_index import InteractionIndex
+from geniusrise_healthcare.knowledge_graphs.synthetic import generate_drugbank
+
+
+@pytest.fixture(scope="module")
+def graphs(tmp_path_factory):
+    path = generate_drugbank(str(tmp_path_factory.mktemp("drugbank")), 40, seed=3)
+    return load_drugbank(path), load_drugbank(path, compact_interactions=True)
+
+
+def interaction_edges(G):
+    return {(u, v): data for u, v, data in G.edges(data=True) if data.get("type") == "interaction"}
+
+
+def test_descriptions_round_trip(graphs):
+    G, compact = graphs
+    index = compact.graph["interaction_index"]
+    edges = interaction_edges(G)
+    assert edges and len(index) == len(edges)
+    assert len(index.templates) < len(edges)
+    for drug in {u for u, _ in edges}:
+        records = index.interactions(drug)
+        assert {record["partner"] for record in records} == {v for u, v in edges if u == drug}
+        for record in records:
+            edge = edges[record["drug"], record["partner"]]
+            assert record["description"] == edge["description"]
+            assert record["interaction_type"] == edge["interaction_type"]
+
+
+def test_pair_lookup(graphs):
+    G, compact = graphs
+    index = compact.graph["interaction_index"]
+    edges = interaction_edges(G)
+    for (u, v), data in list(edges.items())[:50]:
+        assert v in index.partners(u)
+        (record,) = index.check_interactions([u, v])
+        assert (record["drug"], record["partner"]) == (u, v)
+        assert record["description"] == data["description"]
+
+        # Either order finds the pair, in the listed direction when the reverse is indexed too
+        (reverse,) = index.check_interactions([v, u])
+        expected = (v, u) if (v, u) in edges else (u, v)
+        assert (reverse["drug"], reverse["partner"]) == expected
+
+
+def test_from_rows():
+    names = {"DB1": "Aspirin", "DB2": "Aspirin lysine", "DB3": "Drug {x}", "DB4": "Warfarin"}
+    rows = [
+        ("DB1", "DB2", "Aspirin may increase the effect of Aspirin lysine.", "major"),
+        ("DB2", "DB3", "Aspirin lysine and Drug {x} interact.", None),
+        ("DB1", "DB3", "Aspirin may increase the effect of Drug {x}.", "minor"),
+        ("DB1", "DB2", "A duplicate listing of the pair.", "minor"),
+    ]
+    index = InteractionIndex.from_rows(rows, names)
+
+    assert len(index) == 3
+    assert index.templates[:2] == ["{drug} may increase the effect of {partner}.", "{drug} and {partner} interact."]
+    assert index.check_interactions(["DB2", "DB1", "DB4", "DB9"]) == [
+        {
+            "drug": "DB1",
+            "partner": "DB2",
+            "description": "Aspirin may increase the effect of Aspirin lysine.",
+            "interaction_type": "major",
+        }
+    ]
+    assert [record["description"] for record in index.interactions("DB2")] == ["Aspirin lysine and Drug {x} interact."]
+    assert index.check_interactions(["DB3", "DB1", "DB2"]) == [
+        index.interactions("DB1")[1],
+        index.interactions("DB2")[0],
+        index.interactions("DB1")[0],
+    ]
+    assert index.partners("DB4") == [] and index.interactions("DB9") == []
+    assert index.check_interactions(["DB1"]) == []
+
+
+def test_from_streamed_rows():
+    # Names are filled as the rows stream in, as by `build_interaction_index`
+    names = {}
+
+    def rows():
+        for i in range(100):
+            drug, partner = f"DB{i}", f"DB{i + 1}"
+            names.setdefault(drug, f"Drug {i}")
+            names.setdefault(partner, f"Drug {i + 1}")
+            yield drug, partner, f"Drug {i} may increase the effect of Drug {i + 1}.", "moderate"
+
+    index = InteractionIndex.from_rows(rows(), names)
+    assert len(index) == 100 and len(index.templates) == 1
+    (record,) = index.check_interactions(["DB8", "DB7"])
+    assert record["description"] == "Drug 7 may increase the effect of Drug 8."
@@ -0,0 +1,57 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import random
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.csr import CSRGraph
+from geniusrise_healthcare.knowledge_graphs.intersection import intersect_subgraphs
+
+
+def reference(graphs):
+    nodes = set.intersection(*(set(G) for G in graphs))
+    edges = set.intersection(*(set(G.edges) for G in graphs))
+    return nodes, edges
+
+
+def test_mixed_ids_after_integer_graph():
+    graphs = [nx.DiGraph([(1, 2)]), nx.DiGraph([(1, 2), (2, "C0001")])]
+    G = intersect_subgraphs(graphs)
+    assert set(G) == {1, 2}
+    assert set(G.edges) == {(1, 2)}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference(seed):
+    rng = random.Random(seed)
+    ids = list(range(30)) + [f"C{i:04d}" for i in range(30)] + [("DB", i) for i in range(10)]
+    graphs = []
+    for i in range(3):
+        # The first graph has integer ids only, the others mix in strings and tuples
+        pool = ids[:30] if i == 0 else ids
+        G = nx.DiGraph()
+        G.add_nodes_from(rng.sample(pool, 25))
+        G.add_edges_from((rng.choice(pool), rng.choice(pool)) for _ in range(150))
+        graphs.append(G)
+
+    for inputs in (graphs, graphs[::-1], graphs[1:]):
+        G = intersect_subgraphs(inputs)
+        assert (set(G), set(G.edges)) == reference(inputs)
+
+    G = intersect_subgraphs([graphs[0], CSRGraph.from_networkx(graphs[1])])
+    assert (set(G), set(G.edges)) == reference(graphs[:2])
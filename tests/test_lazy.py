@@ -0,0 +1,95 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.csr import EDGE_TYPE_KEYS
+from geniusrise_healthcare.knowledge_graphs.lazy import (
+    HOT_NODE_ATTRIBUTES,
+    AttributeStore,
+    attach_attribute_store,
+    write_attribute_store,
+)
+from geniusrise_healthcare.knowledge_graphs.snapshot import open_snapshot, save_snapshot
+
+
+def mixed_graph():
+    G = nx.DiGraph()
+    G.add_node(404684003, tag="finding", name="Clinical finding", synonyms=["Finding"])
+    G.add_node("C0015967", semantic_types=["T184"], name="Fever", definitions={"MSH": "Elevated temperature"})
+    G.add_node(("DB00945", "target"), name="Aspirin target")
+    G.add_edge("C0015967", 404684003, rel="PAR", rela="inverse_isa", sab="SNOMEDCT_US")
+    G.add_edge(("DB00945", "target"), 404684003, type="associated_with", evidence=["PMID:1"], score=0.5)
+    return G
+
+
+def test_snapshot_with_attribute_store(tmp_path):
+    G = mixed_graph()
+    snapshot_file = os.path.join(str(tmp_path), "graph.snapshot")
+    store_file = os.path.join(str(tmp_path), "graph.attributes")
+    save_snapshot(G, snapshot_file)
+    write_attribute_store(G, store_file)
+
+    H = attach_attribute_store(open_snapshot(snapshot_file).to_networkx(), AttributeStore(store_file))
+    for node in G:
+        assert dict(H.nodes[node]) == G.nodes[node]
+    for u, v in G.edges:
+        assert dict(H.edges[u, v]) == G.edges[u, v]
+
+
+def test_snapshot_hot_attributes_only(tmp_path):
+    # As loaded by `load_networkx_graph` with an attribute store: cold attributes are never read from the snapshot
+    G = mixed_graph()
+    snapshot_file = os.path.join(str(tmp_path), "graph.snapshot")
+    store_file = os.path.join(str(tmp_path), "graph.attributes")
+    save_snapshot(G, snapshot_file)
+    write_attribute_store(G, store_file)
+
+    snapshot = open_snapshot(snapshot_file)
+    H = snapshot.to_networkx(node_keys=HOT_NODE_ATTRIBUTES, edge_keys=EDGE_TYPE_KEYS)
+    cold = {"pickled.node.synonyms", "pickled.node.definitions", "pickled.edge.evidence", "pickled.edge.score"}
+    assert cold <= set(snapshot.header["sections"])
+    assert not cold & set(snapshot._sections)
+    assert dict(H.nodes[404684003]) == {"tag": "finding"}
+    assert dict(H.edges["C0015967", 404684003]) == {"rel": "PAR"}
+    assert dict(H.edges[("DB00945", "target"), 404684003]) == {"type": "associated_with"}
+
+    attach_attribute_store(H, AttributeStore(store_file))
+    for node in G:
+        assert dict(H.nodes[node]) == G.nodes[node]
+    for u, v in G.edges:
+        assert dict(H.edges[u, v]) == G.edges[u, v]
+
+
+def test_mismatched_ids_raise(tmp_path):
+    G = mixed_graph()
+    store_file = os.path.join(str(tmp_path), "graph.attributes")
+    write_attribute_store(G, store_file)
+    store = AttributeStore(store_file)
+
+    relabeled = nx.relabel_nodes(G, str)
+    with pytest.raises(ValueError, match="missing from attribute store"):
+        attach_attribute_store(relabeled, store)
+    assert "attribute_store" not in relabeled.graph
+    assert all(type(data) is dict for _, data in relabeled.nodes(data=True))
+
+    rewired = G.copy()
+    rewired.add_edge(404684003, "C0015967", rel="CHD")
+    with pytest.raises(ValueError, match="edges are missing"):
+        attach_attribute_store(rewired, store)
@@ -0,0 +1,52 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs import instrumentation
+from geniusrise_healthcare.knowledge_graphs.base import LOADERS
+from geniusrise_healthcare.knowledge_graphs.synthetic import generate_all
+
+
+@pytest.fixture(scope="module")
+def config(tmp_path_factory):
+    return generate_all(str(tmp_path_factory.mktemp("synthetic")), rows=200)
+
+
+@pytest.fixture
+def events():
+    collected = []
+    instrumentation.configure(sinks=[collected.append])
+    yield collected
+    instrumentation.configure()
+
+
+@pytest.mark.parametrize("source", sorted(LOADERS))
+def test_loader_builds_graph(source, config, events):
+    G = LOADERS[source](config["sources"][source]["path"])
+
+    assert isinstance(G, nx.DiGraph)
+    assert G.number_of_nodes() > 0
+    assert G.number_of_edges() > 0
+
+    (summary,) = [event for event in events if event["event"] == "summary"]
+    assert summary["stage"] == source
+    assert summary["rows_read"] > 0
+    # Every stage reading a file counts the rows it read
+    for event in summary["stages"]:
+        if event["file"] is not None:
+            assert event["rows_read"] > 0, event["stage"]
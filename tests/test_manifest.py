@@ -0,0 +1,56 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+from geniusrise_healthcare.knowledge_graphs import manifest
+from geniusrise_healthcare.knowledge_graphs.manifest import code_version
+
+
+def write(path, code):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(code)
+
+
+def test_code_version_follows_shared_modules(tmp_path):
+    root = str(tmp_path)
+    package = os.path.join(root, "gene_ontology")
+    write(os.path.join(package, "__init__.py"), "")
+    write(os.path.join(package, "utils.py"), "from .. import obo\nfrom ..closure import ClosureIndex\n")
+    write(os.path.join(root, "obo.py"), "from .artifacts import save_artifact\n")
+    write(os.path.join(root, "closure.py"), "CLOSURE = 1\n")
+    write(os.path.join(root, "artifacts.py"), "def save_artifact():\n    pass\n")
+    write(os.path.join(root, "unrelated.py"), "UNRELATED = 1\n")
+
+    version = code_version(package)
+    write(os.path.join(root, "unrelated.py"), "UNRELATED = 2\n")
+    assert code_version(package) == version
+
+    for module in ("obo", "closure", "artifacts"):
+        with open(os.path.join(root, f"{module}.py"), "a") as f:
+            f.write("# edited\n")
+        edited = code_version(package)
+        assert edited != version, module
+        version = edited
+
+
+def test_code_version_of_ontology_packages():
+    # The GO and DO loaders read their ontology through `from .. import obo`
+    assert manifest._relative_imports(b"from .. import obo\n", 2) == {"obo"}
+    directory = os.path.dirname(manifest.__file__)
+    with open(os.path.join(directory, "gene_ontology", "utils.py"), "rb") as f:
+        assert "obo" in manifest._relative_imports(f.read(), 2)
@@ -0,0 +1,71 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs import disease_ontology, gene_ontology
+from geniusrise_healthcare.knowledge_graphs.obo import read_obo_records
+
+
+def normalize(records):
+    # pronto keeps synonyms and xrefs in sets, compare them unordered
+    terms = sorted(
+        (term_id, name, definition, sorted(synonyms), sorted(xrefs))
+        for term_id, name, definition, synonyms, xrefs in records["terms"]
+    )
+    return terms, sorted(records["edges"])
+
+
+@pytest.mark.parametrize(
+    "file_name, prefix, package",
+    [("go.obo", "GO:", gene_ontology), ("doid.obo", "DOID:", disease_ontology)],
+)
+def test_read_obo_records_matches_pronto(fixtures_dir, file_name, prefix, package):
+    file_path = os.path.join(fixtures_dir, file_name)
+
+    native_terms, native_edges = normalize(read_obo_records(file_path, prefix=prefix))
+    pronto_terms, pronto_edges = normalize(
+        package.extract_ontology_records(package.utils.read_ontology_file(file_path))
+    )
+
+    assert native_terms == pronto_terms
+    assert native_edges == pronto_edges
+
+
+def test_read_obo_records_fields(fixtures_dir):
+    records = read_obo_records(os.path.join(fixtures_dir, "go.obo"), prefix="GO:")
+    terms = {term[0]: term for term in records["terms"]}
+
+    assert "CHEBI:16991" not in terms
+    assert terms["GO:0005623"][2].endswith('Includes the "plasma membrane" and any external encapsulating structures.')
+    assert sorted(terms["GO:0005634"][3]) == ["cell nucleus", "horsetail nucleus"]
+    assert sorted(terms["GO:0005623"][4]) == ["NIF_Subcellular:sao1813327414", "Wikipedia:Cell_(biology)"]
+    assert ("GO:0000001", "GO:0006260", "is_a") in records["edges"]
+    assert ("GO:0005634", "GO:0005623", "part_of") in records["edges"]
+    assert not any(target.startswith("CHEBI:") for _, target, _ in records["edges"])
+
+
+@pytest.mark.parametrize("package", [gene_ontology, disease_ontology])
+def test_load_ontology_records_cache(fixtures_dir, tmp_path, package):
+    file_name = "go.obo" if package is gene_ontology else "doid.obo"
+    file_path = os.path.join(fixtures_dir, file_name)
+
+    records = package.load_ontology_records(file_path, cache_dir=str(tmp_path))
+    (cache_file,) = os.listdir(tmp_path)
+    assert cache_file.endswith(f".v{package.utils.RECORDS_VERSION}.records")
+    assert package.load_ontology_records(file_path, cache_dir=str(tmp_path)) == records
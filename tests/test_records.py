@@ -0,0 +1,108 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pickle
+import xml.etree.ElementTree as ET
+
+import networkx as nx
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.drugbank.base import load_drugbank
+from geniusrise_healthcare.knowledge_graphs.drugbank.drugs import parse_drug_record
+from geniusrise_healthcare.knowledge_graphs.mesh.base import load_mesh
+from geniusrise_healthcare.knowledge_graphs.mesh.descriptors import parse_descriptor_record
+from geniusrise_healthcare.knowledge_graphs.mesh.utils import get_elements_by_tag, read_xml_file
+from geniusrise_healthcare.knowledge_graphs.records import XMLRecordStore, iter_xml_records
+from geniusrise_healthcare.knowledge_graphs.synthetic import generate_drugbank, generate_mesh
+
+RECORDS = [
+    '<drug id="1"><name>Aspirin</name><drug><name>nested</name></drug></drug >',
+    '<drug id="2"><name>Ibuprofène ß</name></drug\n  >',
+    '<drug id="3"/>',
+    '<drug id="6" note="/>"></drug>',
+    '<drug id="7">a/></drug>',
+    '<médicament id="4"><name>Paracétamol</name></médicament>',
+    '<drug id="5"><description>1 &lt; 2 &amp; "quoted" &gt;</description></drug>',
+]
+
+
+@pytest.fixture
+def xml_file(tmp_path):
+    path = os.path.join(str(tmp_path), "records.xml")
+    with open(path, "wb") as f:
+        f.write(('<?xml version="1.0" encoding="UTF-8"?>\n<root>\n  ' + "\n  ".join(RECORDS) + "\n</root>\n").encode())
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_offsets(xml_file, chunk_size):
+    with open(xml_file, "rb") as f:
+        data = f.read()
+    for tag in ("drug", "médicament"):
+        records = list(iter_xml_records(xml_file, tag, chunk_size=chunk_size))
+        expected = [record.encode() for record in RECORDS if record.startswith(f"<{tag} ")]
+        assert [data[offset : offset + length] for _, offset, length in records] == expected
+        assert [element.get("id") for element, _, _ in records] == [
+            ET.fromstring(record).get("id") for record in expected
+        ]
+
+
+def _name(element):
+    return {"name": element.findtext("name"), "description": element.findtext("description")}
+
+
+def test_record_store(xml_file):
+    store = XMLRecordStore(xml_file, _name)
+    for element, offset, length in iter_xml_records(xml_file, "drug", chunk_size=5):
+        store.add(element.get("id"), offset, length)
+    assert len(store) == 6 and "4" not in store
+    assert store.get_record("2") == {"name": "Ibuprofène ß", "description": None}
+    assert store.get_record("5")["description"] == '1 < 2 & "quoted" >'
+    assert store.get_record("missing") is None
+
+    restored = pickle.loads(pickle.dumps(store))
+    assert restored.get_record("1") == {"name": "Aspirin", "description": None}
+
+
+def test_drugbank_lazy_details(tmp_path):
+    path = generate_drugbank(str(tmp_path), 20, seed=1)
+    eager = load_drugbank(path)
+    lazy = load_drugbank(path, lazy_details=True)
+
+    assert set(lazy.nodes) == set(eager.nodes)
+    assert set(lazy.edges) == set(eager.edges)
+    store = lazy.graph["drug_records"]
+    drugs = [node for node, data in eager.nodes(data=True) if data.get("type") == "drug"]
+    assert drugs and len(store) == len(drugs)
+    for drug in drugs:
+        record = store.get_record(drug)
+        assert record == {key: eager.nodes[drug][key] for key in record}
+        assert lazy.nodes[drug]["name"] == record["name"]
+
+
+def test_mesh_lazy_details(tmp_path):
+    path = generate_mesh(str(tmp_path), 20, seed=1)
+    eager = load_mesh(nx.DiGraph(), path)
+    lazy = load_mesh(nx.DiGraph(), path, lazy_details=True)
+
+    assert dict(lazy.nodes(data=True)) == dict(eager.nodes(data=True))
+    assert set(lazy.edges) == set(eager.edges)
+    store = lazy.graph["descriptor_records"]
+    descriptors = get_elements_by_tag(read_xml_file(os.path.join(path, "desc2024.xml")), "DescriptorRecord")
+    assert descriptors and len(store) == len(descriptors)
+    for descriptor in descriptors:
+        assert store.get_record(descriptor.findtext("DescriptorUI")) == parse_descriptor_record(descriptor)
@@ -0,0 +1,70 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+
+import networkx as nx
+
+from geniusrise_healthcare.knowledge_graphs.slicing import SliceSpec, extract_slice, select_nodes, write_slice
+from geniusrise_healthcare.knowledge_graphs.snapshot import open_snapshot
+
+
+def umls_graph():
+    # Loaded as by umls.relationships: an edge from CUI1 to CUI2 with the row's rel and rela, where rela is the
+    # relation of CUI2 to CUI1. Releases hold both directions of a hierarchy pair, PAR / inverse_isa and CHD / isa
+    G = nx.DiGraph()
+    for child, parent in (("C3", "C2"), ("C2", "C1"), ("C5", "C4")):
+        G.add_edge(child, parent, rel="PAR", rela="inverse_isa", sab="MSH")
+        G.add_edge(parent, child, rel="CHD", rela="isa", sab="MSH")
+    G.add_edge("C4", "C1", rel="RB", rela="", sab="MSH")
+    G.add_edge("C3", "C5", rel="RO", rela="may_treat", sab="MSH")
+    return G
+
+
+def test_umls_hierarchy_roots():
+    G = umls_graph()
+    assert select_nodes(G, SliceSpec(roots=["C1"])) == {"C1", "C2", "C3"}
+    assert select_nodes(G, SliceSpec(roots=["C2"], ancestors=False)) == {"C2", "C3"}
+    assert select_nodes(G, SliceSpec(roots=["C5"])) == {"C4", "C5"}
+    assert select_nodes(G, SliceSpec(roots=["C3"])) == {"C1", "C2", "C3"}
+
+
+def test_semantic_network_hierarchy():
+    # Semantic network edges go from TUI1 to TUI2 with the isa of TUI1 to TUI2 in rel
+    G = nx.DiGraph()
+    G.add_edge("T184", "T033", rel="isa")
+    G.add_edge("T033", "T051", rel="isa")
+    G.add_edge("T047", "T184", rel="manifestation_of")
+    assert select_nodes(G, SliceSpec(roots=["T033"])) == {"T033", "T184", "T051"}
+
+
+def test_relationship_types_keep_hierarchy():
+    G = umls_graph()
+    H = extract_slice(G, SliceSpec(relationship_types=["RO"]))
+    assert set(H.edges) == {("C3", "C2"), ("C2", "C1"), ("C3", "C5"), ("C5", "C4")}
+    assert H.edges["C3", "C2"] == G.edges["C3", "C2"]
+
+
+def test_write_slice_round_trip(tmp_path):
+    G = umls_graph()
+    G.add_edge("C2", 42, rel="PAR", rela="inverse_isa", sources=["MSH", "SNOMEDCT_US"])
+    G.nodes["C3"]["names"] = ["Fever", "Pyrexia"]
+    H = write_slice(G, SliceSpec(roots=["C1"]), str(tmp_path))
+
+    loaded = open_snapshot(os.path.join(str(tmp_path), "graph.snapshot")).to_networkx()
+    assert list(loaded.nodes(data=True)) == list(H.nodes(data=True))
+    assert list(loaded.edges(data=True)) == list(H.edges(data=True))
+    assert 42 in loaded
@@ -0,0 +1,72 @@
+# 🧠 Geniusrise
+# Copyright (C) 2023  geniusrise.ai
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from geniusrise_healthcare.knowledge_graphs.closure import ClosureIndex
+from geniusrise_healthcare.knowledge_graphs.csr import CSRGraph
+from geniusrise_healthcare.knowledge_graphs.snapshot import open_snapshot, save_snapshot
+
+
+@pytest.fixture
+def graph() -> nx.DiGraph:
+    G = nx.DiGraph()
+    G.add_node(22298006, name="Myocardial infarction", tag="disorder", synonyms=["MI", "heart attack"])
+    G.add_node("C0027051", term="Myocardial Infarction", definitions=[("MSH", "NECROSIS of the MYOCARDIUM")])
+    G.add_node("1000", attributes={"TTY": "IN"}, tag="substance", note="", score=np.float64(0.5))
+    G.add_node(("GO:0005634", "part_of"), tag=None)
+    G.add_edge(22298006, "C0027051", relationship_type="116680003", refset_id="900000000000497000", module_id=3)
+    G.add_edge("C0027051", 22298006, rel="PAR", rela="inverse_isa", sab="MSH")
+    G.add_edge("1000", 22298006, type="is_a", weight=2.5)
+    G.add_edge(("GO:0005634", "part_of"), "1000")
+    G.graph["disease_closure"] = ClosureIndex.from_edges([("1000", 22298006)])
+    G.graph["xref_index"] = {"MESH:D009203": ["DOID:5844"]}
+    return G
+
+
+def test_round_trip(graph, tmp_path):
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(graph, path)
+    H = open_snapshot(path).to_networkx()
+
+    assert list(H.nodes(data=True)) == list(graph.nodes(data=True))
+    assert [type(node) for node in H] == [type(node) for node in graph]
+    assert list(H.edges(data=True)) == list(graph.edges(data=True))
+    assert H.graph["xref_index"] == graph.graph["xref_index"]
+    assert H.graph["disease_closure"].ancestors("1000") == graph.graph["disease_closure"].ancestors("1000")
+    assert type(H.nodes["1000"]["score"]) is np.float64
+
+
+def test_node_attributes(graph, tmp_path):
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(graph, path, metadata={"release": "2024AA"})
+    snapshot = open_snapshot(path)
+
+    for node, data in graph.nodes(data=True):
+        assert snapshot.node_attributes(node) == data
+    assert snapshot.graph.has_edge(22298006, "C0027051")
+    assert snapshot.to_networkx().graph["release"] == "2024AA"
+
+
+def test_csr_snapshot(graph, tmp_path):
+    path = str(tmp_path / "graph.snap")
+    save_snapshot(CSRGraph.from_networkx(graph), path)
+    H = open_snapshot(path).to_networkx(edge_type_key="relationship")
+
+    assert list(H) == list(CSRGraph.from_networkx(graph).nodes)
+    assert H.edges[22298006, "C0027051"] == {"relationship": "116680003"}